@@ -0,0 +1,311 @@
+import os
+import json
+import time
+from core.config import settings
+from db.database import get_db
+from db.crud import add_analysis_statuses, fail_pending_analysis_status, get_latest_analysis_fingerprints
+from utils.file_handler import load_all_prompts
+from utils.llm_cache import get_model_name, build_chain_cache_key, get_cached_result, set_cached_result
+from utils.batch_backend import get_batch_backend, run_batch
+from utils.result_writer import save_records_with_fallback
+from utils.analysis_job import JOB_RUNNING, JOB_DONE, JOB_SKIPPED, JOB_FAILED, set_member_state
+from templates.prompt_template import CHAIN_SPECS, create_chain_prompt_template
+from apis.food_analysis import (THRESHOLD_RELEVANCE, THRESHOLD_FAITHFULNESS, build_analysis_input, compute_analysis_fingerprint,
+                                apply_previous_analysis, build_analysis_record, compare_results)
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# Multi-Chain 실행 순서: 앞 단계 결과가 다음 단계 입력값
+MULTI_CHAIN_STEPS = ["nutrition_analysis", "diet_improvement", "custom_recommendation", "diet_summary"]
+
+# 최대 Batch 라운드 수: (식습관 조언 + Multi-Chain + 평가) x A/B
+MAX_BATCH_ROUNDS = (len(MULTI_CHAIN_STEPS) + 1) * 2
+
+"""
+Batch 실행 모드: 실시간 API 대신 Batch API로 주간 분석 실행
+
+1. 준비: 회원별 Chain 입력값 구성(입력값이 같으면 이전 결과 재사용)
+2. 제출: 라운드마다 모든 회원의 다음 단계 프롬프트를 JSONL 파일로 만들어 Batch 백엔드에 제출
+3. 수집: 결과를 반영해 다음 라운드 구성(조언 + 영양소 분석 → 개선점 → 식단 → 요약 → 평가 → 필요 시 B 실행)
+4. 저장: Batch 대상 회원의 분석 상태는 결과를 저장할 때 추가(Batch 완료까지 걸리는 동안 이전 완료 분석을 그대로 응답)
+"""
+
+# 회원별 다음 실행 단계: (Chain 이름, 변형) 목록
+def get_next_steps(state: dict):
+    if state["final"] is not None:
+        return []
+
+    steps = []
+    if state["advice"] is None:
+        steps.append(("diet_advice", None))
+
+    variant = state["variant"]
+    results = state["results"][variant]
+    for name in MULTI_CHAIN_STEPS:
+        if name not in results:
+            return steps + [(name, variant)]
+
+    if variant not in state["evaluations"]:
+        steps.append(("diet_eval", None))
+    return steps
+
+
+# Chain 입력값: 회원 입력값 + 현재 변형의 앞 단계 결과
+def get_step_inputs(state: dict):
+    return {**state["inputs"], **state["results"][state["variant"]]}
+
+
+# 단계 결과 반영: 평가가 끝나면 임계값에 따라 완료 또는 B 실행
+def apply_step_result(state: dict, name: str, result):
+    variant = state["variant"]
+
+    if name == "diet_advice":
+        state["advice"] = result
+    elif name != "diet_eval":
+        state["results"][variant][name] = result
+    else:
+        state["evaluations"][variant] = result
+        result_with_eval = {**state["results"][variant], "evaluation": result}
+        logger.info(f"member_id={state['member_id']} 실행({variant}) 평가 점수 → "
+                    f"Relevance: {result['relevance']:.2f}, Faithfulness: {result['faithfulness']:.2f}")
+
+        if result["relevance"] >= THRESHOLD_RELEVANCE and result["faithfulness"] >= THRESHOLD_FAITHFULNESS:
+            state["multi_chain"] = result_with_eval
+        elif variant == "A":
+            state["variant"] = "B"
+        else:
+            result_A = {**state["results"]["A"], "evaluation": state["evaluations"]["A"]}
+            state["multi_chain"] = compare_results(result_A, result_with_eval, state["evaluations"]["A"], result)
+
+    if state["multi_chain"] is not None and state["advice"] is not None:
+        state["final"] = {**state["multi_chain"], "diet_advice": state["advice"]}
+
+
+# Batch 요청 한 줄 구성: 캐시에 결과가 있으면 요청 없이 바로 반영
+async def build_step_request(state: dict, name: str, variant: str, prompt_templates: dict):
+    spec = CHAIN_SPECS[name]
+    model = spec["model"]
+    prompt_template = prompt_templates[name]
+    inputs = get_step_inputs(state)
+
+    cache_key = build_chain_cache_key(prompt_template, get_model_name(model), variant, inputs)
+    if settings.LLM_CACHE_ENABLED:
+        cached = await get_cached_result(name, cache_key)
+        if cached is not None:
+            apply_step_result(state, name, cached)
+            return None
+
+    prompt = prompt_template.format(**{key: inputs.get(key) for key in prompt_template.input_variables})
+    return {
+        "custom_id": f"{state['member_id']}:{variant or '-'}:{name}",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": get_model_name(model),
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": model.temperature,
+            "max_completion_tokens": model.max_tokens
+        },
+        "cache_key": cache_key
+    }
+
+
+# 라운드 요청 목록: 캐시 적중으로 단계가 끝나면 다음 단계까지 이어서 구성
+async def collect_round_requests(states: dict, prompt_templates: dict):
+    requests = []
+    for state in states.values():
+        if state["failed"]:
+            continue
+        while True:
+            steps = get_next_steps(state)
+            if not steps:
+                break
+            step_requests = [await build_step_request(state, name, variant, prompt_templates) for name, variant in steps]
+            step_requests = [request for request in step_requests if request is not None]
+            if step_requests:
+                requests.extend(step_requests)
+                break
+    return requests
+
+
+# 라운드 결과 반영: 응답 파싱 후 결과 캐시 저장, 실패한 회원은 이후 라운드에서 제외
+async def ingest_round_results(states: dict, requests: list, output_path: str):
+    cache_keys = {request["custom_id"]: request["cache_key"] for request in requests}
+    answered = set()
+
+    with open(output_path, "r", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+
+    for line in lines:
+        custom_id = line["custom_id"]
+        member_id, _, name = custom_id.split(":")
+        state = states[int(member_id)]
+        answered.add(custom_id)
+
+        try:
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                raise ValueError(line.get("error") or response.get("body"))
+
+            content = response["body"]["choices"][0]["message"]["content"]
+            result = CHAIN_SPECS[name]["parser"]().parse(content)
+            apply_step_result(state, name, result)
+        except Exception as e:
+            logger.error(f"[Batch] member_id={member_id} {name} 결과 처리 실패: {e}")
+            state["failed"] = True
+            continue
+
+        if settings.LLM_CACHE_ENABLED:
+            await set_cached_result(name, cache_keys[custom_id], result)
+
+    # 결과가 누락된 요청
+    for custom_id in set(cache_keys) - answered:
+        logger.error(f"[Batch] {custom_id} 결과 누락")
+        states[int(custom_id.split(":")[0])]["failed"] = True
+
+
+# 1. 준비: Chain 입력값 구성(식사 기록이 없거나 입력값이 같으면 제외)
+# 분석 상태는 결과 재사용 / 준비 실패 회원만 일괄 추가, Batch 대상 회원은 결과 저장 시 추가(save_batch_results)
+def prepare_batch_states(db, run_id: str, target_ids: list, meals_avg_map: dict, prompt_version: str):
+    states = {}
+    failed_ids = []
+    skipped_count = 0
+
+    for member_id in target_ids:
+        set_member_state(run_id, member_id, JOB_RUNNING)
+        try:
+            analysis_input = build_analysis_input(db, member_id, avg_nutrition=meals_avg_map.get(member_id))
+            if analysis_input is None:
+                raise ValueError("최근 7일간 식사 기록 없음")
+
+            user_data, updated_user_data, weight_result = analysis_input
+            fingerprint = compute_analysis_fingerprint(updated_user_data, weight_result, prompt_version)
+        except Exception as e:
+            logger.error(f"[Batch] member_id={member_id} 분석 준비 실패: {e}")
+            db.rollback()
+            failed_ids.append(member_id)
+            continue
+
+        states[member_id] = {
+            "member_id": member_id,
+            "status_id": None,
+            "inputs": updated_user_data,
+            "weight_prediction": weight_result,
+            "avg_calorie": user_data['user'][5]['calorie'],
+            "fingerprint": fingerprint,
+            "variant": "A",
+            "advice": None,
+            "results": {"A": {}, "B": {}},
+            "evaluations": {},
+            "multi_chain": None,
+            "final": None,
+            "failed": False
+        }
+
+    # 입력값이 최근 완료된 분석과 같은 회원: 이전 결과 재사용
+    previous_map = get_latest_analysis_fingerprints(db, list(states)) if states else {}
+    reuse_ids = [member_id for member_id, state in states.items()
+                 if member_id in previous_map and previous_map[member_id].FINGERPRINT == state["fingerprint"]]
+    status_ids = add_analysis_statuses(db, reuse_ids + failed_ids)
+
+    for member_id in reuse_ids:
+        states[member_id]["status_id"] = status_ids[member_id]
+        try:
+            reused = apply_previous_analysis(db, member_id, status_ids[member_id], previous_map[member_id], run_id=run_id)
+        except Exception as e:
+            logger.error(f"[Batch] member_id={member_id} 분석 준비 실패: {e}")
+            db.rollback()
+            del states[member_id]
+            failed_ids.append(member_id)
+            continue
+
+        # 이전 결과가 온전하지 않으면 추가한 분석 상태로 Batch 실행
+        if reused:
+            del states[member_id]
+            set_member_state(run_id, member_id, JOB_SKIPPED)
+            skipped_count += 1
+
+    fail_pending_analysis_status(db, failed_ids)
+    for member_id in failed_ids:
+        set_member_state(run_id, member_id, JOB_FAILED)
+
+    logger.info(f"[Batch] run_id={run_id} 준비 완료 - Batch 대상: {len(states)}, "
+                f"결과 재사용: {skipped_count}, 실패: {len(failed_ids)}")
+    return states
+
+
+# 4. 저장: 완료된 회원은 write_batch_size명씩 한 번의 트랜잭션으로 결과 저장, 나머지는 실패 처리
+def save_batch_results(db, run_id: str, states: dict, chain_seconds: float):
+    # 분석 상태 일괄 추가: 준비 단계에서 분석 상태를 추가하지 않은 회원(미완료 회원도 추가 후 실패 처리)
+    new_ids = [member_id for member_id, state in states.items() if state["status_id"] is None]
+    for member_id, status_id in add_analysis_statuses(db, new_ids).items():
+        states[member_id]["status_id"] = status_id
+
+    records, failed_ids = [], []
+    for member_id, state in states.items():
+        if state["final"] is None:
+            logger.error(f"[Batch] member_id={member_id} 결과 저장 실패: Batch 결과 미완료")
+            failed_ids.append(member_id)
+            continue
+        records.append(build_analysis_record(member_id, state["status_id"], state["final"], state["weight_prediction"],
+                                             avg_calorie=state["avg_calorie"], fingerprint=state["fingerprint"],
+                                             chain_seconds=chain_seconds))
+
+    batch_size = settings.ANALYSIS_WRITE_BATCH_SIZE
+    for start in range(0, len(records), batch_size):
+        chunk = records[start:start + batch_size]
+        errors = save_records_with_fallback(db, chunk)
+        for record in chunk:
+            if record["status_id"] in errors:
+                logger.error(f"[Batch] member_id={record['member_id']} 결과 저장 실패: {errors[record['status_id']]}")
+                failed_ids.append(record["member_id"])
+            else:
+                set_member_state(run_id, record["member_id"], JOB_DONE)
+
+    fail_pending_analysis_status(db, failed_ids)
+    for member_id in failed_ids:
+        set_member_state(run_id, member_id, JOB_FAILED)
+
+
+# Batch 모드 주간 분석: scheduled_task에서 선별한 분석 대상으로 실행
+async def run_batch_analysis(run_id: str, target_ids: list, meals_avg_map: dict, backend=None):
+    backend = backend or get_batch_backend()
+    batch_dir = os.path.join(settings.ANALYSIS_BATCH_PATH, run_id)
+    os.makedirs(batch_dir, exist_ok=True)
+
+    prompt_version = await load_all_prompts()
+    prompt_templates = {name: await create_chain_prompt_template(name) for name in CHAIN_SPECS}
+
+    db = next(get_db())
+    try:
+        states = prepare_batch_states(db, run_id, target_ids, meals_avg_map, prompt_version)
+
+        start_batch = time.time()
+        for round_no in range(1, MAX_BATCH_ROUNDS + 1):
+            requests = await collect_round_requests(states, prompt_templates)
+            if not requests:
+                break
+
+            input_path = os.path.join(batch_dir, f"round{round_no}.input.jsonl")
+            output_path = os.path.join(batch_dir, f"round{round_no}.output.jsonl")
+            with open(input_path, "w", encoding="utf-8") as file:
+                for request in requests:
+                    line = {key: value for key, value in request.items() if key != "cache_key"}
+                    file.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+            start_round = time.time()
+            await run_batch(backend, input_path, output_path)
+            await ingest_round_results(states, requests, output_path)
+            round_time = round(time.time() - start_round, 4)
+            logger.info(f"[Batch] run_id={run_id} 라운드 {round_no} 완료 - 요청 수: {len(requests)}, 실행 시간: {round_time} sec")
+
+        batch_time = round(time.time() - start_batch, 4)
+
+        # 회원별 Chain 실행 시간: 전체 Batch 처리 시간의 회원당 평균
+        chain_seconds = round(batch_time / len(states), 4) if states else 0.0
+        save_batch_results(db, run_id, states, chain_seconds)
+        logger.info(f"[Batch] run_id={run_id} 종료 - 대상: {len(states)}, 실행 시간: {batch_time} sec")
+    finally:
+        db.close()
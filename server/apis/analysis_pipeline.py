@@ -0,0 +1,293 @@
+import json
+import time
+import asyncio
+from core.config import settings
+from db.database import SessionLocal, create_async_session
+from db.crud import get_members_info, add_analysis_statuses, get_latest_analysis_fingerprints, fail_pending_analysis_status
+from utils.file_handler import load_all_prompts
+from utils.concurrency import AdaptiveConcurrencyLimiter, current_limiter
+from utils.result_writer import save_records_with_fallback
+from utils.analysis_job import JOB_RUNNING, JOB_DONE, JOB_SKIPPED, JOB_FAILED, set_member_state, set_member_states, set_job_meta
+from apis.food_analysis import (PIPELINE_CHAINED, build_analysis_input, compute_analysis_fingerprint, apply_previous_analysis,
+                                perform_diet_analsyis, build_analysis_record, create_analysis_limiter, warm_up_chains)
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+단계별(staged) 주간 분석: 조회 → LLM → 저장을 bounded queue로 연결한 생산자 / 소비자 파이프라인
+
+1. prefetch: 회원을 ANALYSIS_PREFETCH_CHUNK_SIZE명씩 묶어 회원 정보 / 분석 상태 / 이전 입력값 해시를 일괄 조회
+             입력값이 같은 회원은 이전 결과 재사용, 나머지는 LLM 큐로 전달
+2. llm: ANALYSIS_MAX_CONCURRENCY개 워커가 LLM 큐를 소비(실제 동시 실행 수는 AIMD 제한기가 조절)
+3. write: 결과를 ANALYSIS_WRITE_BATCH_SIZE개씩 모아 한 번의 트랜잭션으로 저장
+
+- 큐 크기는 ANALYSIS_STAGE_QUEUE_SIZE로 제한: 다음 단계가 밀리면 앞 단계가 대기(backpressure)
+- 단계별 대기 개수 / 처리량은 주기적으로 로그와 작업 메타(stage_stats)에 기록
+"""
+
+# 단계별 처리 지표
+class StageStats:
+
+    def __init__(self, name: str, queue: asyncio.Queue = None):
+        self.name = name
+        self.queue = queue
+        self.pending = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = time.time()
+
+    def record(self, processed: int, failed: int = 0, busy_seconds: float = 0.0):
+        self.processed += processed
+        self.failed += failed
+        self.busy_seconds += busy_seconds
+
+    # 대기 개수: 입력 큐 크기(prefetch는 아직 조회하지 않은 회원 수)
+    def snapshot(self):
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else self.pending,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput": round(self.processed / elapsed, 3),
+            "busy_seconds": round(self.busy_seconds, 4)
+        }
+
+
+# 1. prefetch: 회원 묶음의 분석 입력값 구성(동기 Session, run_sync로 실행)
+# 반환값: (LLM 실행 대상, {member_id: 완료 상태})
+def prefetch_chunk(db, run_id: str, member_ids: list, meals_avg_map: dict, prompt_version: str, pipeline: str):
+    members = get_members_info(db, member_ids)
+    status_ids = add_analysis_statuses(db, member_ids)
+    previous_map = get_latest_analysis_fingerprints(db, member_ids)
+
+    items, finished, failed_ids = [], {}, []
+    for member_id in member_ids:
+        status_id = status_ids[member_id]
+        try:
+            analysis_input = build_analysis_input(db, member_id, meals_avg_map.get(member_id), member=members.get(member_id))
+
+            # 식사 기록이 없으면 분석 실패
+            if analysis_input is None:
+                finished[member_id] = JOB_FAILED
+                failed_ids.append(member_id)
+                continue
+
+            user_data, updated_user_data, weight_result = analysis_input
+
+            # 입력값이 최근 완료된 분석과 같으면 LLM 호출 없이 이전 결과 복제
+            fingerprint = compute_analysis_fingerprint(updated_user_data, weight_result, prompt_version, pipeline)
+            previous = previous_map.get(member_id)
+            if (previous is not None and previous.FINGERPRINT == fingerprint
+                    and apply_previous_analysis(db, member_id, status_id, previous, run_id=run_id)):
+                finished[member_id] = JOB_SKIPPED
+                continue
+
+            items.append({
+                "member_id": member_id,
+                "status_id": status_id,
+                "inputs": updated_user_data,
+                "weight_prediction": weight_result,
+                "avg_calorie": user_data['user'][5]['calorie'],
+                "fingerprint": fingerprint
+            })
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[Staged] member_id={member_id} 분석 입력값 구성 실패: {e}")
+            finished[member_id] = JOB_FAILED
+            failed_ids.append(member_id)
+
+    fail_pending_analysis_status(db, failed_ids)
+    return items, finished
+
+
+async def prefetch_stage(run_id: str, target_ids: list, meals_avg_map: dict, prompt_version: str, pipeline: str,
+                         llm_queue: asyncio.Queue, stats: StageStats, workers: int):
+    chunk_size = settings.ANALYSIS_PREFETCH_CHUNK_SIZE
+    stats.pending = len(target_ids)
+    try:
+        for start in range(0, len(target_ids), chunk_size):
+            chunk = target_ids[start:start + chunk_size]
+            set_member_states(run_id, chunk, JOB_RUNNING)
+
+            start_chunk = time.time()
+            db = create_async_session()
+            try:
+                items, finished = await db.run_sync(prefetch_chunk, run_id, chunk, meals_avg_map, prompt_version, pipeline)
+            except Exception as e:
+                logger.error(f"[Staged] 회원 {len(chunk)}명 조회 실패: {e}")
+                await db.rollback()
+                items, finished = [], {member_id: JOB_FAILED for member_id in chunk}
+                try:
+                    await db.run_sync(fail_pending_analysis_status, chunk)
+                except Exception as cleanup_error:
+                    logger.error(f"[Staged] 분석 상태 정리 실패: {cleanup_error}")
+            finally:
+                await db.close()
+
+            for member_id, state in finished.items():
+                set_member_state(run_id, member_id, state)
+            failed = sum(1 for state in finished.values() if state == JOB_FAILED)
+            stats.record(len(chunk), failed=failed, busy_seconds=time.time() - start_chunk)
+            stats.pending -= len(chunk)
+
+            # LLM 큐가 가득 차면 대기(backpressure)
+            for item in items:
+                await llm_queue.put(item)
+    finally:
+        # 워커 종료 신호
+        for _ in range(workers):
+            await llm_queue.put(None)
+
+
+# 2. llm: 워커 1개, 제한기 슬롯을 획득한 뒤에 다음 회원을 가져옴
+async def llm_worker(limiter: AdaptiveConcurrencyLimiter, pipeline: str, llm_queue: asyncio.Queue,
+                     write_queue: asyncio.Queue, stats: StageStats):
+    current_limiter.set(limiter)
+    while True:
+        record = None
+        async with limiter:
+            # 제한기 슬롯을 획득한 뒤에 다음 회원 가져오기
+            item = await llm_queue.get()
+            if item is None:
+                return
+
+            start_chain = time.time()
+            try:
+                # Chain 실행(with Fallback)
+                final_results = await perform_diet_analsyis(item["inputs"], pipeline=pipeline)
+                chain_seconds = round(time.time() - start_chain, 4)
+                limiter.record_success(chain_seconds)
+                logger.info(f"[Chain Execution Time] member_id={item['member_id']}, 실행 시간: {chain_seconds} sec")
+
+                record = build_analysis_record(item["member_id"], item["status_id"], final_results, item["weight_prediction"],
+                                               avg_calorie=item["avg_calorie"], fingerprint=item["fingerprint"],
+                                               chain_seconds=chain_seconds)
+            except Exception as e:
+                logger.error(f"[Staged] member_id={item['member_id']} 분석 실패: {e}")
+            stats.record(1, failed=0 if record else 1, busy_seconds=time.time() - start_chain)
+
+        # 저장 큐가 가득 차면 대기(제한기 슬롯은 반환한 상태)
+        await write_queue.put({"member_id": item["member_id"], "status_id": item["status_id"], "record": record})
+
+
+async def llm_stage(limiter: AdaptiveConcurrencyLimiter, pipeline: str, llm_queue: asyncio.Queue,
+                    write_queue: asyncio.Queue, stats: StageStats, workers: int):
+    try:
+        await asyncio.gather(*[llm_worker(limiter, pipeline, llm_queue, write_queue, stats) for _ in range(workers)])
+    finally:
+        # 저장 단계 종료 신호
+        await write_queue.put(None)
+
+
+# 3. write: 결과 일괄 저장 및 실패 회원 분석 상태 정리(별도 쓰레드의 동기 Session)
+def save_results(results: list):
+    records = [result["record"] for result in results if result["record"] is not None]
+    failed_ids = [result["member_id"] for result in results if result["record"] is None]
+
+    db = SessionLocal()
+    try:
+        errors = save_records_with_fallback(db, records)
+        failed_ids += [record["member_id"] for record in records if record["status_id"] in errors]
+        fail_pending_analysis_status(db, failed_ids)
+    finally:
+        db.close()
+    return set(failed_ids)
+
+
+async def write_stage(run_id: str, write_queue: asyncio.Queue, stats: StageStats):
+    batch_size = settings.ANALYSIS_WRITE_BATCH_SIZE
+    flush_interval = settings.ANALYSIS_WRITE_FLUSH_INTERVAL
+
+    async def flush(results):
+        start_flush = time.time()
+        try:
+            failed_ids = await asyncio.to_thread(save_results, results)
+        except Exception as e:
+            logger.error(f"[Staged] 결과 {len(results)}건 저장 실패: {e}")
+            failed_ids = {result["member_id"] for result in results}
+
+        for result in results:
+            set_member_state(run_id, result["member_id"], JOB_FAILED if result["member_id"] in failed_ids else JOB_DONE)
+        stats.record(len(results) - len(failed_ids), failed=len(failed_ids), busy_seconds=time.time() - start_flush)
+
+    results = []
+    while True:
+        # 모아둔 결과가 있으면 최대 flush_interval초만 추가 결과를 기다림
+        try:
+            if results:
+                item = await asyncio.wait_for(write_queue.get(), timeout=flush_interval)
+            else:
+                item = await write_queue.get()
+        except asyncio.TimeoutError:
+            await flush(results)
+            results = []
+            continue
+
+        if item is None:
+            break
+        results.append(item)
+        if len(results) >= batch_size:
+            await flush(results)
+            results = []
+
+    if results:
+        await flush(results)
+
+
+# 단계별 지표 기록: 로그 및 작업 메타(manage.py status에서 조회)
+def report_stage_stats(run_id: str, stage_stats: dict):
+    snapshot = {name: stats.snapshot() for name, stats in stage_stats.items()}
+    logger.info(f"[Staged] run_id={run_id} 단계별 상태: {snapshot}")
+    try:
+        set_job_meta(run_id, {"stage_stats": json.dumps(snapshot)})
+    except Exception as e:
+        logger.error(f"[Staged] 단계별 지표 기록 실패: {e}")
+
+
+async def report_stage_stats_periodically(run_id: str, stage_stats: dict, stop_event: asyncio.Event):
+    interval = settings.ANALYSIS_STAGE_REPORT_INTERVAL
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            report_stage_stats(run_id, stage_stats)
+
+
+# 단계별 주간 분석: scheduled_task에서 선별한 분석 대상으로 실행
+async def run_staged_analysis(run_id: str, target_ids: list, meals_avg_map: dict, pipeline: str = None):
+    pipeline = pipeline or PIPELINE_CHAINED
+    workers = settings.ANALYSIS_MAX_CONCURRENCY
+    queue_size = settings.ANALYSIS_STAGE_QUEUE_SIZE
+
+    # 프롬프트 적재 및 Chain 사전 생성
+    prompt_version = await load_all_prompts()
+    await warm_up_chains()
+
+    limiter = create_analysis_limiter()
+    llm_queue = asyncio.Queue(maxsize=queue_size)
+    write_queue = asyncio.Queue(maxsize=queue_size)
+    stage_stats = {
+        "prefetch": StageStats("prefetch"),
+        "llm": StageStats("llm", llm_queue),
+        "write": StageStats("write", write_queue)
+    }
+
+    stop_event = asyncio.Event()
+    reporter = asyncio.create_task(report_stage_stats_periodically(run_id, stage_stats, stop_event))
+    start_time = time.time()
+    try:
+        await asyncio.gather(
+            prefetch_stage(run_id, target_ids, meals_avg_map, prompt_version, pipeline, llm_queue, stage_stats["prefetch"], workers),
+            llm_stage(limiter, pipeline, llm_queue, write_queue, stage_stats["llm"], workers),
+            write_stage(run_id, write_queue, stage_stats["write"])
+        )
+    finally:
+        stop_event.set()
+        await reporter
+
+    report_stage_stats(run_id, stage_stats)
+    logger.info(f"[Staged] run_id={run_id} 종료 - 대상: {len(target_ids)}, 실행 시간: {round(time.time() - start_time, 4)} sec, "
+                f"제한기 상태: {limiter.snapshot()}")
@@ -0,0 +1,217 @@
+import json
+import time
+import asyncio
+from core.config import settings
+from apis.food_analysis import (run_member_analysis, prepare_analysis_job, finish_analysis_job, create_analysis_limiter,
+                                create_result_writer, warm_up_chains)
+from utils.result_writer import current_result_writer
+from db.database import dispose_async_engine
+from utils.concurrency import AdaptiveConcurrencyLimiter
+from utils.analysis_job import JOB_COMPLETED_STATES, get_weekly_run_id, get_member_state, get_job_meta
+from utils.analysis_queue import (LEADER_LEASE_TTL, MEMBER_LOCK_TTL, try_acquire_leader, renew_leader, release_leader, has_leader,
+                                  enqueue_members, is_enqueued, claim_member, get_member_payload, ack_member,
+                                  remaining_count, close_queue, get_active_run_id, requeue_stale_members, try_acquire_sweep,
+                                  acquire_member_lock, renew_member_lock, release_member_lock)
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 큐가 비었을 때 대기 간격(초)
+WORKER_POLL_INTERVAL = 1
+
+# 리더가 작업을 등록하지 않고 사라졌을 때 워커 대기 한도(초)
+LEADER_WAIT_TIMEOUT = 60
+
+# 회원 잠금 연장 간격(초): 잠금 유지 시간 안에 여러 번 연장
+MEMBER_LOCK_RENEW_INTERVAL = MEMBER_LOCK_TTL / 3
+
+# 중단된 작업 회수 간격(초): 전체 워커 중 한 곳만 실행
+STALE_SWEEP_INTERVAL = 60
+
+"""
+분산 식습관 분석: 리더 1개가 회원 ID를 공유 큐에 등록하고, 여러 워커 프로세스가 큐에서 가져가 분석
+
+- 리더: Redis 임대(lease)로 선출, 분석 대상 선별 및 큐 등록 후 워커로도 참여
+- 워커: 처리 중 리스트 이동으로 최소 1회 전달, 회원별 잠금으로 중복 실행 방지
+"""
+
+# 리더 임대 주기적 연장
+async def keep_leader_lease(run_id: str, token: str, stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        if not renew_leader(run_id, token):
+            logger.error(f"[Analysis Leader] run_id={run_id} 리더 임대 연장 실패")
+            return
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=LEADER_LEASE_TTL / 3)
+        except asyncio.TimeoutError:
+            pass
+
+
+# 회원 잠금 주기적 연장: 연장에 실패하면(잠금 만료 후 다른 워커가 획득) 로그만 남김
+async def keep_member_lock(run_id: str, member_id: int, token: str, stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=MEMBER_LOCK_RENEW_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            pass
+        if not renew_member_lock(run_id, member_id, token):
+            logger.error(f"[Analysis Worker] run_id={run_id}, member_id={member_id} 회원 잠금 연장 실패")
+            return
+
+
+# 중단된 작업 주기적 회수: 워커마다 타이머 1개, 주기마다 전체 워커 중 한 곳만 실행
+async def sweep_stale_members(run_id: str, stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=STALE_SWEEP_INTERVAL)
+            return
+        except asyncio.TimeoutError:
+            pass
+        if try_acquire_sweep(run_id, STALE_SWEEP_INTERVAL):
+            requeue_stale_members(run_id)
+
+
+# 회원 1명 분석: 잠금 획득 후 완료되지 않은 경우에만 실행(분석 중에는 잠금 연장), 제한기 슬롯은 호출하는 쪽에서 획득
+async def process_member(run_id: str, member_id: int, limiter: AdaptiveConcurrencyLimiter, pipeline: str = None):
+    token = acquire_member_lock(run_id, member_id)
+
+    # 다른 워커가 같은 회원을 처리 중(중복 전달)
+    if token is None:
+        ack_member(run_id, member_id)
+        return
+
+    stop_event = asyncio.Event()
+    lock_task = asyncio.create_task(keep_member_lock(run_id, member_id, token, stop_event))
+    try:
+        # 이미 완료된 회원은 건너뜀(재등록으로 인한 중복 전달)
+        if get_member_state(run_id, member_id) in JOB_COMPLETED_STATES:
+            return
+
+        payload = get_member_payload(run_id, member_id)
+        avg_nutrition = json.loads(payload) if payload else None
+        await run_member_analysis(member_id, limiter, avg_nutrition=avg_nutrition, run_id=run_id, pipeline=pipeline)
+    finally:
+        stop_event.set()
+        await lock_task
+        ack_member(run_id, member_id)
+        release_member_lock(run_id, member_id, token)
+
+
+# 공유 큐 소비: 등록이 끝나고 남은 작업이 없으면 종료
+async def consume_queue(run_id: str, limiter: AdaptiveConcurrencyLimiter, pipeline: str = None):
+    wait_start = time.time()
+    while True:
+        # 동시 실행 제한기 슬롯을 획득한 뒤에 작업 가져오기(분석이 끝날 때까지 슬롯 유지)
+        async with limiter:
+            member_id = claim_member(run_id)
+            if member_id is not None:
+                await process_member(run_id, member_id, limiter, pipeline)
+
+        if member_id is not None:
+            wait_start = time.time()
+            continue
+
+        # 남은 작업은 다른 워커가 처리 중(비정상 종료된 작업은 sweep_stale_members가 회수)
+        if is_enqueued(run_id):
+            if remaining_count(run_id) == 0:
+                return
+
+        # 리더가 작업 등록 전에 사라진 경우
+        elif not has_leader(run_id) and time.time() - wait_start > LEADER_WAIT_TIMEOUT:
+            logger.error(f"[Analysis Worker] run_id={run_id} 리더 없이 작업 등록이 되지 않아 종료")
+            return
+
+        await asyncio.sleep(WORKER_POLL_INTERVAL)
+
+
+# 워커 실행: 최대 동시 실행 수만큼 소비자를 띄우고 실제 동시 실행 수는 AIMD 제한기가 조절
+async def run_worker(run_id: str):
+    concurrency = settings.ANALYSIS_MAX_CONCURRENCY
+    limiter = create_analysis_limiter()
+
+    # 리더가 작업 등록 시 기록한 분석 파이프라인 사용
+    pipeline = get_job_meta(run_id).get("pipeline")
+
+    # Chain 사전 생성: 워커 프로세스의 모든 소비자가 레지스트리의 Chain 공유
+    await warm_up_chains()
+
+    start_time = time.time()
+    logger.info(f"[Analysis Worker] run_id={run_id}, 소비자 수: {concurrency}, 초기 동시 실행 수: {limiter.limit}, "
+                f"파이프라인: {pipeline or settings.ANALYSIS_PIPELINE} 시작")
+
+    # 결과 저장 버퍼: 워커의 모든 소비자가 공유
+    writer = create_result_writer()
+    current_result_writer.set(writer)
+    stop_event = asyncio.Event()
+    sweep_task = asyncio.create_task(sweep_stale_members(run_id, stop_event))
+    try:
+        await asyncio.gather(*[consume_queue(run_id, limiter, pipeline) for _ in range(concurrency)])
+    finally:
+        stop_event.set()
+        await sweep_task
+        await writer.close()
+
+    worker_time = round(time.time() - start_time, 4)
+    logger.info(f"[Analysis Worker] run_id={run_id} 종료, 실행 시간: {worker_time} sec, 제한기 상태: {limiter.snapshot()}, "
+                f"결과 저장: {writer.snapshot()}")
+
+
+# 상시 워커: 진행 중인 작업이 생기면 참여
+# 이미 참여한 작업은 남은 작업이 다시 생긴 경우(재시작 등)에만 다시 참여(리더가 종료 처리하는 동안 재진입하지 않음)
+async def run_worker_forever(idle_interval: int = 5):
+    joined_run_id = None
+    while True:
+        run_id = get_active_run_id()
+        if run_id and (run_id != joined_run_id or remaining_count(run_id) > 0):
+            joined_run_id = run_id
+            await run_worker(run_id)
+        await asyncio.sleep(idle_interval)
+
+
+# 분산 스케줄링: 리더 선출에 성공하면 작업 등록 후 워커로 참여, 실패하면 워커로만 참여
+async def run_distributed_task(run_id: str = None, rerun: bool = False, pipeline: str = None):
+    try:
+        start_time = time.time()
+        run_id = run_id or get_weekly_run_id()
+
+        token = try_acquire_leader(run_id)
+        if token is None:
+            logger.info(f"[Analysis Worker] run_id={run_id} 리더가 이미 존재하여 워커로 참여")
+            await run_worker(run_id)
+            return
+
+        logger.info(f"[Analysis Leader] run_id={run_id} 리더 선출")
+        stop_event = asyncio.Event()
+        lease_task = asyncio.create_task(keep_leader_lease(run_id, token, stop_event))
+
+        try:
+            # 분석 대상 선별 및 큐 등록: 일괄 집계한 평균 영양성분은 회원별 payload로 전달
+            # 동기 DB 작업은 쓰레드에서 실행(이벤트 루프가 멈추면 리더 임대 연장 불가)
+            target_ids, meals_avg_map = await asyncio.to_thread(prepare_analysis_job, run_id, rerun=rerun, pipeline=pipeline)
+            payloads = {
+                member_id: json.dumps(meals_avg_map[member_id])
+                for member_id in target_ids if member_id in meals_avg_map
+            }
+            enqueue_members(run_id, target_ids, payloads)
+
+            # 리더도 워커로 참여
+            await run_worker(run_id)
+
+            # 작업 종료 및 요약
+            finish_analysis_job(run_id)
+            close_queue(run_id)
+        finally:
+            stop_event.set()
+            await lease_task
+            release_leader(run_id, token)
+
+        total_time = round(time.time() - start_time, 4)
+        logger.info(f"[Scheduler Total Execution Time] 전체 실행 시간: {total_time} sec")
+
+    except Exception as e:
+        logger.error(f"분산 스케줄링 작업 중 오류 발생: {e}")
+    finally:
+        # 이번 작업의 이벤트 루프에 묶인 비동기 DB 연결 정리
+        await dispose_async_engine()
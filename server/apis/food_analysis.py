@@ -1,11 +1,13 @@
 # 메인 로직 작성
 import os
+import json
 import time
-import pandas as pd
+import hashlib
 import asyncio
 import functools
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 from operator import itemgetter
@@ -13,15 +15,30 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_anthropic import ChatAnthropic
 from core.config import settings
 from utils.file_handler import load_all_prompts
-from utils.redis_integration import rate_limit_check
-from db.database import get_db
+from utils.cohort_index import get_cohort_index
+from utils.concurrency import AdaptiveConcurrencyLimiter, current_limiter
+from utils.result_writer import AnalysisResultWriter, current_result_writer
+from utils.llm_cache import get_llm_cache_stats
+from utils.ab_metrics import (record_candidate_outcome, get_recent_failure_rate, record_ab_run, get_ab_stats,
+                              get_token_usage_callback)
+from utils.analysis_cache import get_analysis_cache_stats
+from utils.analysis_job import (JOB_RUNNING, JOB_DONE, JOB_SKIPPED, JOB_FAILED, JOB_COMPLETED_STATES, get_weekly_run_id,
+                                init_job, get_member_states, set_member_state, set_job_meta, get_job_meta, add_time_saved, finish_job,
+                                start_active_run, end_active_run, reset_pending_members)
+from db.database import get_db, create_async_session, dispose_async_engine
+from db import async_crud
 from db.models import AnalysisStatus
-from db.crud import (create_eat_habits, get_user_data, get_all_member_id, get_last_weekend_meals, 
-                     add_analysis_status, update_analysis_status, create_diet_analysis)
+from db.crud import (get_user_data, get_all_member_id, get_last_weekend_meals, 
+                     add_analysis_status, update_analysis_status, save_analysis_results, get_all_member_meals_avg,
+                     fail_pending_analysis_status, get_latest_analysis_fingerprint, get_analysis_result_record,
+                     get_pending_member_ids)
 from utils.scheduler import scheduler_listener
-from templates.prompt_template import (create_advice_chain, create_nutrition_analysis_chain, create_improvement_chain, 
-                                       create_diet_recommendation_chain, create_summarize_chain, create_evaluation_chain)
-from errors.server_exception import ExternalAPIError, FileAccessError, QueryError
+from utils.llm_cache import get_model_name
+from templates.prompt_template import (llm, analysis_llm, FUSED_MAX_TOKENS, create_advice_chain, create_fused_analysis_chain, create_nutrition_analysis_chain, create_improvement_chain, 
+                                       create_diet_recommendation_chain, create_summarize_chain, create_evaluation_chain,
+                                       get_registered_chain, chain_registry)
+from errors.server_exception import ExternalAPIError, QueryError
+from errors.business_exception import NoAnalysisRecord
 from logs.logger_config import get_logger
 from openai import RateLimitError, APIConnectionError, APIStatusError, APITimeoutError
 
@@ -37,6 +54,14 @@ logger = get_logger()
 THRESHOLD_RELEVANCE= 3.0
 THRESHOLD_FAITHFULNESS= 0.6
 
+# 분석 파이프라인: chained(영양소 분석 → 개선점 → 식단 → 요약 순차 호출) / fused(구조화된 출력으로 단일 호출)
+PIPELINE_CHAINED = "chained"
+PIPELINE_FUSED = "fused"
+
+# A/B 실행 방식: sequential(A 평가 후 B 실행) / hedged(A 지연 또는 실패 예측 시 B 동시 실행)
+AB_MODE_SEQUENTIAL = "sequential"
+AB_MODE_HEDGED = "hedged"
+
 # 지수 백오프 및 Fallback(Multi-Chain)
 def retry_with_fallback(max_retries=3, initial_delay=1, backoff_factor=2):
     def decorator(func):
@@ -46,34 +71,34 @@ def retry_with_fallback(max_retries=3, initial_delay=1, backoff_factor=2):
             delay = initial_delay
             while attempts < max_retries:
                 try:
-                    # API 호출 전 Rate-Limit 확인
-                    await rate_limit_check()
+                    # 모델별 Rate-Limit은 각 Chain의 모델 호출 직전에 확인(with_llm_quota)
                     return await func(*args, **kwargs)
                 except (RateLimitError, APITimeoutError, APIConnectionError, APIStatusError) as e:
                     attempts += 1
+                    # 동시 실행 제한기에 실패 신호 전달: Rate-Limit / Timeout은 동시 실행 수 급감
+                    limiter = current_limiter.get()
+                    if limiter is not None:
+                        limiter.record_error(throttled=isinstance(e, (RateLimitError, APITimeoutError)))
                     logger.error(f"[Diet Analysis Error] {e} 발생: {delay}초 후 재시도(시도 {attempts}/{max_retries}")
                     await asyncio.sleep(delay)
                     delay *= backoff_factor
             # 재시도 횟수 초과시 Fallback 호출
             logger.info("재시도 횟수 초과: Fallback 실행")
-            # Fallback 모델
-            fallback_llm = ChatAnthropic(model="claude-3-5-sonnet-20241022", temperature=0, max_tokens=250)
-            return await run_combined_chain(args[0], llm_override=fallback_llm)
+            # Fallback 모델: 통합 분석은 응답이 길어 최대 토큰 확대
+            pipeline = kwargs.get("pipeline", PIPELINE_CHAINED)
+            max_tokens = FUSED_MAX_TOKENS if pipeline == PIPELINE_FUSED else 250
+            fallback_llm = ChatAnthropic(model="claude-3-5-sonnet-20241022", temperature=0, max_tokens=max_tokens)
+            return await run_combined_chain(args[0], llm_override=fallback_llm, pipeline=pipeline)
         return wrapper
     return decorator
 
 
-# csv 파일 조회 및 필터링 진행
+# csv 파일 조회 및 필터링 진행: 인메모리 코호트 인덱스 사용
 def filter_calculate_averages(data_path, user_data):
     
-    # csv 파일 조회
+    # 코호트 인덱스 조회(파일 수정 시 자동 재적재)
     csv_path = os.path.join(data_path, "diet_advice.csv")
-    df = pd.read_csv(csv_path)
-
-    # csv 파일 조회 없을 시 예외처리 
-    if df.empty:
-        logger.error("csv 파일(diet_advice.csv)을 불러오기에 실패했습니다.")
-        raise FileAccessError()
+    cohort_index = get_cohort_index(csv_path)
     
     # 성별 변환 처리 (user_data['gender'] -> 숫자로 변환)
     gender_map = {"Male": 1, "Female": 2}
@@ -82,24 +107,17 @@ def filter_calculate_averages(data_path, user_data):
     if user_gender is None:
         return {"carbo_avg": "데이터 없음", "protein_avg": "데이터 없음", "fat_avg": "데이터 없음"}
 
-    # 조건 필터링
-    filtered_df = df[
-        (df['gender'] == user_gender) &
-        (abs(df['age'] - user_data['age']) <= 6) &
-        (abs(df['height'] - user_data['height']) <= 6) &
-        (abs(df['weight'] - user_data['weight']) <= 6) &
-        (abs(df['physical_activity_index'] - user_data['physical_activity_index']) <= 1)
-    ]
-
-    # 각 열의 평균 계산
-    if not filtered_df.empty:
-        averages = {
-            'carbo_avg': filtered_df['carbohydrate'].mean(),
-            'protein_avg': filtered_df['protein'].mean(),
-            'fat_avg': filtered_df['fat'].mean(),
-        }
-    else:
-        # 조건에 맞는 데이터가 없으면 평균값 데이터없음 설정
+    # 조건 필터링 및 각 열의 평균 계산
+    averages = cohort_index.lookup(
+        gender=user_gender,
+        age=user_data['age'],
+        height=user_data['height'],
+        weight=user_data['weight'],
+        physical_activity_index=user_data['physical_activity_index']
+    )
+
+    # 조건에 맞는 데이터가 없으면 평균값 데이터없음 설정
+    if averages is None:
         averages = {'carbo_avg': "데이터 없음",
                     'protein_avg': "데이터 없음",
                     'fat_avg': "데이터 없음"}
@@ -117,14 +135,40 @@ def weight_predict(user_data: dict) -> str:
     else:
         return '감소'
 
-# Analysis Multi-Chain 연결
-async def create_multi_chain(input_data, llm_override=None):
+# 분석 입력값 해시: 신체 정보, 평균 영양성분, 코호트 평균, 체중 예측, 프롬프트 버전, 모델, 파이프라인
+def compute_analysis_fingerprint(user_data: dict, weight_prediction: str, prompt_version: str,
+                                 pipeline: str = PIPELINE_CHAINED) -> str:
+    # 부동소수점 집계 오차로 해시가 달라지지 않도록 반올림
+    normalized = {
+        key: round(value, 4) if isinstance(value, float) else value
+        for key, value in user_data.items()
+    }
+    payload = json.dumps({
+        "user_data": normalized,
+        "weight_prediction": weight_prediction,
+        "prompt_version": prompt_version,
+        "models": [get_model_name(llm), get_model_name(analysis_llm)],
+        "pipeline": pipeline
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Multi-Chain을 구성하는 Chain
+MULTI_CHAIN_NAMES = ["nutrition_analysis", "diet_improvement", "custom_recommendation", "diet_summary"]
+
+# Analysis Multi-Chain 연결: 회원마다 다시 만들지 않고 레지스트리에서 공유
+# variant: A/B 실행별 결과 캐시 구분
+async def create_multi_chain(input_data=None, llm_override=None, variant=None):
+    return await get_registered_chain("multi_chain", MULTI_CHAIN_NAMES,
+                                      lambda: build_multi_chain(llm_override, variant), llm_override, variant)
+
+# Multi-Chain 구성
+async def build_multi_chain(llm_override=None, variant=None):
     try:
         # 체인 정의
-        nutrient_chain = await create_nutrition_analysis_chain(llm_override)
-        improvement_chain = await create_improvement_chain(llm_override)
-        recommendation_chain = await create_diet_recommendation_chain(llm_override)
-        summary_chain = await create_summarize_chain(llm_override)
+        nutrient_chain = await create_nutrition_analysis_chain(llm_override, variant)
+        improvement_chain = await create_improvement_chain(llm_override, variant)
+        recommendation_chain = await create_diet_recommendation_chain(llm_override, variant)
+        summary_chain = await create_summarize_chain(llm_override, variant)
         
         # 체인 실행 흐름 정의
         multi_chain = (
@@ -194,54 +238,149 @@ def compare_results(result_A, result_B, eval_A, eval_B):
         return result_B
 
 
-# 평가 후 재실행 함수: A/B 테스트 적용
-async def run_multi_chain(user_data, llm_override=None):
-    evaluation_chain = await create_evaluation_chain(llm_override)
-
+# 파이프라인 1회 실행: chained는 Multi-Chain, fused는 식습관 조언까지 포함한 단일 호출
+async def run_analysis_pipeline(user_data, llm_override=None, variant=None, pipeline=PIPELINE_CHAINED):
+    if pipeline == PIPELINE_FUSED:
+        fused_chain = await create_fused_analysis_chain(llm_override, variant)
+        return await fused_chain.ainvoke(user_data)
+
+    multi_chain = await create_multi_chain(user_data, llm_override, variant=variant)
+    return await multi_chain.ainvoke(user_data)
+
+# Chain 레지스트리 사전 생성: 기본 모델 기준 A/B 실행에 사용하는 Chain을 미리 생성
+async def warm_up_chains():
+    start = time.time()
+    for variant in ["A", "B"]:
+        await create_multi_chain(variant=variant)
+        await create_fused_analysis_chain(variant=variant)
+    await create_advice_chain()
+    await create_evaluation_chain()
+    logger.info(f"[Chain Registry] Chain 사전 생성 완료: {round(time.time() - start, 4)} sec, {chain_registry.snapshot()}")
+
+# 후보 1개 실행 및 평가: 평가 결과를 포함한 결과 반환
+async def run_ab_candidate(user_data, evaluation_chain, variant, llm_override=None, pipeline=PIPELINE_CHAINED):
+    result = await run_analysis_pipeline(user_data, llm_override, variant=variant, pipeline=pipeline)
+    evaluation = await evaluation_chain.ainvoke({**user_data, **result})
+
+    # 실행 평가 점수 로그
+    logger.info(f"실행({variant}) 평가 점수 → Relevance: {evaluation['relevance']:.2f}, Faithfulness: {evaluation['faithfulness']:.2f}")
+    return {**result, "evaluation": evaluation}
+
+# 평가 점수 임계값 통과 여부
+def passes_threshold(evaluation):
+    return evaluation["relevance"] >= THRESHOLD_RELEVANCE and evaluation["faithfulness"] >= THRESHOLD_FAITHFULNESS
+
+# A 평가 실패 예측: 코호트 평균이 없거나(비교 기준 부재) 최근 A 실패율이 기준 이상이면 B 즉시 시작
+def predict_candidate_failure(user_data):
+    if any(user_data.get(key) == "데이터 없음" for key in ["carbo_avg", "protein_avg", "fat_avg"]):
+        return True
+    return get_recent_failure_rate() >= settings.ANALYSIS_HEDGE_FAILURE_RATE
+
+# 순차 A/B: A 평가가 임계값 미달일 때만 B 실행
+# 반환값: (최종 결과, 실행한 후보 수)
+async def run_sequential_ab(user_data, evaluation_chain, llm_override=None, pipeline=PIPELINE_CHAINED):
     # 첫 번째 실행(A)
-    multi_chain_A = await create_multi_chain(user_data, llm_override)
-    result_A = await multi_chain_A.ainvoke(user_data)
-    evaluation_A = await evaluation_chain.ainvoke({**user_data, **result_A})
-
-    # 첫 번째 실행 평가 결과 추가(A)
-    result_A_with_eval = {**result_A, "evaluation": evaluation_A}
-    relevance_A = evaluation_A["relevance"]
-    faithfulness_A = evaluation_A["faithfulness"]
-
-    # 첫 번째 실행 평가 점수 로그
-    logger.info(f"첫 번째 실행(A) 평가 점수 → Relevance: {relevance_A:.2f}, Faithfulness: {faithfulness_A:.2f}")
+    result_A_with_eval = await run_ab_candidate(user_data, evaluation_chain, "A", llm_override, pipeline)
+    record_candidate_outcome(passes_threshold(result_A_with_eval["evaluation"]))
 
     # 첫 번째 실행 결과가 임계값을 넘을 경우 해당 결과값 적재
-    if relevance_A >= THRESHOLD_RELEVANCE and faithfulness_A >= THRESHOLD_FAITHFULNESS:
+    if passes_threshold(result_A_with_eval["evaluation"]):
         logger.info("첫 번째 Multi-Chain(A) 실행 성공하여 결과 저장")
-        return result_A_with_eval
+        return result_A_with_eval, 1
     
-    # 두 번째 실행(B)
-    multi_chain_B = await create_multi_chain(user_data, llm_override)
-    result_B = await multi_chain_B.ainvoke(user_data)
-    evaluation_B = await evaluation_chain.ainvoke({**user_data,**result_B})
+    # 두 번째 실행(B): 캐시된 A 결과가 다시 반환되지 않도록 별도 캐시 키 사용
+    result_B_with_eval = await run_ab_candidate(user_data, evaluation_chain, "B", llm_override, pipeline)
 
-    # 두 번째 실행 평가 결과 추가(B)
-    result_B_with_eval = {**result_B, "evaluation": evaluation_B}
-    relevance_B = evaluation_B["relevance"]
-    faithfulness_B = evaluation_B["faithfulness"]
+    # 두 번째 실행 결과가 임계값을 넘을 경우 해당 결과값 적재
+    if passes_threshold(result_B_with_eval["evaluation"]):
+        logger.info("두 번째 Multi-Chain(B) 실행 성공하여 결과 저장")
+        return result_B_with_eval, 2
 
-    # 두 번째 실행 평가 점수 로그
-    logger.info(f"두 번째 실행(B) 평가 점수 → Relevance: {relevance_B:.2f}, Faithfulness: {faithfulness_B:.2f}")
+    # 두 실행 모두 임계값 미달하여 A/B 테스트 후 최적의 결과값 적재
+    logger.info("두 실행(A, B) 모두 임계값 미달")
+    final_result = compare_results(result_A_with_eval, result_B_with_eval,
+                                   result_A_with_eval["evaluation"], result_B_with_eval["evaluation"])
+    return final_result, 2
+
+# Hedged A/B: A 실패가 예측되거나 지연되면 B를 함께 실행하고, 먼저 임계값을 통과한 후보 채택 후 나머지 취소
+# 반환값: (최종 결과, 실행한 후보 수)
+async def run_hedged_ab(user_data, evaluation_chain, llm_override=None, pipeline=PIPELINE_CHAINED):
+    tasks = {"A": asyncio.create_task(run_ab_candidate(user_data, evaluation_chain, "A", llm_override, pipeline))}
+
+    # A 실패 예측 시 B 즉시 시작, 아니면 지연 시간 동안 A 완료 대기
+    if not predict_candidate_failure(user_data):
+        await asyncio.wait([tasks["A"]], timeout=settings.ANALYSIS_HEDGE_DELAY)
+        if tasks["A"].done() and not tasks["A"].exception() and passes_threshold(tasks["A"].result()["evaluation"]):
+            record_candidate_outcome(True)
+            logger.info("첫 번째 Multi-Chain(A) 실행 성공하여 결과 저장")
+            return tasks["A"].result(), 1
+
+    logger.info("Hedged A/B: 두 번째 Multi-Chain(B) 실행 시작")
+    tasks["B"] = asyncio.create_task(run_ab_candidate(user_data, evaluation_chain, "B", llm_override, pipeline))
+    results, errors = {}, {}
 
-    # 두 번째 실행 결과가 임계값을 넘을 경우 해당 결과값 적재
-    if relevance_B >= THRESHOLD_RELEVANCE and faithfulness_B >= THRESHOLD_FAITHFULNESS:
-        logger.info("첫 번째 Multi-Chain(A) 실행 성공하여 결과 저장")
-        return result_B_with_eval
+    try:
+        pending = {task for task in tasks.values() if not task.done()}
+        while True:
+            # 완료된 후보 결과 확인: 먼저 임계값을 통과한 후보 채택(A 우선)
+            for variant, task in tasks.items():
+                if task.done() and variant not in results and variant not in errors:
+                    if task.exception():
+                        errors[variant] = task.exception()
+                    else:
+                        results[variant] = task.result()
+                        if variant == "A":
+                            record_candidate_outcome(passes_threshold(results["A"]["evaluation"]))
+
+            for variant in ["A", "B"]:
+                if variant in results and passes_threshold(results[variant]["evaluation"]):
+                    logger.info(f"Multi-Chain({variant}) 실행 성공하여 결과 저장")
+                    return results[variant], 2
+
+            if not pending:
+                break
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # 더 이상 필요 없는 후보 취소
+        for variant, task in tasks.items():
+            if not task.done():
+                logger.info(f"Hedged A/B: Multi-Chain({variant}) 실행 취소")
+                task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    # 두 후보 모두 실패하면 A의 오류 전달(Fallback 처리)
+    if not results:
+        raise errors.get("A") or errors["B"]
+    if len(results) == 1:
+        return next(iter(results.values())), 2
 
     # 두 실행 모두 임계값 미달하여 A/B 테스트 후 최적의 결과값 적재
     logger.info("두 실행(A, B) 모두 임계값 미달")
-    final_result = compare_results(result_A_with_eval, result_B_with_eval, evaluation_A, evaluation_B)
-    
+    final_result = compare_results(results["A"], results["B"], results["A"]["evaluation"], results["B"]["evaluation"])
+    return final_result, 2
+
+# 평가 후 재실행 함수: A/B 테스트 적용(ab_mode: sequential / hedged, 미지정 시 ANALYSIS_AB_MODE 설정값)
+async def run_multi_chain(user_data, llm_override=None, pipeline=PIPELINE_CHAINED, ab_mode=None):
+    ab_mode = ab_mode or settings.ANALYSIS_AB_MODE
+    evaluation_chain = await create_evaluation_chain(llm_override)
+
+    # 모드별 토큰 사용량 / 회원당 지연시간 기록: Fallback 모델(Claude) 토큰도 집계
+    with get_token_usage_callback() as cb:
+        start = time.time()
+        if ab_mode == AB_MODE_HEDGED:
+            final_result, candidates = await run_hedged_ab(user_data, evaluation_chain, llm_override, pipeline)
+        else:
+            final_result, candidates = await run_sequential_ab(user_data, evaluation_chain, llm_override, pipeline)
+        latency = time.time() - start
+
+    record_ab_run(ab_mode, latency, cb.total_tokens, candidates, fallback=llm_override is not None)
     return final_result
 
-# Multi-Chain + Advice-Chain
-async def run_combined_chain(input_data, llm_override=None):
+# Multi-Chain + Advice-Chain: fused 파이프라인은 식습관 조언이 결과에 포함
+async def run_combined_chain(input_data, llm_override=None, pipeline=PIPELINE_CHAINED):
+    if pipeline == PIPELINE_FUSED:
+        return await run_multi_chain(input_data, llm_override, pipeline=pipeline)
+
     advice_chain = await create_advice_chain(llm_override)
     
     # 병렬 실행
@@ -253,124 +392,190 @@ async def run_combined_chain(input_data, llm_override=None):
 
 # Fallback 기능이 적용
 @retry_with_fallback(max_retries=3, initial_delay=1, backoff_factor=2)
-async def perform_diet_analsyis(user_data, llm_override=None):
-    result = await run_combined_chain(user_data, llm_override=llm_override)
+async def perform_diet_analsyis(user_data, llm_override=None, pipeline=PIPELINE_CHAINED):
+    result = await run_combined_chain(user_data, llm_override=llm_override, pipeline=pipeline)
     return result
 
-# 식습관 분석 실행 함수
-async def run_analysis(db: Session, member_id: int):
+# 분석 입력값 구성: 회원 정보 / 평균 영양성분 조회, 코호트 평균, 체중 예측
+# 반환값: (user_data, Chain 입력값, 체중 예측), 최근 7일간 식사 기록이 없으면 None
+# member: 일괄 조회한 회원 정보(미지정 시 개별 조회)
+def build_analysis_input(db: Session, member_id: int, avg_nutrition: dict = None, member=None):
+
+    # 1. 데이터베이스 조회 시간 측정
+    start_db = time.time()
+
+    # 식사 기록 / 유저 데이터 확인: 일괄 집계 결과가 있으면 식사 기록 존재가 보장됨
+    meals = get_last_weekend_meals(db, member_id) if avg_nutrition is None else True
+    if not meals:
+        logger.info(f"member_id={member_id}: 최근 7일간 식사 기록 없음")
+        return None
+
+    user_data = get_user_data(db, member_id, avg_nutrition=avg_nutrition, member=member)
+
+    end_db = time.time()
+    db_time = round(end_db - start_db, 4)
+    logger.info(f"[DB Query Time] member_id={member_id}, 실행 시간: {db_time} sec")
+
+    # 유저 데이터 조회 실패 예외처리 
+    if not user_data:
+        logger.error("run_analysis: user_data 조회 에러 발생")
+        raise QueryError()
+
+    # 리스트를 딕셔너리로 변환
+    user_dict = {key: value for d in user_data["user"] for key, value in d.items()}
+
+    # 2. CSV 조회 시간 측정
+    start_csv = time.time()
+
+    # 영양소 평균값 계산
+    averages = filter_calculate_averages(settings.DATA_PATH, user_dict)
+
+    end_csv = time.time()
+    csv_time = round(end_csv - start_csv, 4)
+    logger.info(f"[CSV Read Time] member_id={member_id}, 실행 시간: {csv_time} sec")
+
+    for key in ["carbo_avg", "protein_avg", "fat_avg"]:
+        averages[key] = averages.get(key, "데이터 없음")
+    
+    # 체중 예측
+    weight_result = weight_predict(user_data)
+    user_data['weight_change'] = weight_result
+
+    updated_user_data = {
+        **user_dict, 
+        "carbo_avg": averages["carbo_avg"],
+        "protein_avg": averages["protein_avg"],
+        "fat_avg": averages["fat_avg"]
+    }
+
+    return user_data, updated_user_data, weight_result
+
+# 입력값이 최근 완료된 분석과 같으면 LLM 호출 없이 이전 결과 복제: 재사용 여부 반환
+def reuse_previous_analysis(db: Session, member_id: int, analysis_status_id: int, fingerprint: str, run_id: str = None):
+    previous = get_latest_analysis_fingerprint(db, member_id)
+    if not previous or previous.FINGERPRINT != fingerprint:
+        return False
+
+    return apply_previous_analysis(db, member_id, analysis_status_id, previous, run_id=run_id)
+
+# 이전 분석 결과 재사용: 결과 / 입력값 해시 복제 및 분석 상태 완료 처리(save_analysis_results 단일 트랜잭션)
+# 이전 결과가 온전하지 않으면(식습관 분석 결과 없음) 복제하지 않고 False 반환(LLM 분석 실행)
+def apply_previous_analysis(db: Session, member_id: int, analysis_status_id: int, previous, run_id: str = None):
+    try:
+        record = get_analysis_result_record(db, previous.ANALYSIS_STATUS_FK)
+    except NoAnalysisRecord:
+        logger.info(f"member_id={member_id}: 이전 분석 결과가 온전하지 않아 재사용하지 않음")
+        return False
+    save_analysis_results(db, [{
+        **record,
+        "status_id": analysis_status_id,
+        "member_id": member_id,
+        "fingerprint": previous.FINGERPRINT,
+        "chain_seconds": previous.CHAIN_SECONDS,
+        "is_reused": True
+    }])
+    if run_id:
+        add_time_saved(run_id, previous.CHAIN_SECONDS)
+    logger.info(f"member_id={member_id}: 입력값이 이전 분석과 같아 결과 재사용(절약한 Chain 실행 시간: {previous.CHAIN_SECONDS} sec)")
+    return True
+
+# 분석 결과 저장 값 구성: save_analysis_results / 결과 저장 버퍼 입력
+def build_analysis_record(member_id: int, analysis_status_id: int, final_results: dict,
+                          weight_prediction: str, avg_calorie: float, fingerprint: str, chain_seconds: float):
+    return {
+        "status_id": analysis_status_id,
+        "member_id": member_id,
+        "weight_prediction": weight_prediction,
+        "advice_carbo": final_results["diet_advice"]["carbo_advice"],
+        "advice_protein": final_results["diet_advice"]["protein_advice"],
+        "advice_fat": final_results["diet_advice"]["fat_advice"],
+        "summarized_advice": final_results["diet_summary"],
+        "avg_calorie": avg_calorie,
+        "nutrient_analysis": final_results["nutrition_analysis"],
+        "diet_improve": final_results["diet_improvement"],
+        "custom_recommend": final_results["custom_recommendation"],
+        "fingerprint": fingerprint,
+        "chain_seconds": chain_seconds
+    }
+
+# 분석 결과 저장: 식습관 조언 / 분석 결과, 입력값 해시 저장 및 분석 상태 완료 처리(단일 트랜잭션)
+def save_analysis_result(db: Session, member_id: int, analysis_status_id: int, final_results: dict,
+                         weight_prediction: str, avg_calorie: float, fingerprint: str, chain_seconds: float):
+    record = build_analysis_record(member_id, analysis_status_id, final_results, weight_prediction,
+                                   avg_calorie, fingerprint, chain_seconds)
+    save_analysis_results(db, [record])
+
+# 식습관 분석 실행 함수: avg_nutrition은 scheduled_task에서 일괄 집계한 평균 영양성분
+# 반환값: 분석 결과(JOB_DONE: 분석 완료, JOB_SKIPPED: 입력값이 같아 이전 결과 재사용, JOB_FAILED: 실패)
+# pipeline: 분석 파이프라인(미지정 시 ANALYSIS_PIPELINE 설정값)
+# db: 비동기 Session, 여러 쿼리를 묶어 실행하는 동기 CRUD는 run_sync로 실행하여 이벤트 루프를 막지 않음
+async def run_analysis(db: AsyncSession, member_id: int, avg_nutrition: dict = None, run_id: str = None, pipeline: str = None):
+
+    pipeline = pipeline or settings.ANALYSIS_PIPELINE
 
     # 프롬프트 적재
-    await load_all_prompts()
+    prompt_version = await load_all_prompts()
 
     # 분석 상태 업데이트
-    analysis_status = add_analysis_status(db, member_id)
+    analysis_status = await async_crud.add_analysis_status(db, member_id)
+    # rollback 후에도 조회 없이 사용하도록 PK 보관
+    status_id = analysis_status.STATUS_PK
+    user_data = None
 
     try:
         # 분석 시작 시간
         start_total = time.time()
         logger.info(f"분석 시작 member_id: {member_id}")
 
-        # 1. 데이터베이스 조회 시간 측정
-        start_db = time.time()
-
-        # 식사 기록 / 유저 데이터 확인
-        meals = get_last_weekend_meals(db, member_id)
-        user_data = get_user_data(db, member_id)
-
-        end_db = time.time()
-        db_time = round(end_db - start_db, 4)
-        logger.info(f"[DB Query Time] member_id={member_id}, 실행 시간: {db_time} sec")
-
-        if not meals:
-            logger.info(f"member_id={member_id}: 최근 7일간 식사 기록 없음")
+        # 회원 데이터 조회 및 Chain 입력값 구성
+        analysis_input = await db.run_sync(build_analysis_input, member_id, avg_nutrition)
 
+        if analysis_input is None:
             # 식사 기록이 없으면 분석 상태 실패
-            db.query(AnalysisStatus).filter(AnalysisStatus.STATUS_PK==analysis_status.STATUS_PK).update({
-                "IS_PENDING": False,
-                "IS_ANALYZED": False,
-                "ANALYSIS_DATE": datetime.now()
-            })
-            db.commit()
+            await async_crud.fail_analysis_status(db, status_id, analysis_date=datetime.now())
             # 식사 기록 없으므로 분석 진행하지 않고 종료
-            return 
-
-        # 유저 데이터 조회 실패 예외처리 
-        if not user_data:
-            logger.error("run_analysis: user_data 조회 에러 발생")
-            QueryError()
-
-         # 리스트를 딕셔너리로 변환
-        user_dict = {key: value for d in user_data["user"] for key, value in d.items()}
-
-        # 2. CSV 조회 시간 측정
-        start_csv = time.time()
-
-        # 영양소 평균값 계산
-        averages = filter_calculate_averages(settings.DATA_PATH, user_dict)
+            return JOB_FAILED
 
-        end_csv = time.time()
-        csv_time = round(end_csv - start_csv, 4)
-        logger.info(f"[CSV Read Time] member_id={member_id}, 실행 시간: {csv_time} sec")
+        user_data, updated_user_data, weight_result = analysis_input
 
-        for key in ["carbo_avg", "protein_avg", "fat_avg"]:
-            averages[key] = averages.get(key, "데이터 없음")
-        
-        # 체중 예측
-        weight_result = weight_predict(user_data)
-        user_data['weight_change'] = weight_result
-
-        updated_user_data = {
-            **user_dict, 
-            "carbo_avg": averages["carbo_avg"],
-            "protein_avg": averages["protein_avg"],
-            "fat_avg": averages["fat_avg"]
-        }
+        # 입력값이 최근 완료된 분석과 같으면 LLM 호출 없이 이전 결과 복제
+        fingerprint = compute_analysis_fingerprint(updated_user_data, weight_result, prompt_version, pipeline)
+        if await db.run_sync(reuse_previous_analysis, member_id, status_id, fingerprint, run_id):
+            return JOB_SKIPPED
         
         # 3. Chain 실행 시간 측정
         start_multi_chain = time.time()
 
         # Chain 실행(with Fallback)
-        final_results = await perform_diet_analsyis(updated_user_data)
+        final_results = await perform_diet_analsyis(updated_user_data, pipeline=pipeline)
 
         end_multi_chain = time.time()
         multi_chain_time = round(end_multi_chain - start_multi_chain, 4)
         logger.info(f"[Chain Execution Time] member_id={member_id}, 실행 시간: {multi_chain_time} sec")
 
-        # 식습관 조언 데이터 저장
-        eat_habits = create_eat_habits(
-            db=db,
-            weight_prediction=weight_result,
-            advice_carbo=final_results["diet_advice"]["carbo_advice"],
-            advice_protein=final_results["diet_advice"]["protein_advice"],
-            advice_fat=final_results["diet_advice"]["fat_advice"],
-            summarized_advice=final_results["diet_summary"],
-            analysis_status_id=analysis_status.STATUS_PK,
-            avg_calorie=user_data['user'][5]['calorie']
-        )
-
-        # 식습관 분석 데이터 저장
-        create_diet_analysis(
-            db=db,
-            eat_habits_id=eat_habits.EAT_HABITS_PK,
-            nutrient_analysis=final_results["nutrition_analysis"],
-            diet_improve=final_results["diet_improvement"],
-            custom_recommend=final_results["custom_recommendation"]
-        )
-
-        # 분석 상태 완료 처리
-        update_analysis_status(db, analysis_status.STATUS_PK)
-        db.commit()
+        # 동시 실행 제한기에 Chain 지연시간 전달
+        limiter = current_limiter.get()
+        if limiter is not None:
+            limiter.record_success(multi_chain_time)
+
+        # 분석 결과 저장 및 분석 상태 완료 처리: 결과 저장 버퍼가 있으면 다른 회원과 함께 일괄 저장
+        record = build_analysis_record(member_id, status_id, final_results, weight_result,
+                                       avg_calorie=user_data['user'][5]['calorie'], fingerprint=fingerprint,
+                                       chain_seconds=multi_chain_time)
+        writer = current_result_writer.get()
+        if writer is not None:
+            await writer.write(record)
+        else:
+            await db.run_sync(save_analysis_results, [record])
+        return JOB_DONE
 
     except Exception as e:
         logger.error(f"분석 진행(run_analysis) 에러 member_id: {member_id}, user_data: {user_data} - {e}")
 
         # 분석 실패: IS_PENDING=False, IS_ANALYZED=False
-        db.query(AnalysisStatus).filter(AnalysisStatus.STATUS_PK == analysis_status.STATUS_PK).update({
-            "IS_PENDING": False,
-            "IS_ANALYZED": False
-        })
-        db.commit()
+        await db.rollback()
+        await async_crud.fail_analysis_status(db, status_id)
+        return JOB_FAILED
     
     finally:
         # 분석 종료 시간
@@ -379,36 +584,164 @@ async def run_analysis(db: Session, member_id: int):
         logger.info(f"[Total Execution Time] member_id={member_id}, 실행 시간: {total_time}")
 
 
-# run_analysis 비동기처리
-async def run_analysis_async(member_id: int, semaphore: asyncio.Semaphore):
-    # OpenAI API Rate-Limit 고려
-    async with semaphore:
-        db = next(get_db())
-        try:
-            await run_analysis(db, member_id)
-            await asyncio.sleep(1)
-        except Exception as e:
-            db.rollback()
-            logger.error(f"식습관 분석 실패 member_id: {member_id} - {e}")
-        finally:
-            db.close()
-
-# 스케줄링 설정
-async def scheduled_task():
+# 분석 결과 저장 버퍼 생성: 실행 중인 이벤트 루프 안에서 생성
+def create_result_writer():
+    return AnalysisResultWriter(
+        batch_size=settings.ANALYSIS_WRITE_BATCH_SIZE,
+        flush_interval=settings.ANALYSIS_WRITE_FLUSH_INTERVAL
+    )
+
+# 식습관 분석 동시 실행 제한기 생성: 실행 중인 이벤트 루프 안에서 생성
+def create_analysis_limiter():
+    return AdaptiveConcurrencyLimiter(
+        name="diet_analysis",
+        initial_limit=settings.ANALYSIS_INITIAL_CONCURRENCY,
+        min_limit=1,
+        max_limit=settings.ANALYSIS_MAX_CONCURRENCY,
+        latency_target=settings.ANALYSIS_LATENCY_TARGET
+    )
+
+# run_analysis 비동기처리: run_id가 주어지면 회원별 작업 상태 기록
+async def run_analysis_async(member_id: int, limiter: AdaptiveConcurrencyLimiter, avg_nutrition: dict = None,
+                             run_id: str = None, pipeline: str = None):
+    # OpenAI API Rate-Limit 고려: 응답 지연 / 429 발생에 따라 동시 실행 수 자동 조절
+    async with limiter:
+        await run_member_analysis(member_id, limiter, avg_nutrition=avg_nutrition, run_id=run_id, pipeline=pipeline)
+
+# 회원 1명 분석 실행: 호출하는 쪽에서 제한기 슬롯을 획득한 상태여야 함
+async def run_member_analysis(member_id: int, limiter: AdaptiveConcurrencyLimiter, avg_nutrition: dict = None,
+                              run_id: str = None, pipeline: str = None):
+    current_limiter.set(limiter)
+    db = create_async_session()
+    state = JOB_FAILED
     try:
-        # 스케줄러 전체 실행 소요시간
-        start_time = time.time() 
+        if run_id:
+            set_member_state(run_id, member_id, JOB_RUNNING)
+        state = await run_analysis(db, member_id, avg_nutrition=avg_nutrition, run_id=run_id, pipeline=pipeline)
+        await asyncio.sleep(1)
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"식습관 분석 실패 member_id: {member_id} - {e}")
+    finally:
+        await db.close()
+        if run_id:
+            set_member_state(run_id, member_id, state)
+
+# 분석 파이프라인 결정: 지정값 → 같은 작업의 이전 실행 설정 → ANALYSIS_PIPELINE 설정값
+def resolve_analysis_pipeline(run_id: str, pipeline: str = None):
+    return pipeline or get_job_meta(run_id).get("pipeline") or settings.ANALYSIS_PIPELINE
+
+# 분석 작업 준비: 작업 등록 후 완료되지 않은 회원과 일괄 집계한 평균 영양성분 반환
+def prepare_analysis_job(run_id: str, rerun: bool = False, pipeline: str = None):
+    pipeline = resolve_analysis_pipeline(run_id, pipeline)
+    db = next(get_db())
+    try:
+        member_ids = get_all_member_id(db)
+
+        # 작업 등록 및 완료되지 않은 회원 선별
+        init_job(run_id, member_ids, reset=rerun)
+        set_job_meta(run_id, {"pipeline": pipeline})
+        member_states = get_member_states(run_id)
+        target_ids = [member_id for member_id in member_ids if member_states.get(member_id) not in JOB_COMPLETED_STATES]
+
+        # 이전 실행이 중단되어 대기 상태로 남은 분석 기록 정리
+        interrupted_ids = [member_id for member_id in target_ids if member_states.get(member_id) == JOB_RUNNING]
+        fail_pending_analysis_status(db, interrupted_ids)
+
+        # 전역 분석 실행 상태: 진행 중인 작업 기록, 분석 대기 회원 집합을 DB 기준으로 재구성
+        start_active_run(run_id)
+        reset_pending_members(get_pending_member_ids(db))
+
+        logger.info(f"[Analysis Job] run_id={run_id}, 전체 회원: {len(member_ids)}, "
+                    f"완료로 건너뜀: {len(member_ids) - len(target_ids)}, 분석 대상: {len(target_ids)}, 중단 후 재시도: {len(interrupted_ids)}")
+
+        # 전체 회원의 일주일간 평균 영양성분 일괄 집계(단일 GROUP BY 쿼리)
+        start_aggregate = time.time()
+        meals_avg_map = get_all_member_meals_avg(db)
+        aggregate_time = round(time.time() - start_aggregate, 4)
+        logger.info(f"[Meals Aggregate Time] 대상 회원 수: {len(meals_avg_map)}, 실행 시간: {aggregate_time} sec")
+    finally:
+        db.close()
 
-        db_temp = next(get_db())
-        member_ids = get_all_member_id(db_temp)
-        db_temp.close()
+    return target_ids, meals_avg_map
 
-        # semaphore 생성
-        semaphore = asyncio.Semaphore(10)
+# 작업 종료 및 요약 로그
+def finish_analysis_job(run_id: str):
+    summary = finish_job(run_id)
+    end_active_run(run_id)
+    time_saved = round(float(summary["meta"].get("time_saved", 0)), 4)
+    logger.info(f"[Analysis Job] run_id={run_id} 종료 - 완료: {summary[JOB_DONE]}, 결과 재사용: {summary[JOB_SKIPPED]}, "
+                f"실패: {summary[JOB_FAILED]}, 전체: {summary['total']}, 절약한 Chain 실행 시간: {time_saved} sec")
+    try:
+        cache_stats = get_llm_cache_stats()
+        logger.info(f"[LLM Cache] 누적 적중: {cache_stats['hits']}, 미적중: {cache_stats['misses']}, "
+                    f"적중률: {cache_stats['hit_ratio']:.2%}, 저장 개수: {cache_stats['entries']}")
+    except Exception as e:
+        logger.error(f"[LLM Cache] 지표 조회 실패: {e}")
+    try:
+        analysis_cache_stats = get_analysis_cache_stats()
+        logger.info(f"[Analysis Cache] 누적 적중: {analysis_cache_stats['hits']}, 미적중: {analysis_cache_stats['misses']}, "
+                    f"적중률: {analysis_cache_stats['hit_ratio']:.2%}, 평균 응답 시간(적중 / 미적중): "
+                    f"{analysis_cache_stats['hit_latency_ms']} / {analysis_cache_stats['miss_latency_ms']} ms")
+    except Exception as e:
+        logger.error(f"[Analysis Cache] 지표 조회 실패: {e}")
+    try:
+        for mode, ab_stats in get_ab_stats().items():
+            logger.info(f"[A/B Metrics] {mode} - 회원 수: {ab_stats['members']}, 회원당 토큰: {ab_stats['tokens_per_member']}, "
+                        f"회원당 후보 수: {ab_stats['candidates_per_member']}, Fallback 실행: {ab_stats['fallback_members']}, "
+                        f"p95 지연시간: {ab_stats['latency_p95']} sec")
+    except Exception as e:
+        logger.error(f"[A/B Metrics] 지표 조회 실패: {e}")
+    return summary
 
-        # 병렬 실행: 모든 회원의 분석 동시에 실행
-        tasks = [asyncio.create_task(run_analysis_async(member_id, semaphore)) for member_id in member_ids]
-        await asyncio.gather(*tasks)
+# 스케줄링 설정: 같은 run_id로 재실행하면 완료된 회원은 건너뛰고 나머지만 분석(rerun=True면 전체 재분석)
+# pipeline: 이번 실행의 분석 파이프라인(미지정 시 ANALYSIS_PIPELINE 설정값)
+async def scheduled_task(run_id: str = None, rerun: bool = False, pipeline: str = None):
+    try:
+        # 스케줄러 전체 실행 소요시간
+        start_time = time.time() 
+
+        # 주간 분석 작업 ID
+        run_id = run_id or get_weekly_run_id()
+        pipeline = resolve_analysis_pipeline(run_id, pipeline)
+        target_ids, meals_avg_map = prepare_analysis_job(run_id, rerun=rerun, pipeline=pipeline)
+
+        # Batch 실행 모드: 모든 회원의 프롬프트를 라운드별 Batch 요청으로 제출(chained 파이프라인만 지원)
+        if settings.ANALYSIS_EXECUTION_MODE == "batch":
+            if pipeline != PIPELINE_CHAINED:
+                logger.info(f"[Batch] {pipeline} 파이프라인은 Batch 모드에서 지원하지 않아 chained로 실행")
+            from apis.analysis_batch import run_batch_analysis
+            await run_batch_analysis(run_id, target_ids, meals_avg_map)
+        # Staged 실행 모드: 조회 → LLM → 저장 단계를 bounded queue로 연결하여 DB / LLM 작업을 겹쳐 실행
+        elif settings.ANALYSIS_EXECUTION_MODE == "staged":
+            from apis.analysis_pipeline import run_staged_analysis
+            await run_staged_analysis(run_id, target_ids, meals_avg_map, pipeline=pipeline)
+        else:
+            # Chain 사전 생성: 회원별 분석은 레지스트리의 Chain 공유
+            await warm_up_chains()
+
+            # 동시 실행 제한기 생성(AIMD)
+            limiter = create_analysis_limiter()
+
+            # 결과 저장 버퍼: 여러 회원의 결과를 모아 한 번의 트랜잭션으로 저장
+            writer = create_result_writer()
+            current_result_writer.set(writer)
+
+            # 병렬 실행: 모든 회원의 분석 동시에 실행(식사 기록이 없는 회원은 개별 조회 후 실패 처리)
+            tasks = [
+                asyncio.create_task(run_analysis_async(member_id, limiter, avg_nutrition=meals_avg_map.get(member_id),
+                                                       run_id=run_id, pipeline=pipeline))
+                for member_id in target_ids
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                await writer.close()
+            logger.info(f"[Adaptive Limiter] 최종 상태: {limiter.snapshot()}")
+            logger.info(f"[Result Writer] 최종 상태: {writer.snapshot()}")
+
+        # 작업 종료 및 요약
+        finish_analysis_job(run_id)
 
         end_time = time.time()
         total_scheduler_time = round(end_time - start_time, 4)
@@ -416,10 +749,18 @@ async def scheduled_task():
 
     except Exception as e:
         logger.error(f"스케줄링 전체 작업 중 오류 발생: {e}")
+    finally:
+        # 이번 작업의 이벤트 루프에 묶인 비동기 DB 연결 정리
+        await dispose_async_engine()
 
 # APScheduler에서 실행할 수 있도록 비동기 함수 실행 warpper 추가
 def run_async_task():
-    asyncio.run(scheduled_task())
+    # 분산 모드: 리더 선출 후 여러 워커 프로세스가 공유 큐에서 분석 수행
+    if settings.ANALYSIS_MODE == "distributed":
+        from apis.analysis_worker import run_distributed_task
+        asyncio.run(run_distributed_task())
+    else:
+        asyncio.run(scheduled_task())
 
 # APScheduler 설정 및 시작
 def start_scheduler():
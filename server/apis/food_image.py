@@ -2,11 +2,18 @@ import os
 import base64
 import time
 import asyncio
+import weakref
+from functools import partial
 from openai import AsyncOpenAI
 from openai import RateLimitError, APIError, APIConnectionError, APITimeoutError
 from pinecone.grpc import PineconeGRPC as Pinecone
 from core.config import settings
 from utils.file_handler import read_prompt
+from utils.redis_integration import acquire_llm_quota, estimate_tokens
+from utils.image_preprocess import preprocess_image_async
+from utils.embedding_batcher import EmbeddingBatcher
+from utils.embedding_cache import (normalize_food_name, get_cached_embeddings, set_cached_embeddings,
+                                   record_embedding_lookup, get_frequent_food_names)
 from fallback.fallback_food_image import food_image_analyze_fallback
 from errors.business_exception import ImageAnalysisError, ImageProcessingError
 from errors.server_exception import FileAccessError, ExternalAPIError
@@ -28,20 +35,27 @@ upstage = AsyncOpenAI(
 pc = Pinecone(api_key=settings.PINECONE_API_KEY)
 index = pc.Index(host=settings.INDEX_HOST)
 
-# Multi-part 방식 이미지 처리 및 Base64 인코딩
-async def process_image_to_base64(file):
+# Multi-part 방식 이미지 파일 읽기
+async def read_image_file(file):
     try:
-        # 파일 읽기
-        file_content = await file.read()
+        return await file.read()
+    except Exception as e:
+        logger.error(f"이미지 파일 읽기 실패: {e}")
+        raise ImageProcessingError()
 
-        # Base64 인코딩
-        image_base64 = base64.b64encode(file_content).decode("utf-8")
-        
-        return image_base64
+# 이미지 Base64 인코딩
+def encode_image_to_base64(file_content: bytes):
+    try:
+        return base64.b64encode(file_content).decode("utf-8")
     except Exception as e:
-        logger.error(f"이미지 파일 처리 및 Base64 인코딩 실패: {e}")
+        logger.error(f"이미지 Base64 인코딩 실패: {e}")
         raise ImageProcessingError()
 
+# Multi-part 방식 이미지 처리(축소 및 JPEG 재인코딩) 및 Base64 인코딩
+async def process_image_to_base64(file):
+    file_content = await preprocess_image_async(await read_image_file(file))
+    return encode_image_to_base64(file_content)
+
 # 음식 이미지 분석 API: prompt_type은 함수명과 동일
 async def food_image_analyze(image_base64: str):
 
@@ -58,6 +72,9 @@ async def food_image_analyze(image_base64: str):
     max_retries = 2
     for attemp in range(max_retries):
         try:
+            # 분당 호출 한도 확보(프롬프트 + 이미지(low detail) + 최대 응답 토큰)
+            await acquire_llm_quota("gpt-4o", tokens=estimate_tokens(prompt) + 85 + 300)
+
             # OpenAI API 호출
             response = await client.chat.completions.create(
                 model="gpt-4o",
@@ -104,25 +121,80 @@ async def food_image_analyze(image_base64: str):
     raise ImageAnalysisError()
 
 
-# 제공받은 음식의 벡터 임베딩 값 변환 작업 수행(Upstage-Embedding 사용)
-async def get_embedding(text, model="embedding-query"):
+# 여러 텍스트의 벡터 임베딩 값 변환을 한 번의 호출로 수행(Upstage-Embedding 사용), 반환값은 입력 순서
+async def get_embeddings(texts: list, model="embedding-query"):
     try:
-        text = text.replace("\n", " ")
-        response = await upstage.embeddings.create(input=[text], model=model)
-        return response.data[0].embedding
+        await acquire_llm_quota(model, tokens=sum(estimate_tokens(text) for text in texts))
+        response = await upstage.embeddings.create(input=texts, model=model)
+        if len(response.data) != len(texts):
+            raise ValueError(f"임베딩 결과 수 불일치: 벡터 {len(response.data)}건")
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
     except Exception as e:
-        logger.error(f"텍스트 임베딩 변환 실패: {e}")
+        logger.error(f"텍스트 임베딩 변환 실패({len(texts)}건): {e}")
         raise ExternalAPIError()
 
 
+# 이벤트 루프 / 모델별 임베딩 묶음 처리기(대기 중인 요청이 이벤트 루프에 묶임)
+_embedding_batchers = weakref.WeakKeyDictionary()
+
+def get_embedding_batcher(model="embedding-query"):
+    batchers = _embedding_batchers.setdefault(asyncio.get_running_loop(), {})
+    batcher = batchers.get(model)
+    if batcher is None:
+        batcher = EmbeddingBatcher(
+            partial(get_embeddings, model=model),
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            flush_interval=settings.EMBEDDING_BATCH_INTERVAL
+        )
+        batchers[model] = batcher
+    return batcher
+
+
+# 여러 음식명 벡터 임베딩 값 변환: 캐시(프로세스 내 LRU → Redis) 미적중 음식명만 묶어서 호출
+async def get_food_embeddings(texts: list, model="embedding-query"):
+    names = [normalize_food_name(text) for text in texts]
+    vectors, hits = await get_cached_embeddings(model, list(dict.fromkeys(names)))
+
+    missing = [name for name in dict.fromkeys(names) if name not in vectors]
+    if missing:
+        fetched = dict(zip(missing, await get_embedding_batcher(model).embed_many(missing)))
+        vectors.update(await set_cached_embeddings(model, fetched))
+
+    await record_embedding_lookup(names, hits, len(missing))
+    return [vectors[name].tolist() for name in names]
+
+
+# 제공받은 음식의 벡터 임베딩 값 변환 작업 수행
+async def get_embedding(text, model="embedding-query"):
+    return (await get_food_embeddings([text], model))[0]
+
+
+# 임베딩 캐시 미리 채우기(서버 시작 시): 가장 자주 탐지된 음식명을 Redis → 프로세스 내 LRU로 읽고, Redis에 없으면 임베딩
+async def warm_up_embedding_cache(model="embedding-query"):
+    try:
+        names = await get_frequent_food_names(settings.EMBEDDING_CACHE_WARMUP_SIZE)
+        vectors, _ = await get_cached_embeddings(model, names)
+
+        missing = [name for name in names if name not in vectors]
+        for start in range(0, len(missing), settings.EMBEDDING_BATCH_SIZE):
+            batch = missing[start:start + settings.EMBEDDING_BATCH_SIZE]
+            await set_cached_embeddings(model, dict(zip(batch, await get_embeddings(batch, model))))
+
+        logger.info(f"[Embedding Cache] 임베딩 캐시 준비 완료: {len(names)}건(새로 임베딩 {len(missing)}건)")
+    except Exception as e:
+        logger.error(f"[Embedding Cache] 임베딩 캐시 준비 실패: {e}")
+
+
 # 벡터 임베딩을 통한 유사도 분석 진행(Pinecone)
-async def search_similar_food(query_name, top_k=3, score_threshold=0.7, candidate_multiplier=2):
+async def search_similar_food(query_name, top_k=3, score_threshold=0.7, candidate_multiplier=2, query_vector=None):
     try:
-        # 음식명 Embedding Vector 변환
-        query_vector = await get_embedding(query_name)
+        # 음식명 Embedding Vector 변환(미리 변환한 값이 없을 때)
+        if query_vector is None:
+            query_vector = await get_embedding(query_name)
 
-        # Pinecone에서 유사도 검색
-        results = index.query(
+        # Pinecone에서 유사도 검색(gRPC 호출은 블로킹이므로 쓰레드에서 실행)
+        results = await asyncio.to_thread(
+            index.query,
             vector=query_vector,
             top_k=top_k * candidate_multiplier,
             include_metadata=True
@@ -153,3 +225,31 @@ async def search_similar_food(query_name, top_k=3, score_threshold=0.7, candidat
     except Exception as e:
         logger.error(f"유사도 검색 실패: {e}")
         raise ExternalAPIError()
+
+
+# 여러 음식명 유사도 검색 동시 진행: 임베딩은 캐시 조회 후 한 번에 변환, 검색은 최대 SIMILARITY_SEARCH_CONCURRENCY개, 결과는 입력 순서 유지
+async def search_similar_foods(query_names: list):
+    if not query_names:
+        return []
+
+    try:
+        query_vectors = await get_food_embeddings(query_names)
+    except Exception as e:
+        logger.error(f"유사도 검색 실패: {e}")
+        raise ExternalAPIError()
+
+    semaphore = asyncio.Semaphore(settings.SIMILARITY_SEARCH_CONCURRENCY)
+
+    async def search(query_name, query_vector):
+        async with semaphore:
+            return await search_similar_food(query_name, query_vector=query_vector)
+
+    tasks = [asyncio.ensure_future(search(query_name, query_vector))
+             for query_name, query_vector in zip(query_names, query_vectors)]
+    try:
+        return await asyncio.gather(*tasks)
+    except Exception:
+        # 하나라도 실패하면 남은 검색 취소(임베딩 호출 한도 낭비 방지)
+        for task in tasks:
+            task.cancel()
+        raise
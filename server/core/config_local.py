@@ -51,6 +51,7 @@ class Settings:
     RDS_PORT = os.getenv("RDS_PORT")
     RDS_DB_NAME = os.getenv("RDS_DB_NAME")
     DB_URL=f"mysql+pymysql://{RDS_DATABASE_USERNAME}:{RDS_DATABASE_PASSWORD}@{RDS_DATABASE_ENDPOINT}:{RDS_PORT}/{RDS_DB_NAME}?charset=utf8mb4"
+    DB_ASYNC_URL=f"mysql+aiomysql://{RDS_DATABASE_USERNAME}:{RDS_DATABASE_PASSWORD}@{RDS_DATABASE_ENDPOINT}:{RDS_PORT}/{RDS_DB_NAME}?charset=utf8mb4"
 
     # Redis
     REDIS_HOST = os.getenv("REDIS_HOST")
@@ -59,6 +60,79 @@ class Settings:
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
     RATE_LIMIT = int(os.getenv("RATE_LIMIT"))
 
+    # LLM 호출 제한: 모델별 {"rpm": int, "tpm": int} JSON(미설정 시 기본값 사용)
+    LLM_RATE_LIMITS = os.getenv("LLM_RATE_LIMITS")
+
+    # Analysis: local(단일 프로세스) / distributed(리더 + 워커 프로세스)
+    ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "local")
+
+    # Analysis: 동시 실행 수(AIMD) 초기값 / 최대값, 목표 p95 Chain 지연시간(초)
+    ANALYSIS_INITIAL_CONCURRENCY = int(os.getenv("ANALYSIS_INITIAL_CONCURRENCY", "10"))
+    ANALYSIS_MAX_CONCURRENCY = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "50"))
+    ANALYSIS_LATENCY_TARGET = float(os.getenv("ANALYSIS_LATENCY_TARGET", "60"))
+
+    # Analysis 파이프라인: chained(4단계 순차 호출) / fused(구조화된 출력 단일 호출)
+    ANALYSIS_PIPELINE = os.getenv("ANALYSIS_PIPELINE", "chained")
+
+    # Analysis 결과 일괄 저장: 한 트랜잭션에 저장할 최대 회원 수, 버퍼 최대 대기 시간(초)
+    ANALYSIS_WRITE_BATCH_SIZE = int(os.getenv("ANALYSIS_WRITE_BATCH_SIZE", "50"))
+    ANALYSIS_WRITE_FLUSH_INTERVAL = float(os.getenv("ANALYSIS_WRITE_FLUSH_INTERVAL", "0.5"))
+
+    # Analysis A/B 실행: sequential / hedged, B 시작 지연(초), B 즉시 시작 기준 최근 A 실패율
+    ANALYSIS_AB_MODE = os.getenv("ANALYSIS_AB_MODE", "sequential")
+    ANALYSIS_HEDGE_DELAY = float(os.getenv("ANALYSIS_HEDGE_DELAY", "30"))
+    ANALYSIS_HEDGE_FAILURE_RATE = float(os.getenv("ANALYSIS_HEDGE_FAILURE_RATE", "0.5"))
+
+    # Analysis 실행 방식: online(회원별 실시간 API, 기본값) / staged(조회 → LLM → 저장 단계별 파이프라인) / batch(Batch API)
+    # ANALYSIS_MODE=local에서 사용
+    ANALYSIS_EXECUTION_MODE = os.getenv("ANALYSIS_EXECUTION_MODE", "online")
+
+    # Analysis 단계별 파이프라인: 조회 묶음 크기, 단계 사이 큐 최대 크기, 단계별 지표 기록 간격(초)
+    ANALYSIS_PREFETCH_CHUNK_SIZE = int(os.getenv("ANALYSIS_PREFETCH_CHUNK_SIZE", "50"))
+    ANALYSIS_STAGE_QUEUE_SIZE = int(os.getenv("ANALYSIS_STAGE_QUEUE_SIZE", "50"))
+    ANALYSIS_STAGE_REPORT_INTERVAL = float(os.getenv("ANALYSIS_STAGE_REPORT_INTERVAL", "30"))
+
+    # Analysis Batch: 백엔드(openai / local), 요청 / 결과 파일 경로, 상태 확인 간격(초), 최대 대기 시간(초)
+    ANALYSIS_BATCH_BACKEND = os.getenv("ANALYSIS_BATCH_BACKEND", "openai")
+    ANALYSIS_BATCH_PATH = os.getenv("ANALYSIS_BATCH_PATH", "batch")
+    ANALYSIS_BATCH_POLL_INTERVAL = float(os.getenv("ANALYSIS_BATCH_POLL_INTERVAL", "60"))
+    ANALYSIS_BATCH_TIMEOUT = float(os.getenv("ANALYSIS_BATCH_TIMEOUT", "86400"))
+
+    # LLM 결과 캐시: 사용 여부, 보관 기간(초), 최대 저장 개수
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "604800"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+    # 식습관 분석 응답 캐시 보관 기간(초): 분석 주기(1주) + 여유 1일
+    ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", "691200"))
+
+    # 식습관 분석 완료 대기(long-poll) 최대 시간(초): 프록시 유휴 연결 제한보다 짧게 설정
+    ANALYSIS_WAIT_TIMEOUT = float(os.getenv("ANALYSIS_WAIT_TIMEOUT", "25"))
+
+    # 음식 이미지 분석 결과 캐시: 보관 기간(초), 거의 같은 이미지로 볼 dHash 해밍 거리(구간 4개 → 최대 3)
+    IMAGE_CACHE_TTL = int(os.getenv("IMAGE_CACHE_TTL", "604800"))
+    IMAGE_CACHE_MAX_DISTANCE = int(os.getenv("IMAGE_CACHE_MAX_DISTANCE", "3"))
+
+    # 이미지 전처리(외부 이미지 API 호출 전): 긴 변 최대 크기(px), JPEG 품질 / 최저 품질, 최대 용량(bytes), 전처리 쓰레드 수
+    IMAGE_MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "1024"))
+    IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "85"))
+    IMAGE_JPEG_MIN_QUALITY = int(os.getenv("IMAGE_JPEG_MIN_QUALITY", "50"))
+    IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", "307200"))
+    IMAGE_PREPROCESS_WORKERS = int(os.getenv("IMAGE_PREPROCESS_WORKERS", "4"))
+
+    # 음식 이미지 분석: 요청당 음식별 유사도 검색(임베딩 + Pinecone) 동시 실행 수
+    SIMILARITY_SEARCH_CONCURRENCY = int(os.getenv("SIMILARITY_SEARCH_CONCURRENCY", "4"))
+
+    # 임베딩 묶음 처리: 호출당 최대 텍스트 수, 동시 요청을 모으는 대기 시간(초)
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_BATCH_INTERVAL = float(os.getenv("EMBEDDING_BATCH_INTERVAL", "0.005"))
+
+    # 음식명 임베딩 캐시: 프로세스 내 LRU 개수(벡터당 약 16KB), Redis 보관 기간(초), 서버 시작 시 미리 채울 음식명 수, 탐지 횟수 보관 음식명 수
+    EMBEDDING_CACHE_LOCAL_SIZE = int(os.getenv("EMBEDDING_CACHE_LOCAL_SIZE", "1024"))
+    EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", "2592000"))
+    EMBEDDING_CACHE_WARMUP_SIZE = int(os.getenv("EMBEDDING_CACHE_WARMUP_SIZE", "200"))
+    EMBEDDING_CACHE_FREQUENCY_SIZE = int(os.getenv("EMBEDDING_CACHE_FREQUENCY_SIZE", "10000"))
+
     # GCP
     GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     
@@ -1,22 +1,55 @@
 import os
+import asyncio
+import weakref
 import redis
+import redis.asyncio
 from core.config import settings
 
-# 환경에 따른 설정 파일 로드
+# 환경에 따른 Redis 호스트 설정
 if os.getenv("APP_ENV") in ["prod", "dev"]:
-
-    # 운영: Redis 클라이언트 설정
-    redis_client = redis.StrictRedis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        decode_responses=True
-    )
+    # 운영
+    redis_host = settings.REDIS_HOST
 else:
-    # 개발: Redis 클라이언트 설정
-    redis_client = redis.StrictRedis(
-        host=settings.REDIS_LOCAL_HOST,  
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        decode_responses=True
-    )
\ No newline at end of file
+    # 개발
+    redis_host = settings.REDIS_LOCAL_HOST
+
+# Redis 클라이언트 설정
+redis_client = redis.StrictRedis(
+    host=redis_host,
+    port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD,
+    decode_responses=True
+)
+
+# 비동기 Redis 클라이언트: 연결이 이벤트 루프에 묶이므로 루프별로 생성
+_async_redis_clients = weakref.WeakKeyDictionary()
+
+def get_async_redis_client():
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        client = redis.asyncio.StrictRedis(
+            host=redis_host,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=True
+        )
+        _async_redis_clients[loop] = client
+    return client
+
+
+# 비동기 Redis 클라이언트(바이너리 값): 임베딩 벡터 등 문자열로 디코딩하지 않는 값 저장용
+_async_redis_binary_clients = weakref.WeakKeyDictionary()
+
+def get_async_redis_binary_client():
+    loop = asyncio.get_running_loop()
+    client = _async_redis_binary_clients.get(loop)
+    if client is None:
+        client = redis.asyncio.StrictRedis(
+            host=redis_host,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=False
+        )
+        _async_redis_binary_clients[loop] = client
+    return client
@@ -0,0 +1,220 @@
+from datetime import datetime
+from sqlalchemy import desc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import AnalysisStatus, EatHabits, DietAnalysis, LatestAnalysis
+from db.crud import backfill_latest_analyses
+from utils.analysis_job import is_other_member_pending_async
+from utils.analysis_notifier import notify_analysis_started_async, notify_analysis_failed_async
+from errors.business_exception import UserDataError, AnalysisInProgress, AnalysisNotCompleted, NoAnalysisRecord
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+비동기 Session(AsyncSession)용 CRUD: 이벤트 루프를 막지 않아야 하는 경로에서 사용
+
+- 동작과 예외는 db/crud.py의 같은 이름 함수와 동일
+- 여러 쿼리를 묶어 실행하는 무거운 작업은 crud.py의 함수를 AsyncSession.run_sync로 실행
+"""
+
+"""
+서버(Background)상에서 실행
+"""
+
+# 식습관 분석 알림: 분석 상태 추가
+async def add_analysis_status(db: AsyncSession, member_id: int):
+    new_status = AnalysisStatus(
+        MEMBER_FK=member_id,
+        IS_ANALYZED=False,
+        IS_PENDING=True,
+        ANALYSIS_DATE=datetime.now()
+    )
+    db.add(new_status)
+
+    # 회원별 최근 분석: 진행 중으로 표시
+    latest = await db.get(LatestAnalysis, member_id)
+    if latest is None:
+        db.add(LatestAnalysis(MEMBER_FK=member_id, IS_PENDING=True, UPDATED_DATE=new_status.ANALYSIS_DATE))
+    else:
+        latest.IS_PENDING = True
+        latest.UPDATED_DATE = new_status.ANALYSIS_DATE
+    await db.commit()
+
+    # 새 분석 시작: 이전 분석 응답 캐시 삭제, 전역 분석 대기 회원 집합에 추가
+    await notify_analysis_started_async(member_id)
+    return new_status
+
+# 식습관 분석 실패 처리: analysis_date가 주어지면 분석 날짜도 갱신
+async def fail_analysis_status(db: AsyncSession, status_id: int, analysis_date: datetime = None):
+    values = {"IS_PENDING": False, "IS_ANALYZED": False}
+    if analysis_date is not None:
+        values["ANALYSIS_DATE"] = analysis_date
+
+    await db.execute(update(AnalysisStatus).where(AnalysisStatus.STATUS_PK == status_id).values(**values))
+
+    # 회원별 최근 분석: 진행 중 표시 해제(최근 완료된 분석 결과는 유지)
+    member_id = await db.scalar(select(AnalysisStatus.MEMBER_FK).where(AnalysisStatus.STATUS_PK == status_id))
+    await db.execute(
+        update(LatestAnalysis).where(LatestAnalysis.MEMBER_FK == member_id)
+        .values(IS_PENDING=False, UPDATED_DATE=datetime.now())
+    )
+    await db.commit()
+
+    # 전역 분석 대기 회원 집합에서 제거 후 실패 알림
+    await notify_analysis_failed_async(member_id)
+
+"""
+요청에 따른 응답 제공
+"""
+
+# 최신 분석 결과 조회: 서버(Background)상에서 이미 분석 결과 존재해야 데이터 응답 가능
+async def get_latest_eat_habits(db: AsyncSession, analysis_status_id: int):
+    result = (await db.execute(
+        select(EatHabits).where(EatHabits.ANALYSIS_STATUS_FK == analysis_status_id).limit(1)
+    )).scalars().first()
+
+    if not result:
+        logger.error("최신 분석 기록이 존재하지 않습니다.")
+        raise UserDataError()
+
+    return result
+
+# 최신 완료된 분석 날짜 조회 함수
+async def get_latest_analysis_date(db: AsyncSession, member_id: int):
+    return (await db.execute(
+        select(AnalysisStatus).where(
+            AnalysisStatus.MEMBER_FK == member_id,
+            # 성공한 분석 날짜만 조회: AOS 캐싱
+            AnalysisStatus.IS_ANALYZED == True
+        ).order_by(desc(AnalysisStatus.ANALYSIS_DATE)).limit(1)
+    )).scalars().first()
+
+# 다른 유저가 현재 분석 중인지를 확인
+async def is_analysis_in_progress_for_member(member_id: int, db: AsyncSession) -> bool:
+    # 전역 분석 대기 회원 집합으로 확인(O(1)), Redis 장애 시 DB 조회
+    try:
+        return await is_other_member_pending_async(member_id)
+    except Exception as e:
+        logger.error(f"분석 대기 회원 집합 조회 실패, DB 조회로 확인: {e}")
+
+    in_progress = (await db.execute(
+        select(AnalysisStatus.STATUS_PK).where(
+            AnalysisStatus.MEMBER_FK != member_id,
+            AnalysisStatus.IS_PENDING == True
+        ).limit(1)
+    )).first()
+
+    return in_progress is not None
+
+# 식습관 분석 알림: 분석 상태 조회
+async def get_analysis_status(db: AsyncSession, member_id: int):
+
+    # 가장 최신의 분석 상태 조회(성공 여부 상관없음)
+    analysis_status = (await db.execute(
+        select(AnalysisStatus).where(AnalysisStatus.MEMBER_FK == member_id)
+        .order_by(desc(AnalysisStatus.ANALYSIS_DATE)).limit(1)
+    )).scalars().first()
+
+    # 분석 상태 확인
+    if not analysis_status:
+        logger.info(f"해당 유저는 분석 상태 미존재입니다.: {member_id}")
+        raise UserDataError()
+
+    # 분석 진행 중 여부 확인(IS_ANALYZED: False, IS_PENDING: True)
+    if not analysis_status.IS_ANALYZED and analysis_status.IS_PENDING:
+
+        # 다른 유저의 분석으로 대기 중인 상태
+        if not await is_analysis_in_progress_for_member(member_id, db):
+            logger.info(f"해당 유저는 분석 대기 중입니다.: {member_id}")
+            raise AnalysisInProgress()
+
+        # 분석이 진행 중인 경우(현재 유저)
+        logger.info(f"해당 유저는 아직 분석이 완료되지 않았습니다.: {member_id}")
+        raise AnalysisNotCompleted()
+
+    # 분석이 완료되지 않은 경우(IS_ANALYZED: False, IS_PENDING: False)
+    if not analysis_status.IS_ANALYZED and not analysis_status.IS_PENDING:
+
+        # 최신 성공 분석 조회
+        latest_completed = await get_latest_analysis_date(db, member_id)
+
+        # 최근 성공한 분석이 존재한다면 해당 기록 반환
+        if latest_completed:
+            logger.info(f"해당 유저는 최근 성공한 분석 기록 존재합니다.: {member_id}")
+            return latest_completed
+
+        # 완료된 기록이 전혀 없는 경우
+        logger.info(f"해당 유저는 완료된 분석 기록이 없습니다.: {member_id}")
+        raise NoAnalysisRecord()
+
+    return analysis_status
+
+# 식습관 분석 상세보기 조회: 최신 완료 분석 → 식습관 → 상세기록을 한 번의 JOIN 쿼리로 조회
+async def get_analysis_detail(db: AsyncSession, member_id: int):
+    latest_status = select(AnalysisStatus.STATUS_PK).where(
+        AnalysisStatus.MEMBER_FK == member_id,
+        AnalysisStatus.IS_ANALYZED == True
+    ).order_by(desc(AnalysisStatus.ANALYSIS_DATE)).limit(1).scalar_subquery()
+
+    analysis_detail = (await db.execute(
+        select(DietAnalysis)
+        .join(EatHabits, EatHabits.EAT_HABITS_PK == DietAnalysis.EAT_HABITS_FK)
+        .where(EatHabits.ANALYSIS_STATUS_FK == latest_status)
+        .limit(1)
+    )).scalars().first()
+
+    if not analysis_detail:
+        logger.error(f"get_analysis_detail: member_id ({member_id})의 분석 기록이 존재하지 않음")
+        raise NoAnalysisRecord()
+
+    return analysis_detail
+
+# 회원별 최근 분석 상태 확인: get_analysis_status와 같은 예외
+async def check_latest_analysis(db: AsyncSession, member_id: int, latest):
+
+    # 분석 상태 확인
+    if not latest:
+        logger.info(f"해당 유저는 분석 상태 미존재입니다.: {member_id}")
+        raise UserDataError()
+
+    # 분석 진행 중 여부 확인
+    if latest.IS_PENDING:
+
+        # 다른 유저의 분석으로 대기 중인 상태
+        if not await is_analysis_in_progress_for_member(member_id, db):
+            logger.info(f"해당 유저는 분석 대기 중입니다.: {member_id}")
+            raise AnalysisInProgress()
+
+        # 분석이 진행 중인 경우(현재 유저)
+        logger.info(f"해당 유저는 아직 분석이 완료되지 않았습니다.: {member_id}")
+        raise AnalysisNotCompleted()
+
+    # 완료된 기록이 전혀 없는 경우
+    if latest.ANALYSIS_DATE is None:
+        logger.info(f"해당 유저는 완료된 분석 기록이 없습니다.: {member_id}")
+        raise NoAnalysisRecord()
+
+    return latest
+
+# 회원별 최근 분석이 없는 기존 회원: 분석 기록으로 채우기(반환값: 채운 회원 수, 분석 기록이 없으면 0)
+async def backfill_latest_analysis(db: AsyncSession, member_id: int):
+    logger.info(f"회원별 최근 분석 미존재, 분석 기록으로 채우기: {member_id}")
+    return await db.run_sync(lambda session: backfill_latest_analyses(session, [member_id]))
+
+# 회원별 최근 분석 조회: LATEST_ANALYSIS_TB 기본키 조회 1회(없으면 분석 기록으로 채운 뒤 다시 조회)
+async def get_latest_analysis(db: AsyncSession, member_id: int):
+    latest = await db.get(LatestAnalysis, member_id)
+    if latest is None and await backfill_latest_analysis(db, member_id):
+        latest = await db.get(LatestAnalysis, member_id)
+    return await check_latest_analysis(db, member_id, latest)
+
+# 회원별 최근 분석 상태만 조회: 분석 결과(Text 컬럼) 없이 진행 여부 / 분석 상태 ID / 분석 날짜(조건부 요청 검증값)
+async def get_latest_analysis_state(db: AsyncSession, member_id: int):
+    query = select(LatestAnalysis.IS_PENDING, LatestAnalysis.STATUS_FK, LatestAnalysis.ANALYSIS_DATE).where(
+        LatestAnalysis.MEMBER_FK == member_id
+    )
+    latest = (await db.execute(query)).first()
+    if latest is None and await backfill_latest_analysis(db, member_id):
+        latest = (await db.execute(query)).first()
+    return await check_latest_analysis(db, member_id, latest)
@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta
-from sqlalchemy import desc
+from sqlalchemy import desc, func, case, insert, update, select, and_, or_
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from db.models import EatHabits, Member, Food, Meal, MealFood, AnalysisStatus, DietAnalysis
+from db.models import EatHabits, Member, Food, Meal, MealFood, AnalysisStatus, DietAnalysis, AnalysisFingerprint, LatestAnalysis
 from errors.business_exception import MemberNotFound, UserDataError, AnalysisInProgress, AnalysisNotCompleted, NoAnalysisRecord
-from errors.server_exception import AnalysisSaveError, NoMemberFound, QueryError
+from errors.server_exception import AnalysisSaveError, AnalysisStatusUpdateError, NoMemberFound, QueryError
 from logs.logger_config import get_logger
 from auth.decoded_db import decrypt_db
+from utils.analysis_cache import build_diet_cache_entry_from_record
+from utils.analysis_job import is_other_member_pending
+from utils.analysis_notifier import notify_analysis_started, notify_analysis_completed, notify_analysis_failed
 
 # 공용 로거
 logger = get_logger()
@@ -39,10 +41,25 @@ def get_member_info(db: Session, member_id: int):
     
     return member
 
-# TDEE 수식을 구하기 위한 사용자 신체정보 조회
-def get_member_body_info(db: Session, member_id: int):
+# 여러 회원 정보 일괄 조회(단일 IN 쿼리): {member_id: Member}, 존재하지 않는 회원은 포함되지 않음
+def get_members_info(db: Session, member_ids: list):
+    members = db.query(Member).filter(Member.MEMBER_PK.in_(member_ids)).all()
+
+    result = {}
+    for member in members:
+        # MEMBER_ETC 복호화 진행 및 변경사항 반영 x
+        db.expunge(member)
+        if member.MEMBER_ETC:
+            member.MEMBER_ETC = decrypt_db(member.MEMBER_ETC)
+        result[member.MEMBER_PK] = member
 
-    member = get_member_info(db, member_id)
+    return result
+
+# TDEE 수식을 구하기 위한 사용자 신체정보 조회: member가 주어지면(일괄 조회 결과) 다시 조회하지 않음
+def get_member_body_info(db: Session, member_id: int, member: Member = None):
+
+    if member is None:
+        member = get_member_info(db, member_id)
     
     # 신체활동지수(activity) 값 변환을 위한 데이터 사전 세팅
     activity_mapping = {
@@ -73,14 +90,21 @@ def get_member_body_info(db: Session, member_id: int):
 
     return body_info
 
-# 일주일간 MEAL_TYPE 조회
-def get_last_weekend_meals(db: Session, member_id: int):
-    
+# 분석 대상 기간(지난 주 월요일 ~ 이번 주 월요일) 계산
+def get_last_week_range():
+
     now = datetime.now()
     # 지난 주 월요일 0시
     start_of_this_week = now - timedelta(days=now.weekday(), weeks=1)  
     # 이번 주 월요일 0시
     start_of_next_week = start_of_this_week + timedelta(weeks=1)  
+
+    return start_of_this_week, start_of_next_week
+
+# 일주일간 MEAL_TYPE 조회
+def get_last_weekend_meals(db: Session, member_id: int):
+    
+    start_of_this_week, start_of_next_week = get_last_week_range()
     meals = db.query(Meal).filter(
         Meal.MEMBER_FK == member_id, 
         Meal.CREATED_DATE >= start_of_this_week,
@@ -174,6 +198,82 @@ def get_member_meals_avg(db: Session, member_id: int):
 
     return avg_nutrition
 
+# 전체 사용자의 7일간 영양성분 평균값을 한 번의 집계 쿼리로 조회
+def get_all_member_meals_avg(db: Session, member_ids: list = None):
+    """
+    MEAL_TB / MEAL_FOOD_TB / FOOD_TB를 조인한 GROUP BY 한 번으로
+    get_member_meals_avg와 동일한 평균값을 회원별로 계산
+
+    반환값: {member_id: avg_nutrition}, 식사 기록이 없는 회원은 포함되지 않음
+    음식이 없는 식사 / 음식 정보가 없는 기록 / 비어 있는 영양성분이 있는 회원도 제외
+    (get_member_meals_avg는 예외 발생, 제외된 회원은 회원별 조회로 같은 예외 처리)
+    """
+    start_of_this_week, start_of_next_week = get_last_week_range()
+
+    # 사용자가 먹은 양 설정(단위: multiple or g): get_member_meals_avg와 동일한 우선순위
+    multiplier = case(
+        (MealFood.MEAL_FOOD_MULTIPLE.isnot(None), MealFood.MEAL_FOOD_MULTIPLE),
+        (MealFood.MEAL_FOOD_G.isnot(None), MealFood.MEAL_FOOD_G / Food.FOOD_SERVING_SIZE),
+        else_=1
+    )
+
+    # 영양성분 컬럼 매핑
+    nutrient_columns = {
+        "calorie": Food.FOOD_CALORIE,
+        "carbohydrate": Food.FOOD_CARBOHYDRATE,
+        "fat": Food.FOOD_FAT,
+        "protein": Food.FOOD_PROTEIN,
+        "serving_size": Food.FOOD_SERVING_SIZE,
+        "sugars": Food.FOOD_SUGARS,
+        "dietary_fiber": Food.FOOD_DIETARY_FIBER,
+        "sodium": Food.FOOD_SODIUM,
+    }
+
+    # 회원별 조회에서 예외가 발생하는 기록: 음식이 없는 식사, 음식 정보가 없는 기록, 비어 있는 영양성분
+    invalid_record = or_(
+        MealFood.MEAL_FOOD_PK.is_(None),
+        Food.FOOD_PK.is_(None),
+        *[column.is_(None) for column in nutrient_columns.values()]
+    )
+
+    try:
+        query = db.query(
+            Meal.MEMBER_FK,
+            func.count(MealFood.MEAL_FOOD_PK).label("total_foods"),
+            func.max(case((invalid_record, 1), else_=0)).label("has_invalid"),
+            *[func.sum(column * multiplier).label(key) for key, column in nutrient_columns.items()]
+        ).outerjoin(
+            MealFood, MealFood.MEAL_FK == Meal.MEAL_PK
+        ).outerjoin(
+            Food, Food.FOOD_PK == MealFood.FOOD_FK
+        ).filter(
+            Meal.CREATED_DATE >= start_of_this_week,
+            Meal.CREATED_DATE < start_of_next_week
+        )
+
+        # 특정 회원만 집계하는 경우
+        if member_ids is not None:
+            query = query.filter(Meal.MEMBER_FK.in_(member_ids))
+
+        rows = query.group_by(Meal.MEMBER_FK).all()
+    except Exception as e:
+        logger.error(f"전체 사용자 영양성분 평균 집계 중 오류 발생: {e}")
+        raise QueryError()
+
+    # 회원별 평균값 구성
+    result = {}
+    for row in rows:
+        if row.has_invalid:
+            logger.error(f"식사 / 음식 기록이 올바르지 않아 일괄 집계에서 제외: {row.MEMBER_FK}")
+            continue
+        total_foods = row.total_foods
+        result[row.MEMBER_FK] = {
+            key: float(getattr(row, key) or 0) / total_foods
+            for key in nutrient_columns
+        }
+
+    return result
+
 # BMR 구하기
 def get_bmr(gender: int, weight: float, height: float, age: int) -> float:
    # 남자
@@ -193,13 +293,14 @@ def get_tdee(bmr: float, activity: float) -> float:
    return tdee
 
 # 식습관 분석에 사용되는 사용자 데이터 조회
-def get_user_data(db: Session, member_id: int):
+def get_user_data(db: Session, member_id: int, avg_nutrition: dict = None, member: Member = None):
     
     # 사용자 신체 정보 조회
-    member_info = get_member_body_info(db, member_id)
+    member_info = get_member_body_info(db, member_id, member=member)
     
-    # 평균 영양 성분 조회
-    avg_nutrition = get_member_meals_avg(db, member_id)
+    # 평균 영양 성분 조회: 일괄 집계 결과가 없으면 개별 조회
+    if avg_nutrition is None:
+        avg_nutrition = get_member_meals_avg(db, member_id)
     
     # BMR 및 TDEE 계산
     bmr = get_bmr(
@@ -306,13 +407,59 @@ def add_analysis_status(db: Session, member_id: int):
         ANALYSIS_DATE=datetime.now()
     )
     db.add(new_status)
+    upsert_latest_analyses(db, [{"MEMBER_FK": member_id, "IS_PENDING": True}])
     db.commit()
     db.refresh(new_status)
+
+    # 새 분석 시작: 이전 분석 응답 캐시 삭제, 분석 대기 회원 집합에 추가
+    notify_analysis_started([member_id])
     return new_status
 
 
+# 식습관 분석 알림: 여러 회원의 분석 상태 일괄 추가(INSERT executemany 1회 + SELECT 1회)
+# 반환값: {member_id: status_id}
+def add_analysis_statuses(db: Session, member_ids: list):
+    if not member_ids:
+        return {}
+
+    try:
+        now = datetime.now()
+        db.execute(insert(AnalysisStatus), [{
+            "MEMBER_FK": member_id,
+            "IS_ANALYZED": False,
+            "IS_PENDING": True,
+            "ANALYSIS_DATE": now
+        } for member_id in member_ids])
+
+        # 방금 추가한 분석 상태: 회원별 가장 최근 분석 상태
+        status_ids = dict(db.execute(
+            select(AnalysisStatus.MEMBER_FK, func.max(AnalysisStatus.STATUS_PK))
+            .where(AnalysisStatus.MEMBER_FK.in_(member_ids))
+            .group_by(AnalysisStatus.MEMBER_FK)
+        ).all())
+        upsert_latest_analyses(db, [{"MEMBER_FK": member_id, "IS_PENDING": True} for member_id in member_ids])
+
+        db.commit()
+
+        # 새 분석 시작: 이전 분석 응답 캐시 삭제, 분석 대기 회원 집합에 추가
+        notify_analysis_started(member_ids)
+        return status_ids
+    except Exception as e:
+        logger.error(f"분석 상태 일괄 추가 중 오류 발생({len(member_ids)}명) - {e}")
+        db.rollback()
+        raise AnalysisStatusUpdateError()
+
+
 # 식습관 분석 알림: 분석 상태 업데이트
-def update_analysis_status(db: Session, status_id: int):
+# result: 완료된 분석 결과(save_analysis_results 입력과 같은 키), 주어지면 회원별 최근 분석도 같은 트랜잭션에서 갱신
+def update_analysis_status(db: Session, status_id: int, result: dict = None):
+    # 분석 결과 확인: 회원별 최근 분석 갱신에 필요한 값이 없으면 분석 상태를 바꾸기 전에 실패
+    if result is not None:
+        missing_keys = [key for key in LATEST_ANALYSIS_RESULT_KEYS if key not in result]
+        if missing_keys:
+            logger.error(f"분석 상태 업데이트 실패: {status_id}의 분석 결과에 {missing_keys} 없음")
+            raise AnalysisSaveError()
+
     try:
         # logger.info(f"업데이트 for status_id: {status_id} to IS_ANALYZED=True")
         
@@ -326,7 +473,15 @@ def update_analysis_status(db: Session, status_id: int):
             analysis_status.IS_ANALYZED = True
             analysis_status.IS_PENDING = False
             analysis_status.ANALYSIS_DATE = datetime.now()
+            if result is not None:
+                upsert_latest_analyses(db, [build_latest_analysis_row(analysis_status.MEMBER_FK, status_id,
+                                                                      analysis_status.ANALYSIS_DATE, result)])
+            member_id, analysis_date = analysis_status.MEMBER_FK, analysis_status.ANALYSIS_DATE
             db.commit()
+
+            # 분석 완료: 대기 회원 집합에서 제거, GET /diet 응답 캐시 저장 후 완료 알림
+            cache_entries = {member_id: build_diet_cache_entry_from_record(analysis_date, result)} if result is not None else None
+            notify_analysis_completed([member_id], cache_entries)
             # logger.info(f"분석 상태 업데이트 성공 status_id: {status_id}")
 
             # # 업데이트 확인용 추가 로그
@@ -345,6 +500,274 @@ def update_analysis_status(db: Session, status_id: int):
         logger.error(f"분석 상태 업데이트 중 오류 발생: {e}")
         raise AnalysisSaveError()
 
+# 중단된 분석 상태 정리: 이전 실행이 비정상 종료되어 대기 상태로 남은 기록을 실패 처리
+def fail_pending_analysis_status(db: Session, member_ids: list):
+    if not member_ids:
+        return 0
+
+    try:
+        updated = db.query(AnalysisStatus).filter(
+            AnalysisStatus.MEMBER_FK.in_(member_ids),
+            AnalysisStatus.IS_PENDING == True
+        ).update({
+            "IS_PENDING": False,
+            "IS_ANALYZED": False
+        }, synchronize_session=False)
+        db.execute(
+            update(LatestAnalysis).where(LatestAnalysis.MEMBER_FK.in_(member_ids))
+            .values(IS_PENDING=False, UPDATED_DATE=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        notify_analysis_failed(member_ids)
+        return updated
+    except Exception as e:
+        db.rollback()
+        logger.error(f"중단된 분석 상태 정리 중 오류 발생: {e}")
+        raise AnalysisStatusUpdateError()
+
+# 회원의 최근 완료된 분석 입력값 해시 조회
+def get_latest_analysis_fingerprint(db: Session, member_id: int):
+    return db.query(AnalysisFingerprint).join(
+        AnalysisStatus, AnalysisStatus.STATUS_PK == AnalysisFingerprint.ANALYSIS_STATUS_FK
+    ).filter(
+        AnalysisFingerprint.MEMBER_FK == member_id,
+        AnalysisStatus.IS_ANALYZED == True
+    ).order_by(desc(AnalysisFingerprint.FINGERPRINT_PK)).first()
+
+# 여러 회원의 최근 완료된 분석 입력값 해시 일괄 조회: {member_id: AnalysisFingerprint}
+def get_latest_analysis_fingerprints(db: Session, member_ids: list):
+    latest_ids = db.query(func.max(AnalysisFingerprint.FINGERPRINT_PK)).join(
+        AnalysisStatus, AnalysisStatus.STATUS_PK == AnalysisFingerprint.ANALYSIS_STATUS_FK
+    ).filter(
+        AnalysisFingerprint.MEMBER_FK.in_(member_ids),
+        AnalysisStatus.IS_ANALYZED == True
+    ).group_by(AnalysisFingerprint.MEMBER_FK)
+
+    fingerprints = db.query(AnalysisFingerprint).filter(AnalysisFingerprint.FINGERPRINT_PK.in_(latest_ids)).all()
+    return {fingerprint.MEMBER_FK: fingerprint for fingerprint in fingerprints}
+
+# 분석 입력값 해시 저장: chain_seconds는 해당 결과를 만드는 데 걸린 Chain 실행 시간
+def create_analysis_fingerprint(db: Session, analysis_status_id: int, member_id: int, fingerprint: str,
+                                chain_seconds: float, is_reused: bool = False):
+    try:
+        analysis_fingerprint = AnalysisFingerprint(
+            CREATED_DATE=datetime.now(),
+            ANALYSIS_STATUS_FK=analysis_status_id,
+            MEMBER_FK=member_id,
+            FINGERPRINT=fingerprint,
+            CHAIN_SECONDS=chain_seconds,
+            IS_REUSED=is_reused
+        )
+        db.add(analysis_fingerprint)
+        db.commit()
+        return analysis_fingerprint
+    except Exception as e:
+        logger.error(f"분석 입력값 해시 저장 중 오류 발생: {analysis_status_id} - {e}")
+        db.rollback()
+        raise AnalysisSaveError()
+
+# 이전 분석 결과 조회: 입력값이 같으면 새 분석 상태로 복제할 식습관 조언 / 분석 결과(조회만 수행, 저장은 save_analysis_results)
+# 반환값: save_analysis_results 입력 중 분석 결과 값(status_id / member_id / 입력값 해시 제외)
+def get_analysis_result_record(db: Session, source_status_id: int):
+    source_habits = db.query(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK == source_status_id).first()
+    if not source_habits:
+        logger.error(f"복제할 분석 결과가 존재하지 않습니다: {source_status_id}")
+        raise NoAnalysisRecord()
+
+    # 식습관 분석 결과가 없는 기록은 복제하지 않음(회원별 최근 분석을 구성할 수 없음)
+    source_analysis = db.query(DietAnalysis).filter(
+        DietAnalysis.EAT_HABITS_FK == source_habits.EAT_HABITS_PK
+    ).order_by(desc(DietAnalysis.DIET_ANALYSIS_PK)).first()
+    if not source_analysis:
+        logger.error(f"복제할 식습관 분석 결과가 존재하지 않습니다: {source_status_id}")
+        raise NoAnalysisRecord()
+
+    return {
+        "weight_prediction": source_habits.WEIGHT_PREDICTION,
+        "advice_carbo": source_habits.ADVICE_CARBO,
+        "advice_protein": source_habits.ADVICE_PROTEIN,
+        "advice_fat": source_habits.ADVICE_FAT,
+        "summarized_advice": source_habits.SUMMARIZED_ADVICE,
+        "avg_calorie": source_habits.AVG_CALORIE,
+        "nutrient_analysis": source_analysis.NUTRIENT_ANALYSIS,
+        "diet_improve": source_analysis.DIET_IMPROVE,
+        "custom_recommend": source_analysis.CUSTOM_RECOMMEND
+    }
+
+# 회원별 최근 분석 값 구성에 필요한 분석 결과 키
+LATEST_ANALYSIS_RESULT_KEYS = ("avg_calorie", "weight_prediction", "advice_carbo", "advice_protein", "advice_fat",
+                               "summarized_advice", "nutrient_analysis", "diet_improve", "custom_recommend")
+
+# 회원별 최근 분석 값 구성: result는 save_analysis_results 입력과 같은 키
+def build_latest_analysis_row(member_id: int, status_id: int, analysis_date: datetime, result: dict):
+    return {
+        "MEMBER_FK": member_id,
+        "IS_PENDING": False,
+        "STATUS_FK": status_id,
+        "ANALYSIS_DATE": analysis_date,
+        "AVG_CALORIE": result["avg_calorie"],
+        "WEIGHT_PREDICTION": result["weight_prediction"],
+        "ADVICE_CARBO": result["advice_carbo"],
+        "ADVICE_PROTEIN": result["advice_protein"],
+        "ADVICE_FAT": result["advice_fat"],
+        "SUMMARIZED_ADVICE": result["summarized_advice"],
+        "NUTRIENT_ANALYSIS": result["nutrient_analysis"],
+        "DIET_IMPROVE": result["diet_improve"],
+        "CUSTOM_RECOMMEND": result["custom_recommend"]
+    }
+
+# 회원별 최근 분석 추가 / 갱신(commit은 호출한 함수에서): rows는 MEMBER_FK와 갱신할 컬럼 값
+# 회원 수와 관계없이 SELECT 1회 + INSERT / UPDATE(executemany) 각 1회
+def upsert_latest_analyses(db: Session, rows: list):
+    if not rows:
+        return
+
+    now = datetime.now()
+    rows = [{**row, "UPDATED_DATE": now} for row in rows]
+    existing_ids = set(db.execute(
+        select(LatestAnalysis.MEMBER_FK).where(LatestAnalysis.MEMBER_FK.in_([row["MEMBER_FK"] for row in rows]))
+    ).scalars())
+
+    new_rows = [row for row in rows if row["MEMBER_FK"] not in existing_ids]
+    existing_rows = [row for row in rows if row["MEMBER_FK"] in existing_ids]
+    if new_rows:
+        db.execute(insert(LatestAnalysis), new_rows)
+    if existing_rows:
+        db.execute(update(LatestAnalysis), existing_rows)
+
+# 회원별 최근 분석 채우기: 기존 분석 기록에서 최근 완료된 분석과 진행 중 여부를 다시 구성(반환값: 갱신한 회원 수)
+def backfill_latest_analyses(db: Session, member_ids: list):
+    if not member_ids:
+        return 0
+
+    try:
+        # 분석 기록이 있는 회원 / 진행 중인 회원
+        status_rows = db.execute(
+            select(AnalysisStatus.MEMBER_FK, func.max(AnalysisStatus.IS_PENDING))
+            .where(AnalysisStatus.MEMBER_FK.in_(member_ids))
+            .group_by(AnalysisStatus.MEMBER_FK)
+        ).all()
+        rows = {
+            member_id: {
+                "MEMBER_FK": member_id, "IS_PENDING": bool(is_pending), "STATUS_FK": None, "ANALYSIS_DATE": None,
+                "AVG_CALORIE": None, "WEIGHT_PREDICTION": None, "ADVICE_CARBO": None, "ADVICE_PROTEIN": None,
+                "ADVICE_FAT": None, "SUMMARIZED_ADVICE": None, "NUTRIENT_ANALYSIS": None, "DIET_IMPROVE": None,
+                "CUSTOM_RECOMMEND": None
+            }
+            for member_id, is_pending in status_rows
+        }
+
+        # 회원별 최근 완료된 분석 결과(같은 날짜면 나중에 추가된 분석 상태)
+        latest_dates = select(
+            AnalysisStatus.MEMBER_FK, func.max(AnalysisStatus.ANALYSIS_DATE).label("ANALYSIS_DATE")
+        ).where(
+            AnalysisStatus.MEMBER_FK.in_(member_ids),
+            AnalysisStatus.IS_ANALYZED == True
+        ).group_by(AnalysisStatus.MEMBER_FK).subquery()
+
+        completed = db.execute(
+            select(AnalysisStatus.MEMBER_FK, AnalysisStatus.STATUS_PK, AnalysisStatus.ANALYSIS_DATE, EatHabits, DietAnalysis)
+            .join(latest_dates, and_(AnalysisStatus.MEMBER_FK == latest_dates.c.MEMBER_FK,
+                                     AnalysisStatus.ANALYSIS_DATE == latest_dates.c.ANALYSIS_DATE))
+            .join(EatHabits, EatHabits.ANALYSIS_STATUS_FK == AnalysisStatus.STATUS_PK)
+            .join(DietAnalysis, DietAnalysis.EAT_HABITS_FK == EatHabits.EAT_HABITS_PK)
+            .where(AnalysisStatus.IS_ANALYZED == True)
+            .order_by(AnalysisStatus.STATUS_PK)
+        ).all()
+        for member_id, status_id, analysis_date, eat_habits, diet_analysis in completed:
+            rows[member_id].update({
+                "STATUS_FK": status_id,
+                "ANALYSIS_DATE": analysis_date,
+                "AVG_CALORIE": eat_habits.AVG_CALORIE,
+                "WEIGHT_PREDICTION": eat_habits.WEIGHT_PREDICTION,
+                "ADVICE_CARBO": eat_habits.ADVICE_CARBO,
+                "ADVICE_PROTEIN": eat_habits.ADVICE_PROTEIN,
+                "ADVICE_FAT": eat_habits.ADVICE_FAT,
+                "SUMMARIZED_ADVICE": eat_habits.SUMMARIZED_ADVICE,
+                "NUTRIENT_ANALYSIS": diet_analysis.NUTRIENT_ANALYSIS,
+                "DIET_IMPROVE": diet_analysis.DIET_IMPROVE,
+                "CUSTOM_RECOMMEND": diet_analysis.CUSTOM_RECOMMEND
+            })
+
+        upsert_latest_analyses(db, list(rows.values()))
+        db.commit()
+        return len(rows)
+    except Exception as e:
+        logger.error(f"최근 분석 채우기 중 오류 발생({len(member_ids)}명) - {e}")
+        db.rollback()
+        raise QueryError()
+
+# 분석 결과 일괄 저장: 여러 회원의 식습관 조언 / 분석 결과, 입력값 해시 저장 및 분석 상태 완료 처리를 하나의 트랜잭션으로 처리
+# results: 회원별 저장 값(status_id, member_id, weight_prediction, advice_carbo, advice_protein, advice_fat, summarized_advice,
+#          avg_calorie, nutrient_analysis, diet_improve, custom_recommend, fingerprint, chain_seconds)
+#          is_reused(선택): 이전 분석 결과를 재사용한 기록 여부
+# 회원 수와 관계없이 INSERT(executemany) 3회, SELECT 1회, UPDATE 1회 후 한 번만 commit
+def save_analysis_results(db: Session, results: list):
+    if not results:
+        return 0
+
+    status_ids = [result["status_id"] for result in results]
+    try:
+        now = datetime.now()
+
+        # 식습관 조언 / 분석 요약 저장
+        db.execute(insert(EatHabits), [{
+            "ANALYSIS_STATUS_FK": result["status_id"],
+            "WEIGHT_PREDICTION": result["weight_prediction"],
+            "ADVICE_CARBO": result["advice_carbo"],
+            "ADVICE_PROTEIN": result["advice_protein"],
+            "ADVICE_FAT": result["advice_fat"],
+            "SUMMARIZED_ADVICE": result["summarized_advice"],
+            "AVG_CALORIE": result["avg_calorie"]
+        } for result in results])
+
+        # 생성된 식습관 PK 조회: 분석 상태당 식습관 기록은 하나
+        eat_habits_ids = dict(db.execute(
+            select(EatHabits.ANALYSIS_STATUS_FK, EatHabits.EAT_HABITS_PK).where(EatHabits.ANALYSIS_STATUS_FK.in_(status_ids))
+        ).all())
+
+        # 식습관 분석 결과 저장
+        db.execute(insert(DietAnalysis), [{
+            "EAT_HABITS_FK": eat_habits_ids[result["status_id"]],
+            "NUTRIENT_ANALYSIS": result["nutrient_analysis"],
+            "DIET_IMPROVE": result["diet_improve"],
+            "CUSTOM_RECOMMEND": result["custom_recommend"]
+        } for result in results])
+
+        # 다음 분석에서 재사용 여부를 판단할 입력값 해시 저장
+        db.execute(insert(AnalysisFingerprint), [{
+            "CREATED_DATE": now,
+            "ANALYSIS_STATUS_FK": result["status_id"],
+            "MEMBER_FK": result["member_id"],
+            "FINGERPRINT": result["fingerprint"],
+            "CHAIN_SECONDS": result["chain_seconds"],
+            "IS_REUSED": result.get("is_reused", False)
+        } for result in results])
+
+        # 분석 상태 완료 처리
+        db.execute(
+            update(AnalysisStatus).where(AnalysisStatus.STATUS_PK.in_(status_ids))
+            .values(IS_ANALYZED=True, IS_PENDING=False, ANALYSIS_DATE=now)
+            .execution_options(synchronize_session=False)
+        )
+
+        # 회원별 최근 분석 갱신
+        upsert_latest_analyses(db, [
+            build_latest_analysis_row(result["member_id"], result["status_id"], now, result) for result in results
+        ])
+
+        db.commit()
+    except Exception as e:
+        logger.error(f"분석 결과 일괄 저장 중 오류 발생({len(status_ids)}건, status_id: {status_ids[0]}~{status_ids[-1]}) - {e}")
+        db.rollback()
+        raise AnalysisSaveError()
+
+    # 분석 완료: 대기 회원 집합에서 제거, GET /diet 응답 캐시 저장 후 완료 알림
+    notify_analysis_completed([result["member_id"] for result in results],
+                              {result["member_id"]: build_diet_cache_entry_from_record(now, result) for result in results})
+    return len(results)
+
 """
 요청에 따른 응답 제공
 """
@@ -377,11 +800,21 @@ def get_latest_analysis_date(db: Session, member_id: int):
 
     return latest_completed
 
+# 분석 대기 중인 회원 조회(전체 조회): 작업 시작 시 전역 분석 대기 회원 집합 재구성에 사용
+def get_pending_member_ids(db: Session):
+    return [member_id for member_id, in db.query(AnalysisStatus.MEMBER_FK).filter(AnalysisStatus.IS_PENDING == True).distinct()]
+
 # 다른 유저가 현재 분석 중인지를 확인
 def is_analysis_in_progress_for_member(member_id: int, db: Session) -> bool:
     """
     다른 유저가 현재 분석 중인지 확인하는 함수
     """
+    # 전역 분석 대기 회원 집합으로 확인(O(1)), Redis 장애 시 DB 조회
+    try:
+        return is_other_member_pending(member_id)
+    except Exception as e:
+        logger.error(f"분석 대기 회원 집합 조회 실패, DB 조회로 확인: {e}")
+
     in_progress = db.query(AnalysisStatus).filter(
         AnalysisStatus.MEMBER_FK != member_id,
         AnalysisStatus.IS_PENDING == True
@@ -1,5 +1,8 @@
 # Connection + Session
+import asyncio
+import weakref
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
@@ -24,4 +27,40 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 비동기 엔진: 연결이 이벤트 루프에 묶이므로 루프별로 생성(API 서버 / 스케줄러 쓰레드)
+_async_engines = weakref.WeakKeyDictionary()
+
+def get_async_engine():
+    loop = asyncio.get_running_loop()
+    async_engine = _async_engines.get(loop)
+    if async_engine is None:
+        async_engine = create_async_engine(
+            settings.DB_ASYNC_URL,
+            pool_recycle=3600,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20
+        )
+        _async_engines[loop] = async_engine
+    return async_engine
+
+# 비동기 Session: commit 후에도 조회한 객체 속성 접근 가능하도록 만료하지 않음
+def create_async_session():
+    return AsyncSession(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+# 현재 이벤트 루프의 비동기 엔진 종료: 스케줄러처럼 작업마다 새 루프를 만드는 경우 작업 종료 시 호출
+async def dispose_async_engine():
+    async_engine = _async_engines.pop(asyncio.get_running_loop(), None)
+    if async_engine is not None:
+        await async_engine.dispose()
+
+# Dependency(비동기)
+async def get_async_db():
+    db = create_async_session()
+    try:
+        yield db
+    finally:
+        await db.close()
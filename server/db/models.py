@@ -105,7 +105,7 @@ class AnalysisStatus(Base):
     STATUS_PK = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
     ANALYSIS_DATE = Column(DateTime(6), nullable=False)
     IS_ANALYZED = Column(Integer, nullable=False, default=0)  # 0 = False, 1 = True
-    IS_PENDING = Column(Integer, nullable=False, default=1)   # 1 = True, 0 = False
+    IS_PENDING = Column(Integer, nullable=False, default=1, index=True)   # 1 = True, 0 = False
     MEMBER_FK = Column(BigInteger, ForeignKey('MEMBER_TB.MEMBER_PK', ondelete='CASCADE'), nullable=True)
 
     # Relationships
@@ -140,6 +140,38 @@ class DietAnalysis(Base):
 
     eat_habits = relationship("EatHabits", back_populates="diet_analysis")
 
+# ANALYSIS_FINGERPRINT_TB 구성: 완료된 분석의 입력값 해시(동일 입력이면 LLM 호출 없이 이전 결과 재사용)
+class AnalysisFingerprint(Base):
+    __tablename__ = "ANALYSIS_FINGERPRINT_TB"
+
+    FINGERPRINT_PK = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    CREATED_DATE = Column(DateTime(6), nullable=False)
+    ANALYSIS_STATUS_FK = Column(BigInteger, ForeignKey('ANALYSIS_STATUS_TB.STATUS_PK', ondelete='CASCADE'), nullable=False)
+    MEMBER_FK = Column(BigInteger, ForeignKey('MEMBER_TB.MEMBER_PK', ondelete='CASCADE'), nullable=False, index=True)
+    FINGERPRINT = Column(String(64), nullable=False)
+    CHAIN_SECONDS = Column(Double, nullable=False, default=0)
+    IS_REUSED = Column(Boolean, nullable=False, default=False)
+
+# LATEST_ANALYSIS_TB 구성: 회원별 최근 완료된 분석 결과(비정규화) 및 진행 중 여부
+# 분석 상태 추가 / 실패 / 완료와 같은 트랜잭션에서 갱신, GET /diet, /status는 기본키 조회 1회로 응답
+class LatestAnalysis(Base):
+    __tablename__ = "LATEST_ANALYSIS_TB"
+
+    MEMBER_FK = Column(BigInteger, ForeignKey('MEMBER_TB.MEMBER_PK', ondelete='CASCADE'), primary_key=True, autoincrement=False)
+    UPDATED_DATE = Column(DateTime(6), nullable=False)
+    IS_PENDING = Column(Boolean, nullable=False, default=False)
+    STATUS_FK = Column(BigInteger, ForeignKey('ANALYSIS_STATUS_TB.STATUS_PK', ondelete='SET NULL'), nullable=True)
+    ANALYSIS_DATE = Column(DateTime(6), nullable=True)
+    AVG_CALORIE = Column(Double, nullable=True)
+    WEIGHT_PREDICTION = Column(Text, nullable=True)
+    ADVICE_CARBO = Column(Text, nullable=True)
+    ADVICE_PROTEIN = Column(Text, nullable=True)
+    ADVICE_FAT = Column(Text, nullable=True)
+    SUMMARIZED_ADVICE = Column(Text, nullable=True)
+    NUTRIENT_ANALYSIS = Column(Text, nullable=True)
+    DIET_IMPROVE = Column(Text, nullable=True)
+    CUSTOM_RECOMMEND = Column(Text, nullable=True)
+
 # HISTORY_TB 구성
 class History(Base):
     __tablename__ = "HISTORY_TB"
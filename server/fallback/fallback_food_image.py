@@ -3,6 +3,7 @@ import anthropic
 from core.config import settings
 from logs.logger_config import get_logger
 from errors.business_exception import ImageAnalysisError
+from utils.redis_integration import acquire_llm_quota, estimate_tokens
 
 # 로거 설정
 logger = get_logger()
@@ -13,6 +14,9 @@ claude_client = anthropic.Anthropic(api_key=settings.CLAUDE_API_KEY)
 # OpenAI API 실패시 Claude API 이용
 async def food_image_analyze_fallback(image_base64: str, prompt: str):
     try:
+        # 분당 호출 한도 확보
+        await acquire_llm_quota("claude-3-5-sonnet-20241022", tokens=estimate_tokens(prompt) + 300)
+
         response = claude_client.messages.create(
             model="claude-3-5-sonnet-20241022",
             max_tokens=300,
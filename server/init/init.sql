@@ -84,6 +84,7 @@ CREATE TABLE ANALYSIS_STATUS_TB
     IS_PENDING tinyint(1) NOT NULL DEFAULT 1,
     MEMBER_FK bigint(20) DEFAULT NULL,
     PRIMARY KEY (STATUS_PK),
+    KEY IDX_STATUS_PENDING (IS_PENDING),
     FOREIGN KEY (MEMBER_FK) REFERENCES MEMBER_TB (MEMBER_PK) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
@@ -112,6 +113,41 @@ CREATE TABLE DIET_ANALYSIS_TB
     FOREIGN KEY (EAT_HABITS_FK) REFERENCES EAT_HABITS_TB (EAT_HABITS_PK) ON DELETE CASCADE
 ) ENGINE = InnoDB;
 
+CREATE TABLE ANALYSIS_FINGERPRINT_TB
+(
+    FINGERPRINT_PK bigint(20) NOT NULL AUTO_INCREMENT,
+    CREATED_DATE datetime(6) NOT NULL,
+    ANALYSIS_STATUS_FK bigint(20) NOT NULL,
+    MEMBER_FK bigint(20) NOT NULL,
+    FINGERPRINT char(64) NOT NULL,
+    CHAIN_SECONDS double NOT NULL DEFAULT 0,
+    IS_REUSED tinyint(1) NOT NULL DEFAULT 0,
+    PRIMARY KEY (FINGERPRINT_PK),
+    KEY IDX_FINGERPRINT_MEMBER (MEMBER_FK),
+    FOREIGN KEY (ANALYSIS_STATUS_FK) REFERENCES ANALYSIS_STATUS_TB (STATUS_PK) ON DELETE CASCADE,
+    FOREIGN KEY (MEMBER_FK) REFERENCES MEMBER_TB (MEMBER_PK) ON DELETE CASCADE
+) ENGINE = InnoDB;
+
+CREATE TABLE LATEST_ANALYSIS_TB
+(
+    MEMBER_FK bigint(20) NOT NULL,
+    UPDATED_DATE datetime(6) NOT NULL,
+    IS_PENDING tinyint(1) NOT NULL DEFAULT 0,
+    STATUS_FK bigint(20) DEFAULT NULL,
+    ANALYSIS_DATE datetime(6) DEFAULT NULL,
+    AVG_CALORIE double DEFAULT NULL,
+    WEIGHT_PREDICTION text DEFAULT NULL,
+    ADVICE_CARBO text DEFAULT NULL,
+    ADVICE_PROTEIN text DEFAULT NULL,
+    ADVICE_FAT text DEFAULT NULL,
+    SUMMARIZED_ADVICE text DEFAULT NULL,
+    NUTRIENT_ANALYSIS text DEFAULT NULL,
+    DIET_IMPROVE text DEFAULT NULL,
+    CUSTOM_RECOMMEND text DEFAULT NULL,
+    PRIMARY KEY (MEMBER_FK),
+    FOREIGN KEY (MEMBER_FK) REFERENCES MEMBER_TB (MEMBER_PK) ON DELETE CASCADE,
+    FOREIGN KEY (STATUS_FK) REFERENCES ANALYSIS_STATUS_TB (STATUS_PK) ON DELETE SET NULL
+) ENGINE = InnoDB;
 
 CREATE TABLE HISTORY_TB
 (
@@ -1,11 +1,14 @@
 import os
+import asyncio
 import uvicorn
 import logging
+import contextlib
 from fastapi import FastAPI, status
 from fastapi.responses import UJSONResponse
 from routers import diet_analysis, food_image_analysis, swagger_auth, image_censorship
 from errors.handler import register_exception_handlers
 from apis.food_analysis import start_scheduler
+from apis.food_image import warm_up_embedding_cache
 from logs.logger_config import get_logger, configure_uvicorn_logger
 
 # 공용 로거
@@ -29,6 +32,13 @@ docs_url = f"{root_path}/ai/v1/api/docs" if env != "prod" else None
 redocs_url = f"{root_path}/ai/v1/api/redocs" if env != "prod" else None
 openapi_url = f"{root_path}/ai/v1/api/openapi.json" if env != "prod" else None
 
+# 서버 시작 시 자주 탐지된 음식명 임베딩 캐시 채우기(요청 처리를 막지 않도록 백그라운드 실행)
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up_task = asyncio.create_task(warm_up_embedding_cache())
+    yield
+    warm_up_task.cancel()
+
 # FastAPI APP 설정
 app = FastAPI(
     title="EATceed",
@@ -37,6 +47,7 @@ app = FastAPI(
     redoc_url=redocs_url,
     openapi_url=openapi_url,
     default_response_class=UJSONResponse,
+    lifespan=lifespan,
 )
 
 # API Server Test
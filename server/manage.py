@@ -0,0 +1,144 @@
+import json
+import asyncio
+import argparse
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+운영 관리용 CLI
+
+- python manage.py resume [--run-id RUN_ID] [--pipeline chained|fused] : 주간 분석 작업 이어서 실행(완료된 회원 제외)
+- python manage.py rerun --run-id RUN_ID [--pipeline chained|fused]    : 주간 분석 작업 전체 재실행
+- python manage.py status --run-id RUN_ID   : 주간 분석 작업 상태 조회
+- python manage.py worker [--run-id RUN_ID] : 분산 모드 워커 실행(작업 ID 미지정 시 상시 대기)
+- python manage.py cache-stats              : LLM 결과 캐시 적중 / 미적중 지표 조회
+- python manage.py ab-stats                 : A/B 실행 방식별 토큰 사용량 / 회원당 지연시간 조회
+- python manage.py analysis-cache-stats     : 식습관 분석 응답 캐시 적중률 / 평균 응답 시간 조회
+- python manage.py image-cache-stats        : 음식 이미지 분석 결과 캐시 적중(정확 / 유사) / 절약한 시간 조회
+- python manage.py embedding-cache-stats    : 음식명 임베딩 캐시 단계별 적중 / 조회당 임베딩 호출 수 조회
+- python manage.py backfill-latest-analysis [--batch-size N] : 기존 분석 기록으로 회원별 최근 분석(LATEST_ANALYSIS_TB) 채우기
+"""
+
+# 실행 모드에 따른 주간 분석 작업 실행
+def run_task(run_id, rerun=False, pipeline=None):
+    from core.config import settings
+    if settings.ANALYSIS_MODE == "distributed":
+        from apis.analysis_worker import run_distributed_task
+        asyncio.run(run_distributed_task(run_id=run_id, rerun=rerun, pipeline=pipeline))
+    else:
+        from apis.food_analysis import scheduled_task
+        asyncio.run(scheduled_task(run_id=run_id, rerun=rerun, pipeline=pipeline))
+
+# 주간 분석 작업 이어서 실행
+def resume(args):
+    run_task(args.run_id, pipeline=args.pipeline)
+
+# 주간 분석 작업 전체 재실행
+def rerun(args):
+    run_task(args.run_id, rerun=True, pipeline=args.pipeline)
+
+# 분산 모드 워커 실행
+def worker(args):
+    from apis.analysis_worker import run_worker, run_worker_forever
+    if args.run_id:
+        asyncio.run(run_worker(args.run_id))
+    else:
+        asyncio.run(run_worker_forever())
+
+# 주간 분석 작업 상태 조회
+def status(args):
+    from utils.analysis_job import get_job_summary, get_weekly_run_id, get_active_run_state
+    run_id = args.run_id or get_weekly_run_id()
+    print(json.dumps({"run_id": run_id, **get_job_summary(run_id), "active_run": get_active_run_state()},
+                     ensure_ascii=False, indent=2))
+
+# LLM 결과 캐시 지표 조회
+def cache_stats(args):
+    from utils.llm_cache import get_llm_cache_stats
+    print(json.dumps(get_llm_cache_stats(), ensure_ascii=False, indent=2))
+
+# A/B 실행 방식별 지표 조회
+def ab_stats(args):
+    from utils.ab_metrics import get_ab_stats
+    print(json.dumps(get_ab_stats(), ensure_ascii=False, indent=2))
+
+# 식습관 분석 응답 캐시 지표 조회
+def analysis_cache_stats(args):
+    from utils.analysis_cache import get_analysis_cache_stats
+    print(json.dumps(get_analysis_cache_stats(), ensure_ascii=False, indent=2))
+
+# 음식 이미지 분석 결과 캐시 지표 조회
+def image_cache_stats(args):
+    from utils.image_cache import get_image_cache_stats
+    print(json.dumps(get_image_cache_stats(), ensure_ascii=False, indent=2))
+
+# 음식명 임베딩 캐시 지표 조회
+def embedding_cache_stats(args):
+    from utils.embedding_cache import get_embedding_cache_stats
+    print(json.dumps(get_embedding_cache_stats(), ensure_ascii=False, indent=2))
+
+# 회원별 최근 분석 채우기: batch_size명씩 나누어 트랜잭션 처리
+def backfill_latest_analysis(args):
+    from db.database import SessionLocal
+    from db.crud import get_all_member_id, backfill_latest_analyses
+    db = SessionLocal()
+    try:
+        member_ids = get_all_member_id(db)
+        backfilled = 0
+        for start in range(0, len(member_ids), args.batch_size):
+            backfilled += backfill_latest_analyses(db, member_ids[start:start + args.batch_size])
+            logger.info(f"[Backfill] 최근 분석 채우기 진행: {min(start + args.batch_size, len(member_ids))}/{len(member_ids)}")
+    finally:
+        db.close()
+    print(json.dumps({"members": len(member_ids), "backfilled": backfilled}, ensure_ascii=False, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EATceed AI 서버 관리 CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    resume_parser = subparsers.add_parser("resume", help="주간 분석 작업 이어서 실행")
+    resume_parser.add_argument("--run-id", default=None, help="작업 ID(기본값: 이번 주 작업)")
+    resume_parser.add_argument("--pipeline", choices=["chained", "fused"], default=None, help="분석 파이프라인(기본값: 설정값)")
+    resume_parser.set_defaults(func=resume)
+
+    rerun_parser = subparsers.add_parser("rerun", help="주간 분석 작업 전체 재실행")
+    rerun_parser.add_argument("--run-id", required=True, help="작업 ID")
+    rerun_parser.add_argument("--pipeline", choices=["chained", "fused"], default=None, help="분석 파이프라인(기본값: 설정값)")
+    rerun_parser.set_defaults(func=rerun)
+
+    status_parser = subparsers.add_parser("status", help="주간 분석 작업 상태 조회")
+    status_parser.add_argument("--run-id", default=None, help="작업 ID(기본값: 이번 주 작업)")
+    status_parser.set_defaults(func=status)
+
+    worker_parser = subparsers.add_parser("worker", help="분산 모드 워커 실행")
+    worker_parser.add_argument("--run-id", default=None, help="작업 ID(미지정 시 상시 대기)")
+    worker_parser.set_defaults(func=worker)
+
+    cache_stats_parser = subparsers.add_parser("cache-stats", help="LLM 결과 캐시 지표 조회")
+    cache_stats_parser.set_defaults(func=cache_stats)
+
+    ab_stats_parser = subparsers.add_parser("ab-stats", help="A/B 실행 방식별 지표 조회")
+    ab_stats_parser.set_defaults(func=ab_stats)
+
+    analysis_cache_stats_parser = subparsers.add_parser("analysis-cache-stats", help="식습관 분석 응답 캐시 지표 조회")
+    analysis_cache_stats_parser.set_defaults(func=analysis_cache_stats)
+
+    image_cache_stats_parser = subparsers.add_parser("image-cache-stats", help="음식 이미지 분석 결과 캐시 지표 조회")
+    image_cache_stats_parser.set_defaults(func=image_cache_stats)
+
+    embedding_cache_stats_parser = subparsers.add_parser("embedding-cache-stats", help="음식명 임베딩 캐시 지표 조회")
+    embedding_cache_stats_parser.set_defaults(func=embedding_cache_stats)
+
+    backfill_parser = subparsers.add_parser("backfill-latest-analysis", help="회원별 최근 분석 채우기")
+    backfill_parser.add_argument("--batch-size", type=int, default=500, help="트랜잭션당 회원 수(기본값: 500)")
+    backfill_parser.set_defaults(func=backfill_latest_analysis)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,144 @@
 # 식습관 분석 router
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from db.database import get_db
-from db.crud import get_latest_eat_habits, get_analysis_status, get_analysis_detail
+import time
+from fastapi import APIRouter, Depends, Request, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.config import settings
+from db.database import get_async_db
+from db.async_crud import get_latest_analysis, get_latest_analysis_state
+from utils.analysis_cache import (build_diet_response, build_diet_cache_entry, get_cached_diet_response, set_cached_diet_response,
+                                  record_diet_request)
+from utils.analysis_events import get_analysis_event_hub
+from utils.conditional_request import build_validators, is_not_modified, apply_validators, not_modified_response
 from auth.decoded_token import get_current_member
+from errors.business_exception import AnalysisInProgress, AnalysisNotCompleted
 from swagger.response_config import get_user_analysis_responses, get_status_alert_responses
 
 router = APIRouter(
     tags=["식습관 분석"]
 )
 
-# 전체 식습관 분석 라우터
+# 전체 식습관 분석 라우터: 분석 완료 시 저장된 응답 캐시가 있으면 DB 조회 없이 응답
+# ETag / Last-Modified: 분석 결과가 바뀌지 않았으면 304(캐시 미적중 시에도 분석 결과 없이 상태만 조회하여 판단)
 @router.get("/diet", responses=get_user_analysis_responses)
-def get_user_analysis(db: Session = Depends(get_db), member_id: int = Depends(get_current_member)):
-    
-    # 최신 분석 상태 확인
-    analysis_status = get_analysis_status(db, member_id)
-    
-    # 최신 분석 기록 조회
-    latest_eat_habits = get_latest_eat_habits(db, analysis_status.STATUS_PK)
+async def get_user_analysis(request: Request, response: Response, db: AsyncSession = Depends(get_async_db),
+                            member_id: int = Depends(get_current_member)):
+    start_time = time.time()
 
-    # 식습관 분석 상세보기 조회
-    analysis_detail = get_analysis_detail(db, member_id)
-    
-    # 분석 날짜
-    analysis_date = analysis_status.ANALYSIS_DATE.strftime("%Y-%m-%d")
+    # 응답 캐시 조회
+    cached = await get_cached_diet_response(member_id)
+    if cached is not None:
+        status_id, analysis_date, diet_response = cached
+        etag, last_modified = build_validators(status_id, analysis_date)
+        await record_diet_request(True, time.time() - start_time)
+        if is_not_modified(request, etag, analysis_date):
+            return not_modified_response(etag, last_modified)
+
+        apply_validators(response, etag, last_modified)
+        return {"success": True, "response": diet_response, "error": None}
+
+    # 최신 분석 상태 확인(회원별 최근 분석 기본키 조회, 분석 결과 제외)
+    latest_state = await get_latest_analysis_state(db, member_id)
+    etag, last_modified = build_validators(latest_state.STATUS_FK, latest_state.ANALYSIS_DATE)
+    if is_not_modified(request, etag, latest_state.ANALYSIS_DATE):
+        await record_diet_request(False, time.time() - start_time)
+        return not_modified_response(etag, last_modified)
+
+    # 최신 분석 기록 조회
+    latest_analysis = await get_latest_analysis(db, member_id)
     
     # 식습관 분석 응답
-    response = {
+    diet_response = build_diet_response(
+        analysis_date=latest_analysis.ANALYSIS_DATE,
+        avg_calorie=latest_analysis.AVG_CALORIE,
+        weight_prediction=latest_analysis.WEIGHT_PREDICTION,
+        advice_carbo=latest_analysis.ADVICE_CARBO,
+        advice_protein=latest_analysis.ADVICE_PROTEIN,
+        advice_fat=latest_analysis.ADVICE_FAT,
+        summarized_advice=latest_analysis.SUMMARIZED_ADVICE,
+        nutrient_analysis=latest_analysis.NUTRIENT_ANALYSIS,
+        diet_improvement=latest_analysis.DIET_IMPROVE,
+        custom_recommendation=latest_analysis.CUSTOM_RECOMMEND
+    )
+
+    # 응답 캐시 저장(read-through)
+    await set_cached_diet_response(member_id, build_diet_cache_entry(latest_analysis.STATUS_FK, latest_analysis.ANALYSIS_DATE,
+                                                                      diet_response))
+    await record_diet_request(False, time.time() - start_time)
+
+    # 검증값은 응답에 사용한 분석 기록 기준
+    apply_validators(response, *build_validators(latest_analysis.STATUS_FK, latest_analysis.ANALYSIS_DATE))
+    response_body = {
         "success": True,
-        "response": {
-            "analysis_date": analysis_date,
-            "avg_calorie" : latest_eat_habits.AVG_CALORIE,
-            "weight_prediction": latest_eat_habits.WEIGHT_PREDICTION,
-            "advice_carbo": latest_eat_habits.ADVICE_CARBO,
-            "advice_protein": latest_eat_habits.ADVICE_PROTEIN,
-            "advice_fat": latest_eat_habits.ADVICE_FAT,
-            "summarized_advice": latest_eat_habits.SUMMARIZED_ADVICE,
-            "nutrient_analysis": analysis_detail.NUTRIENT_ANALYSIS,
-            "diet_improvement": analysis_detail.DIET_IMPROVE,
-            "custom_recommendation": analysis_detail.CUSTOM_RECOMMEND
-        },
+        "response": diet_response,
         "error": None
         }
-    return response
+    return response_body
 
 
-# 식습관 분석 상태 알림 라우터
+# 식습관 분석 상태 알림 라우터: 응답 캐시 또는 분석 상태만 조회, 바뀌지 않았으면 304
 @router.get("/status", responses=get_status_alert_responses)
-def get_status_alert(db: Session = Depends(get_db), member_id: int = Depends(get_current_member)):
+async def get_status_alert(request: Request, response: Response, db: AsyncSession = Depends(get_async_db),
+                           member_id: int = Depends(get_current_member)):
 
-    # 분석 유무 확인
-    analysis_status = get_analysis_status(db, member_id)
+    # 분석 유무 확인(응답 캐시 → 회원별 최근 분석 기본키 조회), 분석 대기 중인 회원은 캐시 대신 진행 상태 확인
+    cached = await get_cached_diet_response(member_id)
+    if cached is not None:
+        status_id, analysis_date, _ = cached
+    else:
+        latest_state = await get_latest_analysis_state(db, member_id)
+        status_id, analysis_date = latest_state.STATUS_FK, latest_state.ANALYSIS_DATE
 
-    # 분석 날짜
-    analysis_date = analysis_status.ANALYSIS_DATE.strftime("%Y-%m-%d")
+    etag, last_modified = build_validators(status_id, analysis_date)
+    if is_not_modified(request, etag, analysis_date):
+        return not_modified_response(etag, last_modified)
+    apply_validators(response, etag, last_modified)
 
     # 알림 응답
-    response = {
+    response_body = {
         "success": True,
         "response": {
-            "analysis_date": analysis_date
+            "analysis_date": analysis_date.strftime("%Y-%m-%d")
         },
         "error": None
     }
     
-    return response
+    return response_body
+
+
+# 식습관 분석 완료 대기 라우터(long-poll): 분석 중이거나 결과가 If-None-Match와 같으면 완료 / 실패 알림까지 대기
+# - 바뀐 결과가 있으면 즉시 /status와 같은 응답
+# - 대기 시간이 지나면 분석 중인 경우 /status와 같은 오류, 결과가 그대로인 경우 304
+@router.get("/status/wait", responses=get_status_alert_responses)
+async def wait_status_alert(request: Request, response: Response,
+                            timeout: float = Query(None, gt=0, description="최대 대기 시간(초), 서버 설정값을 넘을 수 없음"),
+                            db: AsyncSession = Depends(get_async_db), member_id: int = Depends(get_current_member)):
+    timeout = min(timeout or settings.ANALYSIS_WAIT_TIMEOUT, settings.ANALYSIS_WAIT_TIMEOUT)
+    deadline = time.time() + timeout
+
+    # 상태 조회 전에 알림 대기 등록: 조회와 대기 사이의 알림을 놓치지 않음
+    async with get_analysis_event_hub().subscribe(member_id) as waiter:
+        while True:
+            pending_error = None
+            try:
+                latest_state = await get_latest_analysis_state(db, member_id)
+                etag, last_modified = build_validators(latest_state.STATUS_FK, latest_state.ANALYSIS_DATE)
+                if not is_not_modified(request, etag, latest_state.ANALYSIS_DATE):
+                    apply_validators(response, etag, last_modified)
+                    return {
+                        "success": True,
+                        "response": {
+                            "analysis_date": latest_state.ANALYSIS_DATE.strftime("%Y-%m-%d")
+                        },
+                        "error": None
+                    }
+            except (AnalysisInProgress, AnalysisNotCompleted) as e:
+                pending_error = e
+            finally:
+                # 대기 중에는 DB 연결 반환(트랜잭션 종료로 다음 조회는 최신 상태 확인)
+                await db.close()
+
+            # 알림 대기: 알림을 받으면 다시 조회
+            if not await waiter.wait(deadline - time.time()):
+                if pending_error is not None:
+                    raise pending_error
+                return not_modified_response(etag, last_modified)
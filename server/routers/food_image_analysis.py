@@ -1,7 +1,11 @@
 import json
+import asyncio
 from fastapi import APIRouter, Depends, File, UploadFile
-from apis.food_image import food_image_analyze, search_similar_food, process_image_to_base64
+from apis.food_image import food_image_analyze, search_similar_foods, read_image_file, encode_image_to_base64
+from utils.image_preprocess import preprocess_image_async
 from utils.redis_integration import rate_limit_user, get_remaining_requests
+from utils.image_cache import (compute_sha256, compute_dhash, get_cached_image_result, set_cached_image_result,
+                               record_image_cache_result)
 from auth.decoded_token import get_current_member
 from errors.business_exception import InvalidFileFormat, InvalidFoodImageError
 from swagger.response_config import analyze_food_image_responses, remaining_requests_check_responses
@@ -36,8 +40,53 @@ async def analyze_food_image(file: UploadFile = File(...), member_id: int = Depe
     if file.content_type not in ALLOWED_FILE_TYPES:
         raise InvalidFileFormat(allowed_types=ALLOWED_FILE_TYPES)
 
-    # 이미지 처리 및 Base64 인코딩 진행
-    image_base64 = await process_image_to_base64(file)
+    # 이미지 파일 읽기 및 결과 캐시 키 계산(SHA-256 / dHash, 이미지 디코딩은 쓰레드에서 실행)
+    image_bytes = await read_image_file(file)
+    image_sha256 = compute_sha256(image_bytes)
+    image_dhash = await asyncio.to_thread(compute_dhash, image_bytes)
+
+    # 같은 / 거의 같은 이미지의 분석 결과가 있으면 모델 / Pinecone 호출 없이 응답
+    hit, cached = await get_cached_image_result(image_sha256, image_dhash)
+    if hit:
+        similar_food_results = cached["food_info"]
+        cache_stats = await record_image_cache_result(hit, saved_seconds=cached["seconds"])
+        logger.info(f"[Image Cache] member_id={member_id} {hit} 적중, 절약한 시간: {cached['seconds']} sec, 누적 지표: {cache_stats}")
+    else:
+        similar_food_results = await detect_similar_foods(image_bytes, member_id)
+        await set_cached_image_result(image_sha256, image_dhash, similar_food_results, time.time() - start_time)
+        cache_stats = await record_image_cache_result(None)
+        logger.info(f"[Image Cache] member_id={member_id} 미적중, 누적 지표: {cache_stats}")
+    
+    """
+    2. 요청 횟수 제한 구현(Redis)
+    """
+
+    # 요청 횟수 차감: 해당 부분에 존재해야지 분석 실패했을 때는 횟수 차감 x
+    remaining_requests = rate_limit_user(member_id, increment=True)
+
+    response = {
+        "success": True,
+        "response": {
+            "remaining_requests": remaining_requests,
+            "food_info": similar_food_results
+        },
+        "error": None
+    }
+    logger.info(f"member_id:{member_id} - 음식 이미지 탐지 API 사용 ")
+
+    # 종료 시간 기록
+    end_time = time.time()
+    execution_time = end_time - start_time
+    logger.info(f"analyze_food_image API 수행 시간: {execution_time:.4f}초")
+
+    return response
+
+
+# 음식 탐지 및 유사 음식 검색: 모델 호출로 음식명 추출 후 음식별 벡터 유사도 검색
+async def detect_similar_foods(image_bytes: bytes, member_id: int):
+
+    # 이미지 축소 및 JPEG 재인코딩 후 Base64 인코딩 진행(캐시 키는 원본 기준)
+    image_base64 = encode_image_to_base64(await preprocess_image_async(image_bytes))
 
     # OpenAI API 호출로 이미지 분석 및 음식명 추출
     detected_food_data = await food_image_analyze(image_base64)
@@ -51,22 +100,17 @@ async def analyze_food_image(file: UploadFile = File(...), member_id: int = Depe
     # 문자열로 반환된 데이터 JSON으로 변환
     detected_food_data = json.loads(detected_food_data)
         
-    # 유사도 검색 결과 저장할 리스트 초기화
-    similar_food_results = []
-
-    # 유사도 검색 진행
-    for food_data in detected_food_data:
+    # 데이터 형식 확인 후 인덱싱 접근, 음식명 누락 처리
+    food_names = [food_data.get("food_name") for food_data in detected_food_data]
+    food_names = [food_name for food_name in food_names if food_name]
 
-        # 데이터 형식 확인 후 인덱싱 접근
-        food_name = food_data.get("food_name")
+    # 벡터 임베딩 기반 유사도 검색 동시 진행(탐지 순서 유지)
+    search_results = await search_similar_foods(food_names)
 
-        # 음식명 누락 처리
-        if not food_name:
-            continue
-        
+    # 유사도 검색 결과 저장할 리스트 초기화
+    similar_food_results = []
 
-        # 벡터 임베딩 기반 유사도 검색 진행
-        similar_foods = await search_similar_food(food_name)
+    for food_name, similar_foods in zip(food_names, search_results):
         # 검색 결과(임계값으로 필터링된 결과 포함)
         similar_food_list = [
             {"food_name": food["food_name"], "food_pk": food["food_pk"]}
@@ -78,30 +122,8 @@ async def analyze_food_image(file: UploadFile = File(...), member_id: int = Depe
             "detected_food": food_name,
             "similar_foods": similar_food_list
         })
-    
-    """
-    2. 요청 횟수 제한 구현(Redis)
-    """
-
-    # 요청 횟수 차감: 해당 부분에 존재해야지 분석 실패했을 때는 횟수 차감 x
-    remaining_requests = rate_limit_user(member_id, increment=True)
-
-    response = {
-        "success": True,
-        "response": {
-            "remaining_requests": remaining_requests,
-            "food_info": similar_food_results
-        },
-        "error": None
-    }
-    logger.info(f"member_id:{member_id} - 음식 이미지 탐지 API 사용 ")
 
-    # 종료 시간 기록
-    end_time = time.time()
-    execution_time = end_time - start_time
-    logger.info(f"analyze_food_image API 수행 시간: {execution_time:.4f}초")
-
-    return response
+    return similar_food_results
 
 
 # 기능 잔여 횟수 확인 API
@@ -2,7 +2,12 @@ import os
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from utils.file_handler import read_prompt, prompt_cache
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, Field
+from utils.file_handler import read_prompt
+from utils.redis_integration import acquire_llm_quota, estimate_tokens
+from utils.llm_cache import with_llm_cache, get_model_name
+from utils.chain_registry import ChainRegistry
 from core.config import settings
 from logs.logger_config import get_logger
 
@@ -13,95 +18,187 @@ logger = get_logger()
 llm = ChatOpenAI(model='gpt-4o-mini', temperature=0, max_completion_tokens=250)
 analysis_llm = ChatOpenAI(model='gpt-4o', temperature=0, max_completion_tokens=250)
 
+# 통합 분석(fused): 분석 / 개선점 / 식단 / 요약 / 조언을 한 번에 생성하므로 최대 응답 토큰 확대
+FUSED_MAX_TOKENS = 1200
+fused_llm = ChatOpenAI(model='gpt-4o', temperature=0, max_completion_tokens=FUSED_MAX_TOKENS)
 
-# Prompt 템플릿 정의
-async def create_prompt_template(file_path, input_variables):
-    # 전역 캐시에서 조회
-    prompt_content = prompt_cache.get(file_path)
 
-    # 캐시가 없으면 Redis에서 조회
-    if not prompt_content:
-        prompt_content = await read_prompt(file_path, category="diet", ttl=604800)
+# 통합 분석 출력 형식: 식습관 조언
+class DietAdvice(BaseModel):
+    carbo_advice: str = Field(description="탄수화물 섭취 조언")
+    protein_advice: str = Field(description="단백질 섭취 조언")
+    fat_advice: str = Field(description="지방 섭취 조언")
+
+# 통합 분석 출력 형식: Multi-Chain 4단계 결과 + 식습관 조언
+class FusedDietAnalysis(BaseModel):
+    nutrition_analysis: str = Field(description="전체적인 영양소 분석")
+    diet_improvement: str = Field(description="개선점")
+    custom_recommendation: str = Field(description="맞춤형 식단")
+    diet_summary: str = Field(description="식습관 분석 요약")
+    diet_advice: DietAdvice = Field(description="영양소별 식습관 조언")
+
+
+# Prompt 템플릿 정의: 파일 수정 시간이 같으면 전역 캐시, 변경되었으면 파일에서 다시 읽음
+async def create_prompt_template(file_path, input_variables):
+    prompt_content = await read_prompt(file_path, category="diet", ttl=604800)
 
     return PromptTemplate(template=prompt_content, input_variables=input_variables)
 
-# Chain 정의: 식습관 조언
-async def create_advice_chain(llm_override=None):
-    prompt_path = os.path.join(settings.PROMPT_PATH, "diet_advice.txt")
-    prompt_template = await create_prompt_template(
-        prompt_path,
-        input_variables=[
+# 모델 호출 전 분당 요청 / 토큰 한도 확보(프롬프트 토큰 추정치 + 최대 응답 토큰)
+def with_llm_quota(model):
+    model_name = get_model_name(model)
+    max_tokens = getattr(model, "max_tokens", None) or 0
+
+    async def acquire(prompt_value):
+        await acquire_llm_quota(model_name, tokens=estimate_tokens(prompt_value.to_string()) + max_tokens)
+        return prompt_value
+
+    return RunnableLambda(acquire)
+
+# Chain 구성 정보: 프롬프트 파일, 입력 변수, 기본 모델, 출력 파서
+CHAIN_SPECS = {
+    # 식습관 조언
+    "diet_advice": {
+        "prompt_file": "diet_advice.txt",
+        "input_variables": [
             "gender", "age", "height", "weight", "physical_activity_index",
             "carbohydrate", "protein", "fat", "carbo_avg", "protein_avg", "fat_avg"
-        ]
-    )
-    model = llm_override if llm_override is not None else llm
-    return prompt_template | model | JsonOutputParser()
-
-# Chain 정의: 전체적인 영양소 분석
-async def create_nutrition_analysis_chain(llm_override=None):
-    prompt_path = os.path.join(settings.PROMPT_PATH, "nutrition_analysis.txt")
-    prompt_template = await create_prompt_template(
-        prompt_path,
-        input_variables=[
+        ],
+        "model": llm,
+        "parser": JsonOutputParser
+    },
+    # 전체적인 영양소 분석
+    "nutrition_analysis": {
+        "prompt_file": "nutrition_analysis.txt",
+        "input_variables": [
             "gender", "age", "height", "weight",
             "physical_activity_index", "carbohydrate", "protein", "fat",
             "calorie", "sodium", "dietary_fiber", "sugars",
             "carbo_avg", "protein_avg", "fat_avg", "tdee"
-        ]
-    )
-    model = llm_override if llm_override is not None else analysis_llm
-    return prompt_template | model | StrOutputParser()
-
-# Chain 정의: 개선점
-async def create_improvement_chain(llm_override=None):
-    prompt_path = os.path.join(settings.PROMPT_PATH, "diet_improvement.txt")
-    prompt_template = await create_prompt_template(
-        prompt_path,
-        input_variables=[
+        ],
+        "model": analysis_llm,
+        "parser": StrOutputParser
+    },
+    # 개선점
+    "diet_improvement": {
+        "prompt_file": "diet_improvement.txt",
+        "input_variables": [
             "carbohydrate", "carbo_avg", "protein", "protein_avg",
             "fat", "fat_avg", "calorie", "tdee", "nutrition_analysis", "target_weight"
-        ]
-    )
-    model = llm_override if llm_override is not None else analysis_llm
-    return prompt_template | model | StrOutputParser()
-
-# Chain 정의: 맞춤형 식단 제공
-async def create_diet_recommendation_chain(llm_override=None):
-    prompt_path = os.path.join(settings.PROMPT_PATH, "custom_recommendation.txt")
-    prompt_template = await create_prompt_template(
-        prompt_path,
-        input_variables=[
+        ],
+        "model": analysis_llm,
+        "parser": StrOutputParser
+    },
+    # 맞춤형 식단 제공
+    "custom_recommendation": {
+        "prompt_file": "custom_recommendation.txt",
+        "input_variables": [
             "diet_improvement", "etc", "target_weight"
-        ]
-    )
-    model = llm_override if llm_override is not None else analysis_llm
-    return prompt_template | model | StrOutputParser()
-
-# Chain 정의: 식습관 분석 요약
-async def create_summarize_chain(llm_override=None):
-    prompt_path = os.path.join(settings.PROMPT_PATH, "diet_summary.txt")
-    prompt_template = await create_prompt_template(
-        prompt_path,
-        input_variables=[
+        ],
+        "model": analysis_llm,
+        "parser": StrOutputParser
+    },
+    # 식습관 분석 요약
+    "diet_summary": {
+        "prompt_file": "diet_summary.txt",
+        "input_variables": [
             "nutrition_analysis", "diet_improvement", "custom_recommendation"
-        ]
-    )
-    model = llm_override if llm_override is not None else llm
-    return prompt_template | model | StrOutputParser()
-
-# Chain 정의: 평가 체인
-async def create_evaluation_chain(llm_override=None):
-    prompt_path = os.path.join(settings.PROMPT_PATH, "diet_eval.txt")
-    prompt_template = await create_prompt_template(
-        prompt_path,
-        input_variables=[
+        ],
+        "model": llm,
+        "parser": StrOutputParser
+    },
+    # 평가
+    "diet_eval": {
+        "prompt_file": "diet_eval.txt",
+        "input_variables": [
             "gender", "age", "height", "weight",
             "physical_activity_index", "etc", "target_weight",
             "carbohydrate", "protein", "fat",
             "calorie", "sodium", "dietary_fiber", "sugars", "tdee",
             "nutrition_analysis", "diet_improvement", "custom_recommendation", "diet_summary"
-        ]
-    )
-    model = llm_override if llm_override is not None else llm
-    return prompt_template | model | JsonOutputParser()
\ No newline at end of file
+        ],
+        "model": llm,
+        "parser": JsonOutputParser
+    },
+    # 통합 분석: 영양소 분석 / 개선점 / 식단 / 요약 / 조언을 구조화된 출력으로 한 번에 생성
+    "diet_fused_analysis": {
+        "prompt_file": "diet_fused_analysis.txt",
+        "input_variables": [
+            "gender", "age", "height", "weight", "physical_activity_index", "etc", "target_weight",
+            "carbohydrate", "protein", "fat", "calorie", "sodium", "dietary_fiber", "sugars",
+            "carbo_avg", "protein_avg", "fat_avg", "tdee"
+        ],
+        "model": fused_llm,
+        "output_schema": FusedDietAnalysis
+    },
+}
+
+# Chain 이름에 해당하는 Prompt 파일 경로
+def get_chain_prompt_path(name):
+    return os.path.join(settings.PROMPT_PATH, CHAIN_SPECS[name]["prompt_file"])
+
+# Chain 이름에 해당하는 Prompt 템플릿 생성
+async def create_chain_prompt_template(name):
+    spec = CHAIN_SPECS[name]
+    return await create_prompt_template(get_chain_prompt_path(name), input_variables=spec["input_variables"])
+
+# Chain 생성: Prompt → Rate-Limit 확인 → 모델 → 출력 파서(결과 캐시 적용)
+async def create_chain(name, llm_override=None, variant=None):
+    spec = CHAIN_SPECS[name]
+    prompt_template = await create_chain_prompt_template(name)
+    model = llm_override if llm_override is not None else spec["model"]
+
+    # 구조화된 출력: 스키마 객체를 dict로 변환해 다른 Chain 결과와 같은 형태로 반환
+    if "output_schema" in spec:
+        structured_model = model.with_structured_output(spec["output_schema"])
+        chain = prompt_template | with_llm_quota(model) | structured_model | RunnableLambda(lambda output: output.model_dump())
+    else:
+        chain = prompt_template | with_llm_quota(model) | model | spec["parser"]()
+    return with_llm_cache(chain, name, prompt_template, model, variant)
+
+# Chain 레지스트리: (Chain, 모델, 변형)별로 한 번 생성한 Chain 공유, 프롬프트 파일 변경 시 재생성
+chain_registry = ChainRegistry()
+
+# 레지스트리 모델 구분값: 기본 모델은 None, Fallback 등 대체 모델은 (종류, 모델명, 최대 토큰)
+def get_model_key(model):
+    if model is None:
+        return None
+    return (type(model).__name__, get_model_name(model), getattr(model, "max_tokens", None))
+
+# 레지스트리 조회: 결과 캐시 사용 여부도 Chain 구성에 포함되므로 키에 반영
+async def get_registered_chain(key, chain_names, builder, llm_override=None, variant=None):
+    registry_key = (key, get_model_key(llm_override), variant, settings.LLM_CACHE_ENABLED)
+    prompt_paths = [get_chain_prompt_path(name) for name in chain_names]
+    return await chain_registry.get(registry_key, prompt_paths, builder)
+
+# 단일 Chain 조회(레지스트리)
+async def get_chain(name, llm_override=None, variant=None):
+    return await get_registered_chain(name, [name], lambda: create_chain(name, llm_override, variant), llm_override, variant)
+
+# Chain 정의: 식습관 조언
+async def create_advice_chain(llm_override=None, variant=None):
+    return await get_chain("diet_advice", llm_override, variant)
+
+# Chain 정의: 전체적인 영양소 분석
+async def create_nutrition_analysis_chain(llm_override=None, variant=None):
+    return await get_chain("nutrition_analysis", llm_override, variant)
+
+# Chain 정의: 개선점
+async def create_improvement_chain(llm_override=None, variant=None):
+    return await get_chain("diet_improvement", llm_override, variant)
+
+# Chain 정의: 맞춤형 식단 제공
+async def create_diet_recommendation_chain(llm_override=None, variant=None):
+    return await get_chain("custom_recommendation", llm_override, variant)
+
+# Chain 정의: 식습관 분석 요약
+async def create_summarize_chain(llm_override=None, variant=None):
+    return await get_chain("diet_summary", llm_override, variant)
+
+# Chain 정의: 평가 체인
+async def create_evaluation_chain(llm_override=None, variant=None):
+    return await get_chain("diet_eval", llm_override, variant)
+
+# Chain 정의: 통합 분석(단일 호출)
+async def create_fused_analysis_chain(llm_override=None, variant=None):
+    return await get_chain("diet_fused_analysis", llm_override, variant)
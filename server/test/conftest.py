@@ -0,0 +1,109 @@
+import os
+import sys
+import pytest
+import fakeredis
+import fakeredis.aioredis
+from datetime import datetime
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+import core.config_redis as config_redis
+
+"""
+테스트 공용 fixture
+
+- fake_redis: 실제 Redis 대신 테스트마다 새로 만든 메모리 Redis(fakeredis) 사용
+  - 이미 import된 모듈이 `from core.config_redis import ...`로 가져간 클라이언트도 함께 교체(테스트 종료 시 복구)
+  - 반환값은 동기 클라이언트(테스트에서 상태 확인용)
+- sqlite_db: MySQL 대신 테스트마다 새로 만든 SQLite 메모리 DB의 Session Factory(회원 SQLITE_MEMBER_COUNT명 추가)
+- sqlite_db_url: 같은 내용의 SQLite 파일 DB 경로(동기 / 비동기 Session을 함께 사용하는 테스트용)
+"""
+
+# 교체 대상 모듈: 서버 코드 패키지
+PATCHED_PACKAGES = ("core.", "utils.", "apis.", "db.", "routers.", "auth.")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeStrictRedis(server=server, decode_responses=True)
+
+    def get_async_redis_client():
+        return fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+    def get_async_redis_binary_client():
+        return fakeredis.aioredis.FakeRedis(server=server, decode_responses=False)
+
+    replacements = {
+        "redis_client": client,
+        "get_async_redis_client": get_async_redis_client,
+        "get_async_redis_binary_client": get_async_redis_binary_client,
+    }
+    originals = {attribute: getattr(config_redis, attribute) for attribute in replacements}
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "main" or name.startswith(PATCHED_PACKAGES)):
+            continue
+        for attribute, replacement in replacements.items():
+            # 같은 이름의 다른 객체는 교체하지 않음
+            if getattr(module, attribute, None) is originals[attribute]:
+                monkeypatch.setattr(module, attribute, replacement)
+
+    return client
+
+
+# sqlite_db / sqlite_db_url fixture로 추가하는 회원 수
+SQLITE_MEMBER_COUNT = 3
+
+
+# SQLite DB 생성: 테이블 생성 후 회원 추가, (engine, Session Factory) 반환
+def create_sqlite_database(url, **engine_kwargs):
+    from sqlalchemy import create_engine, BigInteger
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.orm import sessionmaker
+    from db.models import Base, Agreement, Member
+
+    # SQLite는 BIGINT 기본키 자동 증가를 지원하지 않으므로 INTEGER로 생성
+    @compiles(BigInteger, "sqlite")
+    def compile_big_integer(type_, compiler, **kw):
+        return "INTEGER"
+
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **engine_kwargs)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    now = datetime.now()
+    db.add(Agreement(
+        AGREEMENT_PK=1, CREATED_DATE=now, UPDATED_DATE=now,
+        AGREEMENT_IS_PRIVACY_POLICY_AGREE=True, AGREEMENT_IS_TERMS_SERVICE_AGREE=True,
+        AGREEMENT_IS_OVER_AGE=True, AGREEMENT_IS_SENSITIVE_DATA_AGREE=True
+    ))
+    for member_pk in range(1, SQLITE_MEMBER_COUNT + 1):
+        db.add(Member(
+            MEMBER_PK=member_pk, CREATED_DATE=now, UPDATED_DATE=now,
+            MEMBER_EMAIL=f"member{member_pk}@eatceed.com", MEMBER_PASSWORD="-", AGREEMENT_FK=1
+        ))
+    db.commit()
+    db.close()
+    return engine, session_factory
+
+
+@pytest.fixture
+def sqlite_db():
+    from sqlalchemy.pool import StaticPool
+
+    engine, session_factory = create_sqlite_database("sqlite://", poolclass=StaticPool)
+    yield session_factory
+    engine.dispose()
+
+
+# 파일 DB: 동기 / 비동기(aiosqlite) 엔진이 같은 DB를 사용해야 하는 경우, DB 경로(sqlite:///...) 반환
+@pytest.fixture
+def sqlite_db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'eatceed.db'}"
+    engine, _ = create_sqlite_database(url)
+    engine.dispose()
+    return url
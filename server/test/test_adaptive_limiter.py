@@ -0,0 +1,120 @@
+import os
+import sys
+import asyncio
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from utils.concurrency import AdaptiveConcurrencyLimiter
+
+"""
+AIMD 동시 실행 제한기 테스트(limit 변경 지표는 fake_redis에 기록)
+
+- 동시에 실행 중인 작업 수는 limit을 넘지 않음
+- limit만큼 성공하고 p95 지연시간 / 오류율이 기준 이하이면 +1, 지연시간이 기준을 넘으면 유지
+- Rate-Limit(429) / Timeout이면 절반으로 감소(cooldown 안의 중복 감소 / 그 외 오류는 감소 없음, 최솟값 유지)
+- 깨워진 직후 취소된 작업의 슬롯은 다음 대기 작업이 이어받음
+"""
+
+
+def make_limiter(initial_limit=2, min_limit=1, max_limit=10, latency_target=1.0, cooldown=5.0):
+    return AdaptiveConcurrencyLimiter(name="test", initial_limit=initial_limit, min_limit=min_limit, max_limit=max_limit,
+                                      latency_target=latency_target, cooldown=cooldown)
+
+
+# 테스트: 동시에 실행 중인 작업 수는 limit 이하
+def test_in_flight_never_exceeds_limit(fake_redis):
+    limiter = make_limiter(initial_limit=3)
+    running = {"now": 0, "max": 0}
+
+    async def task():
+        async with limiter:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*[task() for _ in range(20)])
+
+    asyncio.run(run())
+    assert running["max"] == 3
+    assert limiter.snapshot()["in_flight"] == 0
+
+
+# 테스트: 한 라운드(limit만큼) 성공 후 지연시간이 기준 이하이면 증가, 넘으면 유지
+def test_additive_increase_on_success(fake_redis):
+    limiter = make_limiter(initial_limit=2)
+    limiter.record_success(0.1)
+    assert limiter.limit == 2
+    limiter.record_success(0.1)
+    assert limiter.limit == 3
+
+    slow = make_limiter(initial_limit=2)
+    for _ in range(4):
+        slow.record_success(5.0)
+    assert slow.limit == 2
+
+    capped = make_limiter(initial_limit=10, max_limit=10)
+    for _ in range(10):
+        capped.record_success(0.1)
+    assert capped.limit == 10
+
+
+# 테스트: 429 / Timeout이면 절반으로 감소, cooldown 안의 중복 감소 / 그 외 오류는 무시
+def test_multiplicative_decrease_on_throttle(fake_redis):
+    limiter = make_limiter(initial_limit=8)
+    limiter.record_error(throttled=False)
+    assert limiter.limit == 8
+
+    limiter.record_error(throttled=True)
+    assert limiter.limit == 4
+    limiter.record_error(throttled=True)
+    assert limiter.limit == 4
+
+    floor = make_limiter(initial_limit=1, cooldown=0)
+    floor.record_error(throttled=True)
+    assert floor.limit == 1
+
+    # 변경된 limit은 지표로 기록
+    assert fake_redis.hget("metrics:limiter:test", "limit") == "4"
+
+
+# 테스트: limit이 늘어나면 대기 중인 작업이 바로 실행
+def test_increase_wakes_waiters(fake_redis):
+    limiter = make_limiter(initial_limit=1)
+
+    async def run():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.record_success(0.1)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.snapshot()["in_flight"] == 2
+
+    asyncio.run(run())
+
+
+# 테스트: 깨워진 직후 취소된 작업이 받은 슬롯은 다음 대기 작업에 넘어감
+def test_cancelled_waiter_passes_slot(fake_redis):
+    limiter = make_limiter(initial_limit=1)
+
+    async def run():
+        await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # 슬롯 반환으로 첫 번째 작업이 깨워진 뒤, 실행되기 전에 취소
+        limiter.release()
+        first.cancel()
+
+        await asyncio.wait_for(second, timeout=1)
+        assert first.cancelled()
+        assert limiter.snapshot()["in_flight"] == 1
+
+    asyncio.run(run())
@@ -0,0 +1,167 @@
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from utils.batch_backend import LocalBatchBackend, run_batch
+from utils.analysis_job import get_member_states, JOB_RUNNING, JOB_DONE, JOB_SKIPPED, JOB_FAILED, PENDING_MEMBERS_KEY
+from templates.prompt_template import CHAIN_SPECS, create_chain_prompt_template
+from apis import analysis_batch
+from apis.analysis_batch import (MAX_BATCH_ROUNDS, collect_round_requests, ingest_round_results, prepare_batch_states,
+                                 save_batch_results)
+from apis.food_analysis import compute_analysis_fingerprint, build_analysis_record
+from db.crud import add_analysis_status, save_analysis_results
+from db.models import AnalysisStatus
+
+"""
+Batch 실행 모드 테스트(로컬 Batch 백엔드, SQLite 메모리 DB, fake_redis 사용)
+
+- 라운드별 의존 단계 실행, 평가 미달 시 B 실행, 실패 회원 제외
+- Batch 대상 회원의 분석 상태는 결과 저장 시 추가(Batch 실행 중에는 분석 대기 상태가 아님)
+- 결과 재사용 / 준비 실패 회원은 준비 단계에서 분석 상태를 추가하고 바로 완료 / 실패 처리
+"""
+
+RUN_ID = "2025-W03"
+PROMPT_VERSION = "v1"
+
+# 합성 회원 입력값
+MEMBER_INPUT = {
+    "gender": "Male", "age": 30, "height": 175.0, "weight": 70.0, "physical_activity_index": 1.5,
+    "carbohydrate": 250.0, "protein": 80.0, "fat": 60.0, "calorie": 2000.0, "sodium": 2500.0,
+    "dietary_fiber": 20.0, "sugars": 40.0, "tdee": 2400.0, "etc": "없음", "target_weight": 65.0,
+    "carbo_avg": 280.0, "protein_avg": 70.0, "fat_avg": 55.0
+}
+
+
+# 로컬 Batch 응답: member 2의 A 실행은 평가 점수 미달, member 3의 요약은 실패
+def fake_responder(request):
+    member_id, variant, name = request["custom_id"].split(":")
+
+    if member_id == "3" and name == "diet_summary":
+        raise RuntimeError("forced failure")
+
+    if name == "diet_advice":
+        content = json.dumps({"carbo_advice": "c", "protein_advice": "p", "fat_advice": "f"})
+    elif name == "diet_eval":
+        low_score = member_id == "2" and "결과 A" in request["body"]["messages"][0]["content"]
+        content = json.dumps({"relevance": 2.0 if low_score else 4.5, "faithfulness": 0.9})
+    else:
+        content = f"{name} 결과 {variant}"
+
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+# 회원별 Chain 입력값: 회원마다 체중만 다름
+def member_input(member_id):
+    return {**MEMBER_INPUT, "weight": 70.0 + member_id}
+
+
+FINAL_RESULTS = {
+    "diet_advice": {"carbo_advice": "c", "protein_advice": "p", "fat_advice": "f"},
+    "diet_summary": "요약",
+    "nutrition_analysis": "영양소 분석",
+    "diet_improvement": "개선점",
+    "custom_recommendation": "맞춤 식단",
+}
+
+
+def build_state(member_id):
+    return {
+        "member_id": member_id, "status_id": member_id, "inputs": dict(MEMBER_INPUT),
+        "weight_prediction": "감소", "avg_calorie": 2000.0, "fingerprint": "-",
+        "variant": "A", "advice": None, "results": {"A": {}, "B": {}}, "evaluations": {},
+        "multi_chain": None, "final": None, "failed": False
+    }
+
+
+# 테스트: 라운드별 의존 단계 실행, 평가 미달 시 B 실행, 실패 회원 제외
+async def run_rounds():
+    backend = LocalBatchBackend(responder=fake_responder)
+    prompt_templates = {name: await create_chain_prompt_template(name) for name in CHAIN_SPECS}
+    states = {member_id: build_state(member_id) for member_id in [1, 2, 3]}
+
+    rounds = 0
+    with tempfile.TemporaryDirectory() as batch_dir:
+        for round_no in range(1, MAX_BATCH_ROUNDS + 1):
+            requests = await collect_round_requests(states, prompt_templates)
+            if not requests:
+                break
+            rounds = round_no
+
+            input_path = os.path.join(batch_dir, f"round{round_no}.input.jsonl")
+            output_path = os.path.join(batch_dir, f"round{round_no}.output.jsonl")
+            with open(input_path, "w", encoding="utf-8") as file:
+                for request in requests:
+                    file.write(json.dumps({k: v for k, v in request.items() if k != "cache_key"}, ensure_ascii=False) + "\n")
+
+            await run_batch(backend, input_path, output_path, poll_interval=0)
+            await ingest_round_results(states, requests, output_path)
+
+    return states, rounds
+
+
+def test_batch_rounds(fake_redis, monkeypatch):
+    # 캐시된 결과 대신 매번 Batch 요청 생성
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    states, rounds = asyncio.run(run_rounds())
+
+    # A 실행 통과: 조언 + 4단계 + 평가
+    assert states[1]["final"]["diet_summary"] == "diet_summary 결과 A"
+    assert states[1]["final"]["diet_advice"]["carbo_advice"] == "c"
+
+    # A 평가 미달 → B 실행 결과 선택
+    assert states[2]["final"]["diet_summary"] == "diet_summary 결과 B"
+
+    # 요약 단계 실패
+    assert states[3]["failed"] and states[3]["final"] is None
+
+    assert rounds == MAX_BATCH_ROUNDS
+
+
+
+# 테스트: Batch 대상 회원은 결과 저장 시 분석 상태 추가, 결과 재사용 / 준비 실패 회원은 준비 단계에서 완료 / 실패 처리
+def test_batch_status_rows_created_at_save(sqlite_db, fake_redis, monkeypatch):
+
+    # 회원 3: 최근 7일간 식사 기록 없음
+    def fake_build_analysis_input(db, member_id, avg_nutrition=None):
+        if member_id == 3:
+            return None
+        return {"user": [{}] * 5 + [{"calorie": 2000.0}]}, member_input(member_id), "감소"
+
+    monkeypatch.setattr(analysis_batch, "build_analysis_input", fake_build_analysis_input)
+
+    # 회원 2: 입력값이 같은 이전 분석 존재
+    db = sqlite_db()
+    previous_status_id = add_analysis_status(db, 2).STATUS_PK
+    fingerprint = compute_analysis_fingerprint(member_input(2), "감소", PROMPT_VERSION)
+    save_analysis_results(db, [build_analysis_record(2, previous_status_id, FINAL_RESULTS, "감소", 2000.0,
+                                                     fingerprint, chain_seconds=1.0)])
+
+    states = prepare_batch_states(db, RUN_ID, [1, 2, 3], {}, PROMPT_VERSION)
+
+    # Batch 실행 중: 회원 1은 분석 상태 없음(이전 완료 분석 응답 유지)
+    assert list(states) == [1] and states[1]["status_id"] is None
+    assert db.query(AnalysisStatus).filter(AnalysisStatus.MEMBER_FK == 1).count() == 0
+    assert not fake_redis.sismember(PENDING_MEMBERS_KEY, 1)
+    assert get_member_states(RUN_ID) == {1: JOB_RUNNING, 2: JOB_SKIPPED, 3: JOB_FAILED}
+
+    reused = db.query(AnalysisStatus).filter(AnalysisStatus.MEMBER_FK == 2, AnalysisStatus.STATUS_PK != previous_status_id).one()
+    failed = db.query(AnalysisStatus).filter(AnalysisStatus.MEMBER_FK == 3).one()
+    assert (reused.IS_ANALYZED, reused.IS_PENDING) == (True, False)
+    assert (failed.IS_ANALYZED, failed.IS_PENDING) == (False, False)
+
+    states[1]["final"] = FINAL_RESULTS
+    save_batch_results(db, RUN_ID, states, chain_seconds=1.0)
+
+    db.expire_all()
+    completed = db.query(AnalysisStatus).filter(AnalysisStatus.MEMBER_FK == 1).one()
+    assert (completed.STATUS_PK, completed.IS_ANALYZED, completed.IS_PENDING) == (states[1]["status_id"], True, False)
+    assert get_member_states(RUN_ID)[1] == JOB_DONE
+    db.close()
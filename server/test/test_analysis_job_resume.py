@@ -0,0 +1,105 @@
+import os
+import sys
+from datetime import datetime
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from apis import food_analysis
+from apis.food_analysis import prepare_analysis_job, resolve_analysis_pipeline, PIPELINE_CHAINED, PIPELINE_FUSED
+from db.crud import add_analysis_status
+from db.models import Member, AnalysisStatus, LatestAnalysis
+from utils.analysis_job import (init_job, set_member_state, get_member_states, set_job_meta, JOB_QUEUED, JOB_RUNNING,
+                                JOB_DONE, JOB_SKIPPED, JOB_FAILED, PENDING_MEMBERS_KEY)
+
+"""
+주간 분석 작업 재시작 테스트(SQLite 메모리 DB, fake_redis 사용)
+
+- 같은 작업 ID로 다시 준비하면 완료(done) / 결과 재사용(skipped) 회원은 건너뛰고, 실패 / 대기 회원은 다시 분석
+- 실행 중(running)으로 남은 회원(이전 실행 중단)은 대기 상태로 남은 분석 기록을 실패 처리한 뒤 다시 분석
+- 전체 재실행(rerun)은 회원별 상태를 초기화
+- 분석 파이프라인: 지정값 → 같은 작업의 이전 실행 설정 → 설정값
+"""
+
+RUN_ID = "weekly-20250106"
+
+# 이전 실행의 회원별 상태(회원 4, 5 추가)
+PREVIOUS_STATES = {1: JOB_DONE, 2: JOB_SKIPPED, 3: JOB_FAILED, 4: JOB_RUNNING, 5: JOB_QUEUED}
+
+
+# 작업 준비가 테스트 DB를 사용하도록 대체, 이전 실행 상태 기록: 중단된 회원의 분석 상태 PK 반환
+def setup_previous_run(sqlite_db, monkeypatch):
+
+    def get_test_db():
+        db = sqlite_db()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(food_analysis, "get_db", get_test_db)
+
+    db = sqlite_db()
+    now = datetime.now()
+    for member_pk in (4, 5):
+        db.add(Member(MEMBER_PK=member_pk, CREATED_DATE=now, UPDATED_DATE=now,
+                      MEMBER_EMAIL=f"member{member_pk}@eatceed.com", MEMBER_PASSWORD="-", AGREEMENT_FK=1))
+    db.commit()
+
+    # 이전 실행이 회원 4 분석 중에 중단됨
+    interrupted_status_id = add_analysis_status(db, 4).STATUS_PK
+    db.close()
+
+    init_job(RUN_ID, list(PREVIOUS_STATES))
+    for member_id, state in PREVIOUS_STATES.items():
+        set_member_state(RUN_ID, member_id, state)
+    return interrupted_status_id
+
+
+# 테스트: 완료 / 결과 재사용 회원은 건너뛰고, 실패 / 중단 / 대기 회원만 다시 분석
+def test_resume_skips_completed_members(sqlite_db, fake_redis, monkeypatch):
+    setup_previous_run(sqlite_db, monkeypatch)
+
+    target_ids, _ = prepare_analysis_job(RUN_ID)
+
+    assert target_ids == [3, 4, 5]
+    states = get_member_states(RUN_ID)
+    assert (states[1], states[2], states[3]) == (JOB_DONE, JOB_SKIPPED, JOB_FAILED)
+
+
+# 테스트: 중단된 실행이 남긴 대기 상태 분석 기록은 실패 처리(회원별 최근 분석 / 분석 대기 회원 집합도 정리)
+def test_resume_cleans_up_interrupted_rows(sqlite_db, fake_redis, monkeypatch):
+    interrupted_status_id = setup_previous_run(sqlite_db, monkeypatch)
+    assert fake_redis.sismember(PENDING_MEMBERS_KEY, 4)
+
+    prepare_analysis_job(RUN_ID)
+
+    db = sqlite_db()
+    status = db.get(AnalysisStatus, interrupted_status_id)
+    assert (status.IS_ANALYZED, status.IS_PENDING) == (False, False)
+    assert not db.get(LatestAnalysis, 4).IS_PENDING
+    db.close()
+    assert not fake_redis.sismember(PENDING_MEMBERS_KEY, 4)
+
+
+# 테스트: 전체 재실행은 회원별 상태를 초기화하여 모든 회원 분석
+def test_rerun_resets_member_states(sqlite_db, fake_redis, monkeypatch):
+    setup_previous_run(sqlite_db, monkeypatch)
+
+    target_ids, _ = prepare_analysis_job(RUN_ID, rerun=True)
+
+    assert target_ids == list(PREVIOUS_STATES)
+    assert set(get_member_states(RUN_ID).values()) == {JOB_QUEUED}
+
+
+# 테스트: 재시작 시 지정값이 없으면 이전 실행의 분석 파이프라인 사용
+def test_resume_keeps_pipeline(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_PIPELINE", PIPELINE_CHAINED)
+    assert resolve_analysis_pipeline(RUN_ID) == PIPELINE_CHAINED
+
+    set_job_meta(RUN_ID, {"pipeline": PIPELINE_FUSED})
+    assert resolve_analysis_pipeline(RUN_ID) == PIPELINE_FUSED
+    assert resolve_analysis_pipeline(RUN_ID, PIPELINE_CHAINED) == PIPELINE_CHAINED
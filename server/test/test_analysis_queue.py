@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import asyncio
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from apis import analysis_worker
+from apis.analysis_worker import process_member
+from utils import analysis_queue
+from utils.analysis_queue import (try_acquire_leader, renew_leader, release_leader, has_leader, enqueue_members,
+                                  claim_member, ack_member, remaining_count, requeue_stale_members, try_acquire_sweep,
+                                  acquire_member_lock, renew_member_lock, release_member_lock)
+from utils.concurrency import AdaptiveConcurrencyLimiter
+
+"""
+분산 모드 큐 테스트(fake_redis 사용)
+
+- 리더 임대: 한 번에 리더 1개, 임대가 만료되면 다른 프로세스가 이어받고 이전 리더는 연장 / 해제 불가
+- 재전달: 처리 중에 종료된 워커의 회원은 대기 리스트로 복귀, 잠금이 남아 있는 회원은 복귀하지 않음
+- 큐 등록: 기존 큐에 합쳐서 등록(처리 중인 전달 유지, 같은 회원 중복 등록 없음)
+- 중단된 작업 회수: 주기마다 전체 워커 중 한 곳만 실행
+- 회원 잠금: 같은 회원은 한 워커만 처리, 분석이 잠금 유지 시간보다 길어도 연장되어 재전달되지 않음
+"""
+
+RUN_ID = "2025-W01"
+
+
+# 임대 만료 흉내: 남은 시간을 1ms로 줄인 뒤 대기
+def expire(client, key):
+    client.pexpire(key, 1)
+    time.sleep(0.01)
+
+
+# 테스트: 리더 임대 이어받기
+def test_leader_lease_handoff(fake_redis):
+    first = try_acquire_leader(RUN_ID)
+    assert first is not None
+    assert try_acquire_leader(RUN_ID) is None
+    assert renew_leader(RUN_ID, first)
+
+    expire(fake_redis, f"analysis_queue:{RUN_ID}:leader")
+    assert not has_leader(RUN_ID)
+
+    second = try_acquire_leader(RUN_ID)
+    assert second is not None
+
+    # 이전 리더는 새 리더의 임대를 연장 / 해제하지 못함
+    assert not renew_leader(RUN_ID, first)
+    release_leader(RUN_ID, first)
+    assert has_leader(RUN_ID)
+
+    release_leader(RUN_ID, second)
+    assert not has_leader(RUN_ID)
+
+
+# 테스트: 처리 중에 종료된 워커의 회원 재전달
+def test_redelivery_after_crash(fake_redis):
+    enqueue_members(RUN_ID, [1, 2, 3])
+
+    # 회원 1: 가져간 뒤 워커 종료(ack / 잠금 없음), 회원 2: 다른 워커가 잠금을 잡고 처리 중
+    assert claim_member(RUN_ID) == 1
+    assert claim_member(RUN_ID) == 2
+    assert acquire_member_lock(RUN_ID, 2) is not None
+
+    # 가져간 지 얼마 안 된 회원은 복귀하지 않음
+    assert requeue_stale_members(RUN_ID) == 0
+
+    assert requeue_stale_members(RUN_ID, stale_after=0) == 1
+    assert claim_member(RUN_ID) == 3
+    assert claim_member(RUN_ID) == 1
+
+    for member_id in (1, 2, 3):
+        ack_member(RUN_ID, member_id)
+    assert remaining_count(RUN_ID) == 0
+
+
+# 테스트: 다시 등록해도 처리 중인 전달은 유지, 이미 대기 / 처리 중인 회원은 중복 등록하지 않음
+def test_enqueue_merges_into_existing_queue(fake_redis):
+    enqueue_members(RUN_ID, [1, 2])
+    assert claim_member(RUN_ID) == 1
+
+    enqueue_members(RUN_ID, [1, 2, 3])
+
+    assert fake_redis.lrange(f"analysis_queue:{RUN_ID}:processing", 0, -1) == ["1"]
+    assert fake_redis.hexists(f"analysis_queue:{RUN_ID}:claimed", 1)
+    assert fake_redis.lrange(f"analysis_queue:{RUN_ID}:pending", 0, -1) == ["2", "3"]
+    assert remaining_count(RUN_ID) == 3
+
+
+# 테스트: 중단된 작업 회수는 주기마다 한 워커만 실행
+def test_stale_sweep_runs_once_per_interval(fake_redis):
+    assert try_acquire_sweep(RUN_ID, 60)
+    assert not try_acquire_sweep(RUN_ID, 60)
+
+    expire(fake_redis, f"analysis_queue:{RUN_ID}:sweep")
+    assert try_acquire_sweep(RUN_ID, 60)
+
+
+# 테스트: 회원 잠금 경합 및 토큰 확인
+def test_member_lock_contention(fake_redis):
+    token = acquire_member_lock(RUN_ID, 1)
+    assert token is not None
+    assert acquire_member_lock(RUN_ID, 1) is None
+
+    # 다른 토큰으로는 연장 / 해제 불가
+    assert not renew_member_lock(RUN_ID, 1, "other")
+    release_member_lock(RUN_ID, 1, "other")
+    assert acquire_member_lock(RUN_ID, 1) is None
+
+    assert renew_member_lock(RUN_ID, 1, token)
+    release_member_lock(RUN_ID, 1, token)
+    assert acquire_member_lock(RUN_ID, 1) is not None
+
+
+# 테스트: 다른 워커가 잠금을 잡은 회원은 분석하지 않고 ack
+def test_process_member_skips_locked_member(fake_redis, monkeypatch):
+    analyzed = []
+
+    async def fake_run_member_analysis(member_id, limiter, **kwargs):
+        analyzed.append(member_id)
+
+    monkeypatch.setattr(analysis_worker, "run_member_analysis", fake_run_member_analysis)
+    enqueue_members(RUN_ID, [1])
+    claim_member(RUN_ID)
+    acquire_member_lock(RUN_ID, 1)
+
+    limiter = AdaptiveConcurrencyLimiter(name="test", initial_limit=1, min_limit=1, max_limit=1, latency_target=60)
+    asyncio.run(process_member(RUN_ID, 1, limiter))
+
+    assert analyzed == []
+    assert remaining_count(RUN_ID) == 0
+
+
+# 테스트: 잠금 유지 시간보다 오래 걸리는 분석 중에도 잠금이 연장되어 재전달되지 않음
+def test_member_lock_renewed_during_long_analysis(fake_redis, monkeypatch):
+    monkeypatch.setattr(analysis_queue, "MEMBER_LOCK_TTL", 1)
+    monkeypatch.setattr(analysis_worker, "MEMBER_LOCK_RENEW_INTERVAL", 0.2)
+    requeued = []
+
+    async def slow_run_member_analysis(member_id, limiter, **kwargs):
+        # 잠금 유지 시간(1초)이 지난 뒤 다른 워커가 중단된 작업 회수 시도
+        await asyncio.sleep(1.5)
+        requeued.append(requeue_stale_members(RUN_ID, stale_after=0))
+
+    monkeypatch.setattr(analysis_worker, "run_member_analysis", slow_run_member_analysis)
+    enqueue_members(RUN_ID, [1])
+    claim_member(RUN_ID)
+
+    limiter = AdaptiveConcurrencyLimiter(name="test", initial_limit=1, min_limit=1, max_limit=1, latency_target=60)
+    asyncio.run(process_member(RUN_ID, 1, limiter))
+
+    assert requeued == [0]
+    assert remaining_count(RUN_ID) == 0
+    assert not fake_redis.exists(f"analysis_lock:{RUN_ID}:1")
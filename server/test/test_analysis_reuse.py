@@ -0,0 +1,119 @@
+import os
+import sys
+import pytest
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from apis.food_analysis import compute_analysis_fingerprint, reuse_previous_analysis, build_analysis_record
+from db import crud
+from db.crud import add_analysis_status, save_analysis_results
+from db.models import AnalysisStatus, EatHabits, DietAnalysis, AnalysisFingerprint, LatestAnalysis
+from utils.analysis_job import _meta_key
+from errors.server_exception import AnalysisSaveError
+
+"""
+지난 분석 결과 재사용 테스트(SQLite 메모리 DB, fake_redis 사용)
+
+- 입력값 해시: 부동소수점 집계 오차에는 같고, 입력값 / 체중 예측 / 프롬프트 버전이 바뀌면 다름
+- 해시가 같으면 LLM 호출 없이 이전 결과를 새 분석 상태로 복제하고 완료 처리(절약한 Chain 실행 시간 기록)
+- 해시가 다르면 재사용하지 않음
+- 복제 저장은 단일 트랜잭션: 중간에 실패하면 복제한 결과 / 입력값 해시가 남지 않고 분석 상태도 그대로
+"""
+
+MEMBER_ID = 1
+RUN_ID = "2025-W02"
+USER_DATA = {"gender": 1, "age": 25, "weight": 70.0, "carbohydrate": 250.1, "protein": 80.5}
+FINAL_RESULTS = {
+    "diet_advice": {"carbo_advice": "탄수화물 조언", "protein_advice": "단백질 조언", "fat_advice": "지방 조언"},
+    "diet_summary": "요약",
+    "nutrition_analysis": "영양소 분석",
+    "diet_improvement": "개선점",
+    "custom_recommendation": "맞춤 식단",
+}
+
+
+# 지난주 분석 완료 기록 추가: 분석 상태 PK 반환
+def save_previous_analysis(db, fingerprint):
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    save_analysis_results(db, [build_analysis_record(MEMBER_ID, status_id, FINAL_RESULTS, "감소", 2000.0,
+                                                     fingerprint, chain_seconds=12.5)])
+    return status_id
+
+
+# 테스트: 입력값 해시
+def test_fingerprint_inputs():
+    fingerprint = compute_analysis_fingerprint(USER_DATA, "감소", "v1")
+
+    noisy = {**USER_DATA, "carbohydrate": USER_DATA["carbohydrate"] + 1e-9}
+    assert compute_analysis_fingerprint(noisy, "감소", "v1") == fingerprint
+
+    assert compute_analysis_fingerprint({**USER_DATA, "weight": 71.0}, "감소", "v1") != fingerprint
+    assert compute_analysis_fingerprint(USER_DATA, "증가", "v1") != fingerprint
+    assert compute_analysis_fingerprint(USER_DATA, "감소", "v2") != fingerprint
+
+
+# 테스트: 입력값이 같으면 이전 결과 복제 후 완료 처리
+def test_reuse_when_unchanged(fake_redis, sqlite_db):
+    db = sqlite_db()
+    fingerprint = compute_analysis_fingerprint(USER_DATA, "감소", "v1")
+    previous_status_id = save_previous_analysis(db, fingerprint)
+
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    assert reuse_previous_analysis(db, MEMBER_ID, status_id, fingerprint, run_id=RUN_ID)
+
+    status = db.get(AnalysisStatus, status_id)
+    assert (status.IS_ANALYZED, status.IS_PENDING) == (True, False)
+
+    eat_habits = db.query(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK == status_id).one()
+    assert eat_habits.ADVICE_CARBO == "탄수화물 조언"
+    diet_analysis = db.query(DietAnalysis).filter(DietAnalysis.EAT_HABITS_FK == eat_habits.EAT_HABITS_PK).one()
+    assert diet_analysis.CUSTOM_RECOMMEND == "맞춤 식단"
+
+    reused = db.query(AnalysisFingerprint).filter(AnalysisFingerprint.ANALYSIS_STATUS_FK == status_id).one()
+    assert (reused.FINGERPRINT, reused.IS_REUSED, reused.CHAIN_SECONDS) == (fingerprint, True, 12.5)
+
+    latest = db.get(LatestAnalysis, MEMBER_ID)
+    assert latest.STATUS_FK == status_id != previous_status_id
+    assert float(fake_redis.hget(_meta_key(RUN_ID), "time_saved")) == 12.5
+    db.close()
+
+
+# 테스트: 입력값이 바뀌면 재사용하지 않음
+def test_no_reuse_when_changed(fake_redis, sqlite_db):
+    db = sqlite_db()
+    save_previous_analysis(db, compute_analysis_fingerprint(USER_DATA, "감소", "v1"))
+
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    changed = compute_analysis_fingerprint({**USER_DATA, "weight": 71.0}, "감소", "v1")
+    assert not reuse_previous_analysis(db, MEMBER_ID, status_id, changed, run_id=RUN_ID)
+
+    status = db.get(AnalysisStatus, status_id)
+    assert (status.IS_ANALYZED, status.IS_PENDING) == (False, True)
+    assert db.query(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK == status_id).count() == 0
+    db.close()
+
+
+# 테스트: 복제 저장 중 실패하면 일부만 저장되지 않음(결과 / 입력값 해시 없음, 분석 상태는 진행 중)
+def test_reuse_failure_leaves_no_partial_rows(fake_redis, sqlite_db, monkeypatch):
+    db = sqlite_db()
+    fingerprint = compute_analysis_fingerprint(USER_DATA, "감소", "v1")
+    save_previous_analysis(db, fingerprint)
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+
+    def fail_upsert(db, rows):
+        raise RuntimeError("회원별 최근 분석 갱신 실패")
+
+    monkeypatch.setattr(crud, "upsert_latest_analyses", fail_upsert)
+    with pytest.raises(AnalysisSaveError):
+        reuse_previous_analysis(db, MEMBER_ID, status_id, fingerprint, run_id=RUN_ID)
+
+    db.expire_all()
+    status = db.get(AnalysisStatus, status_id)
+    assert (status.IS_ANALYZED, status.IS_PENDING) == (False, True)
+    assert db.query(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK == status_id).count() == 0
+    assert db.query(AnalysisFingerprint).filter(AnalysisFingerprint.ANALYSIS_STATUS_FK == status_id).count() == 0
+    assert fake_redis.hget(_meta_key(RUN_ID), "time_saved") is None
+    db.close()
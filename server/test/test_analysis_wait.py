@@ -0,0 +1,141 @@
+import os
+import sys
+import asyncio
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from main import app, root_path
+from auth.decoded_token import get_current_member
+from db.database import get_async_db
+from db.crud import add_analysis_status, save_analysis_results
+from apis.food_analysis import build_analysis_record
+
+"""
+식습관 분석 완료 대기(long-poll) 테스트(SQLite 파일 DB(aiosqlite), fake_redis 사용)
+
+- 완료 알림을 받으면 대기 시간 전에 바로 응답
+- 대기 시간이 지나면 분석 중은 진행 상태 오류, 결과가 그대로이면 304
+"""
+
+STATUS_PATH = f"{root_path}/ai/v1/diet_analysis/status"
+WAIT_PATH = f"{root_path}/ai/v1/diet_analysis/status/wait"
+
+MEMBER_ID = 1
+FINAL_RESULTS = {
+    "diet_advice": {"carbo_advice": "탄수화물 조언", "protein_advice": "단백질 조언", "fat_advice": "지방 조언"},
+    "diet_summary": "요약",
+    "nutrition_analysis": "영양소 분석",
+    "diet_improvement": "개선점",
+    "custom_recommendation": "맞춤 식단",
+}
+
+
+# 분석 완료 처리: 분석 상태 추가 후 결과 저장, 분석 상태 PK 반환
+def complete_analysis(session_factory, member_id=MEMBER_ID):
+    db = session_factory()
+    try:
+        status_id = add_analysis_status(db, member_id).STATUS_PK
+        save_analysis_results(db, [build_analysis_record(member_id, status_id, FINAL_RESULTS, "감소", 2000.0,
+                                                         "fingerprint", chain_seconds=1.0)])
+        return status_id
+    finally:
+        db.close()
+
+
+def start_analysis(session_factory, member_id=MEMBER_ID):
+    db = session_factory()
+    try:
+        return add_analysis_status(db, member_id).STATUS_PK
+    finally:
+        db.close()
+
+
+# 동기 Session Factory(분석 작업) + 라우터용 인증 / 비동기 DB Session 대체
+def setup_app(sqlite_db_url, monkeypatch):
+    engine = create_engine(sqlite_db_url, connect_args={"check_same_thread": False})
+    monkeypatch.setitem(app.dependency_overrides, get_current_member, lambda: MEMBER_ID)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# 요청 실행: 같은 이벤트 루프에서 aiosqlite 엔진 / 테스트 client 생성 후 scenario(client) 실행
+def run_requests(sqlite_db_url, monkeypatch, scenario):
+
+    async def run():
+        async_engine = create_async_engine(sqlite_db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+
+        async def get_test_db():
+            db = AsyncSession(bind=async_engine)
+            try:
+                yield db
+            finally:
+                await db.close()
+
+        monkeypatch.setitem(app.dependency_overrides, get_async_db, get_test_db)
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+# 테스트: 완료 대기 중 완료 알림을 받으면 대기 시간 전에 새 분석 결과 응답
+def test_wait_wakes_on_completion(sqlite_db_url, fake_redis, monkeypatch):
+    engine, session_factory = setup_app(sqlite_db_url, monkeypatch)
+    status_id = start_analysis(session_factory)
+
+    async def scenario(client):
+
+        async def complete_later():
+            await asyncio.sleep(0.2)
+            db = session_factory()
+            try:
+                save_analysis_results(db, [build_analysis_record(MEMBER_ID, status_id, FINAL_RESULTS, "감소", 2000.0,
+                                                                 "fingerprint", chain_seconds=1.0)])
+            finally:
+                db.close()
+
+        completion = asyncio.create_task(complete_later())
+        start = asyncio.get_running_loop().time()
+        response = await client.get(WAIT_PATH, params={"timeout": 5})
+        elapsed = asyncio.get_running_loop().time() - start
+        await completion
+        return response, elapsed
+
+    response, elapsed = run_requests(sqlite_db_url, monkeypatch, scenario)
+    engine.dispose()
+
+    assert response.status_code == 200
+    assert "ETag" in response.headers
+    assert elapsed < 2
+
+
+# 테스트: 알림 없이 대기 시간이 지나면 분석 중은 진행 상태 오류, 결과가 그대로이면 304
+def test_wait_times_out(sqlite_db_url, fake_redis, monkeypatch):
+    engine, session_factory = setup_app(sqlite_db_url, monkeypatch)
+    monkeypatch.setattr(settings, "ANALYSIS_WAIT_TIMEOUT", 0.3)
+    complete_analysis(session_factory)
+
+    async def scenario(client):
+        etag = (await client.get(STATUS_PATH)).headers["ETag"]
+        unchanged = await client.get(WAIT_PATH, headers={"If-None-Match": etag})
+
+        await asyncio.to_thread(start_analysis, session_factory)
+        pending = await client.get(WAIT_PATH, params={"timeout": 10})
+        return unchanged, pending
+
+    unchanged, pending = run_requests(sqlite_db_url, monkeypatch, scenario)
+    engine.dispose()
+
+    assert unchanged.status_code == 304
+    assert pending.status_code == 409
@@ -0,0 +1,224 @@
+import os
+import io
+import sys
+import math
+import time
+import asyncio
+import httpx
+from datetime import timedelta
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from main import app, root_path
+from routers import food_image_analysis
+from auth.decoded_token import get_current_member
+from utils import redis_integration
+from db.database import SessionLocal, create_async_session, dispose_async_engine
+from db.crud import get_all_member_id, get_all_member_meals_avg, get_last_week_range
+from db.models import Member, Food, Meal, MealFood
+from apis.food_analysis import build_analysis_input
+
+"""
+부하 테스트: 분석 배치의 DB 조회가 실행되는 동안 같은 이벤트 루프에서 처리되는 이미지 분석 요청 지연시간 측정
+
+- 요청: 같은 이벤트 루프의 앱으로 PROBE_INTERVAL 간격 음식 이미지 분석 요청(모델 / Pinecone 호출 부분만 고정 응답으로 대체)
+- 배치: 지난주 식사 기록이 있는 전체 회원의 분석 입력값 조회(build_analysis_input)를 동시에 실행
+  - sync: 기존 방식(동기 Session, 쿼리마다 이벤트 루프 정지)
+  - async: 비동기 Session + run_sync(쿼리 대기 중 다른 요청 처리)
+- 테스트: SQLite 파일 DB(aiosqlite) / fake_redis로 두 방식 모두 실행, main(): 설정된 MySQL / Redis로 측정
+"""
+
+# 측정 요청 경로 / 간격(초), 요청 회원(실제 회원과 겹치지 않는 번호)
+PROBE_PATH = f"{root_path}/ai/v1/food_image_analysis/image"
+PROBE_INTERVAL = 0.05
+PROBE_MEMBER_ID = 0
+
+# 배치 동시 실행 수 / 반복 횟수
+BATCH_CONCURRENCY = 10
+BATCH_REPEAT = 3
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * ratio) - 1)]
+
+
+def build_probe_image():
+    buffer = io.BytesIO()
+    Image.new("RGB", (256, 256), (200, 120, 40)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+# 이미지 분석 요청 준비: 인증 / 음식 탐지(모델 호출) / 요청 횟수 제한만 대체
+def stub_image_route(monkeypatch):
+
+    async def fake_detect_similar_foods(image_bytes, member_id):
+        return [{"detected_food": "김치찌개", "similar_foods": [{"food_name": "김치찌개", "food_pk": 1}]}]
+
+    monkeypatch.setitem(app.dependency_overrides, get_current_member, lambda: PROBE_MEMBER_ID)
+    monkeypatch.setattr(food_image_analysis, "detect_similar_foods", fake_detect_similar_foods)
+    monkeypatch.setattr(redis_integration, "RATE_LIMIT", 10 ** 9)
+
+
+# 테스트 데이터: 회원 1, 2의 신체 정보와 지난주 식사 기록 추가(회원 3은 식사 기록 없음)
+def seed_meals(session_factory):
+    db = session_factory()
+    start_of_week, _ = get_last_week_range()
+    created_date = start_of_week + timedelta(days=1)
+
+    db.add(Food(
+        FOOD_PK=1, FOOD_NAME="김치찌개", FOOD_SERVING_SIZE=300.0, FOOD_CALORIE=450.0, FOOD_CARBOHYDRATE=30.0,
+        FOOD_PROTEIN=25.0, FOOD_FAT=20.0, FOOD_SUGARS=5.0, FOOD_DIETARY_FIBER=4.0, FOOD_SODIUM=1800.0
+    ))
+    for member_pk in (1, 2):
+        member = db.get(Member, member_pk)
+        member.MEMBER_GENDER, member.MEMBER_AGE, member.MEMBER_HEIGHT = 1, 25 + member_pk, 175.0
+        member.MEMBER_WEIGHT, member.MEMBER_TARGET_WEIGHT, member.MEMBER_ACTIVITY = 70.0, 65.0, "NORMAL_ACTIVE"
+        db.add(Meal(MEAL_PK=member_pk, CREATED_DATE=created_date, UPDATED_DATE=created_date,
+                    MEAL_TYPE="LUNCH", MEMBER_FK=member_pk))
+        db.add(MealFood(MEAL_FOOD_PK=member_pk, CREATED_DATE=created_date, UPDATED_DATE=created_date,
+                        FOOD_FK=1, MEAL_FK=member_pk, MEAL_FOOD_MULTIPLE=1.0))
+    db.commit()
+    db.close()
+
+
+# 분석 대상 회원 / 평균 영양성분: 분석 작업과 같이 지난주 식사 기록이 있는 회원만 대상
+def load_batch_members(session_factory):
+    db = session_factory()
+    try:
+        meals_avg_map = get_all_member_meals_avg(db, get_all_member_id(db))
+    finally:
+        db.close()
+    return list(meals_avg_map), meals_avg_map
+
+
+# 배치 실행 중 요청 지연시간 수집(최소 1회 요청)
+async def probe_latency(client: httpx.AsyncClient, stop_event: asyncio.Event):
+    image_bytes = build_probe_image()
+    latencies = []
+    while True:
+        start = time.perf_counter()
+        response = await client.post(PROBE_PATH, files={"file": ("probe.jpg", image_bytes, "image/jpeg")})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        if stop_event.is_set():
+            return latencies
+        await asyncio.sleep(PROBE_INTERVAL)
+
+
+# 기존 방식: 동기 Session으로 회원별 조회
+async def run_sync_batch(session_factory, member_ids, meals_avg_map):
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_member(member_id):
+        async with semaphore:
+            db = session_factory()
+            try:
+                result = build_analysis_input(db, member_id, meals_avg_map.get(member_id))
+            finally:
+                db.close()
+            await asyncio.sleep(0)
+            return result
+
+    results = []
+    for _ in range(BATCH_REPEAT):
+        results.extend(await asyncio.gather(*[run_member(member_id) for member_id in member_ids]))
+    return results
+
+
+# 비동기 Session: 동기 CRUD를 run_sync로 실행
+async def run_async_batch(session_factory, member_ids, meals_avg_map):
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_member(member_id):
+        async with semaphore:
+            db = session_factory()
+            try:
+                return await db.run_sync(build_analysis_input, member_id, meals_avg_map.get(member_id))
+            finally:
+                await db.close()
+
+    results = []
+    for _ in range(BATCH_REPEAT):
+        results.extend(await asyncio.gather(*[run_member(member_id) for member_id in member_ids]))
+    return results
+
+
+# 배치 실행 중 요청 지연시간 측정: (배치 실행 시간, 요청 지연시간 목록, 배치 결과) 반환
+async def measure(batch=None, session_factory=None, member_ids=None, meals_avg_map=None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        stop_event = asyncio.Event()
+        probe_task = asyncio.create_task(probe_latency(client, stop_event))
+
+        start = time.perf_counter()
+        results = None
+        try:
+            if batch is None:
+                await asyncio.sleep(2)
+            else:
+                results = await batch(session_factory, member_ids, meals_avg_map)
+        finally:
+            stop_event.set()
+            latencies = await probe_task
+        batch_time = time.perf_counter() - start
+
+    return batch_time, latencies, results
+
+
+def print_measurement(name, batch_time, latencies):
+    print(f"[{name}] 배치 {batch_time:.2f}s, 요청 {len(latencies)}건 - p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms")
+
+
+# 테스트: 두 방식 모두 배치 중 이미지 분석 요청이 성공하고, 같은 분석 입력값을 조회
+def test_image_requests_during_batch(sqlite_db_url, fake_redis, monkeypatch):
+    stub_image_route(monkeypatch)
+    engine = create_engine(sqlite_db_url, connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    seed_meals(session_factory)
+    member_ids, meals_avg_map = load_batch_members(session_factory)
+
+    async def run():
+        async_engine = create_async_engine(sqlite_db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            sync_measurement = await measure(run_sync_batch, session_factory, member_ids, meals_avg_map)
+            async_measurement = await measure(run_async_batch, lambda: AsyncSession(bind=async_engine), member_ids, meals_avg_map)
+        finally:
+            await async_engine.dispose()
+        return sync_measurement, async_measurement
+
+    (_, sync_latencies, sync_results), (_, async_latencies, async_results) = asyncio.run(run())
+    engine.dispose()
+
+    assert member_ids == [1, 2]
+    assert sync_latencies and async_latencies
+    assert len(async_results) == len(member_ids) * BATCH_REPEAT
+    assert all(result is not None for result in async_results)
+    assert async_results == sync_results
+
+
+async def main():
+    member_ids, meals_avg_map = load_batch_members(SessionLocal)
+
+    print("\n========== 분석 배치 중 이미지 분석 요청 지연시간(비동기 DB Session) ==========")
+    print(f"회원 수: {len(member_ids)}, 동시 실행: {BATCH_CONCURRENCY}, 반복: {BATCH_REPEAT}")
+    print_measurement("배치 없음", *(await measure())[:2])
+    print_measurement("sync 배치", *(await measure(run_sync_batch, SessionLocal, member_ids, meals_avg_map))[:2])
+    print_measurement("async 배치", *(await measure(run_async_batch, create_async_session, member_ids, meals_avg_map))[:2])
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        stub_image_route(monkeypatch)
+        asyncio.run(main())
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import shutil
+import asyncio
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from templates import prompt_template
+from templates.prompt_template import CHAIN_SPECS, chain_registry, create_chain, create_evaluation_chain, get_chain_prompt_path
+from utils.chain_registry import ChainRegistry
+from apis.food_analysis import create_multi_chain, build_multi_chain, warm_up_chains
+
+# 회원 수(회원당 A/B 실행 기준 Chain 구성 횟수 측정)
+MEMBER_COUNT = 200
+
+
+# 기존 방식: 회원마다 A/B 실행별 Multi-Chain과 평가 Chain을 새로 구성
+async def build_per_member():
+    for _ in range(MEMBER_COUNT):
+        for variant in ["A", "B"]:
+            await build_multi_chain(variant=variant)
+        await create_chain("diet_eval")
+
+
+# 레지스트리: 한 번 구성한 Chain 공유
+async def get_from_registry():
+    for _ in range(MEMBER_COUNT):
+        for variant in ["A", "B"]:
+            await create_multi_chain(variant=variant)
+        await create_evaluation_chain()
+
+
+async def measure(func):
+    start = time.perf_counter()
+    await func()
+    return time.perf_counter() - start
+
+
+# 테스트: 같은 Chain 객체 공유, 프롬프트 파일 변경 시 재생성(임시 디렉토리에 복사한 프롬프트 사용)
+def test_chain_rebuilt_on_prompt_change(tmp_path, fake_redis, monkeypatch):
+    prompt_file = CHAIN_SPECS["diet_eval"]["prompt_file"]
+    shutil.copy(get_chain_prompt_path("diet_eval"), tmp_path / prompt_file)
+    monkeypatch.setattr(settings, "PROMPT_PATH", str(tmp_path))
+    registry = ChainRegistry()
+    monkeypatch.setattr(prompt_template, "chain_registry", registry)
+
+    async def run():
+        chain = await create_evaluation_chain()
+        assert chain is await create_evaluation_chain()
+        assert registry.snapshot() == {"chains": 1, "builds": 1, "hits": 1}
+
+        prompt_path = tmp_path / prompt_file
+        stat = os.stat(prompt_path)
+        os.utime(prompt_path, (stat.st_atime, stat.st_mtime + 1))
+
+        rebuilt = await create_evaluation_chain()
+        assert rebuilt is not chain
+        assert rebuilt is await create_evaluation_chain()
+        assert registry.snapshot() == {"chains": 1, "builds": 2, "hits": 2}
+
+    asyncio.run(run())
+
+
+async def main():
+    chain_registry.clear()
+    start = time.perf_counter()
+    await warm_up_chains()
+    startup_time = time.perf_counter() - start
+
+    legacy_time = await measure(build_per_member)
+    registry_time = await measure(get_from_registry)
+
+    print("\n========== Chain 레지스트리 벤치마크 ==========")
+    print(f"사전 생성(시작 시 1회): {startup_time * 1000:.1f} ms")
+    print(f"회원 {MEMBER_COUNT}명 Chain 구성 - 기존: {legacy_time * 1000:.1f} ms ({legacy_time / MEMBER_COUNT * 1000:.3f} ms/회원), "
+          f"레지스트리: {registry_time * 1000:.1f} ms ({registry_time / MEMBER_COUNT * 1000:.3f} ms/회원)")
+    print(f"레지스트리 상태: {chain_registry.snapshot()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import random
+import pandas as pd
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from utils.cohort_index import CohortIndex
+
+# 테스트 데이터 경로
+CSV_PATH = os.path.join(project_root, "data", "diet_advice.csv")
+
+# 조회 횟수
+LOOKUP_COUNT = 1000
+
+
+# 기존 방식: 매 조회마다 csv 파일을 읽고 전체 행을 필터링
+def legacy_lookup(gender, age, height, weight, physical_activity_index):
+    df = pd.read_csv(CSV_PATH)
+    filtered_df = df[
+        (df['gender'] == gender) &
+        (abs(df['age'] - age) <= 6) &
+        (abs(df['height'] - height) <= 6) &
+        (abs(df['weight'] - weight) <= 6) &
+        (abs(df['physical_activity_index'] - physical_activity_index) <= 1)
+    ]
+    if filtered_df.empty:
+        return None
+    return {
+        'carbo_avg': filtered_df['carbohydrate'].mean(),
+        'protein_avg': filtered_df['protein'].mean(),
+        'fat_avg': filtered_df['fat'].mean(),
+    }
+
+
+# csv 데이터 주변 값으로 조회 조건 생성
+def build_queries(seed=42):
+    random.seed(seed)
+    df = pd.read_csv(CSV_PATH)
+    rows = df.sample(n=LOOKUP_COUNT, replace=True, random_state=seed)
+    return [
+        (int(row.gender), row.age + random.randint(-3, 3), row.height + random.uniform(-4, 4),
+         row.weight + random.uniform(-4, 4), row.physical_activity_index)
+        for row in rows.itertuples()
+    ]
+
+
+# 테스트: 인덱스 조회 결과가 기존 필터링 결과와 동일한지 확인
+def test_cohort_index_matches_legacy_filter():
+    index = CohortIndex(CSV_PATH)
+    for query in build_queries()[:200]:
+        expected = legacy_lookup(*query)
+        result = index.lookup(*query)
+        if expected is None:
+            assert result is None
+        else:
+            for key, value in expected.items():
+                assert abs(result[key] - value) < 1e-9
+
+
+# 벤치마크: 조회 1건당 지연시간 비교
+def main():
+    queries = build_queries()
+
+    print("\n========== 코호트 평균 조회 마이크로벤치마크 ==========")
+    print(f"조회 횟수: {len(queries)}")
+
+    start = time.perf_counter()
+    for query in queries:
+        legacy_lookup(*query)
+    legacy_time = (time.perf_counter() - start) / len(queries)
+
+    index = CohortIndex(CSV_PATH)
+    # 최초 적재 시간은 별도 측정
+    start = time.perf_counter()
+    index.lookup(*queries[0])
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup(*query)
+    index_time = (time.perf_counter() - start) / len(queries)
+
+    print(f"기존 방식(read_csv + 전체 필터링): {legacy_time * 1e6:.1f} us/조회")
+    print(f"코호트 인덱스 최초 적재: {load_time * 1e3:.2f} ms")
+    print(f"코호트 인덱스 조회: {index_time * 1e6:.1f} us/조회")
+    print(f"속도 향상: {legacy_time / max(index_time, 1e-12):.1f}배")
+
+
+if __name__ == "__main__":
+    main()
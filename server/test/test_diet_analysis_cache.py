@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import asyncio
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from main import app, root_path
+from auth.decoded_token import get_current_member
+from db.database import get_async_db
+from db.crud import add_analysis_status, save_analysis_results
+from apis.food_analysis import build_analysis_record
+from utils.analysis_cache import _cache_key
+from utils.analysis_job import PENDING_MEMBERS_KEY
+
+"""
+식습관 분석 응답 캐시 / 조건부 요청 테스트(SQLite 파일 DB(aiosqlite), fake_redis 사용)
+
+- 분석 시작 시 응답 캐시 삭제 및 분석 대기 회원 집합에 추가, 완료 시 집합에서 제거 후 응답 캐시 저장
+- If-None-Match가 ETag와 같으면 304(캐시 적중 / 미적중 모두)
+- 분석 대기 중인 회원은 남아 있는 응답 캐시 대신 진행 상태 응답
+"""
+
+DIET_PATH = f"{root_path}/ai/v1/diet_analysis/diet"
+STATUS_PATH = f"{root_path}/ai/v1/diet_analysis/status"
+
+MEMBER_ID = 1
+FINAL_RESULTS = {
+    "diet_advice": {"carbo_advice": "탄수화물 조언", "protein_advice": "단백질 조언", "fat_advice": "지방 조언"},
+    "diet_summary": "요약",
+    "nutrition_analysis": "영양소 분석",
+    "diet_improvement": "개선점",
+    "custom_recommendation": "맞춤 식단",
+}
+
+
+# 분석 완료 처리: 분석 상태 추가 후 결과 저장, 분석 상태 PK 반환
+def complete_analysis(session_factory, member_id=MEMBER_ID):
+    db = session_factory()
+    try:
+        status_id = add_analysis_status(db, member_id).STATUS_PK
+        save_analysis_results(db, [build_analysis_record(member_id, status_id, FINAL_RESULTS, "감소", 2000.0,
+                                                         "fingerprint", chain_seconds=1.0)])
+        return status_id
+    finally:
+        db.close()
+
+
+def start_analysis(session_factory, member_id=MEMBER_ID):
+    db = session_factory()
+    try:
+        return add_analysis_status(db, member_id).STATUS_PK
+    finally:
+        db.close()
+
+
+# 동기 Session Factory(분석 작업) + 라우터용 인증 / 비동기 DB Session 대체
+def setup_app(sqlite_db_url, monkeypatch):
+    engine = create_engine(sqlite_db_url, connect_args={"check_same_thread": False})
+    monkeypatch.setitem(app.dependency_overrides, get_current_member, lambda: MEMBER_ID)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# 요청 실행: 같은 이벤트 루프에서 aiosqlite 엔진 / 테스트 client 생성 후 scenario(client) 실행
+def run_requests(sqlite_db_url, monkeypatch, scenario):
+
+    async def run():
+        async_engine = create_async_engine(sqlite_db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+
+        async def get_test_db():
+            db = AsyncSession(bind=async_engine)
+            try:
+                yield db
+            finally:
+                await db.close()
+
+        monkeypatch.setitem(app.dependency_overrides, get_async_db, get_test_db)
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+# 테스트: 분석 시작 시 캐시 삭제 / 대기 회원 추가, 완료 시 대기 회원 제거 / 캐시 저장
+def test_cache_and_pending_set_follow_analysis(sqlite_db, fake_redis):
+    status_id = complete_analysis(sqlite_db)
+    cached = json.loads(fake_redis.get(_cache_key(MEMBER_ID)))
+    assert cached["status_id"] == status_id
+    assert cached["response"]["custom_recommendation"] == "맞춤 식단"
+    assert not fake_redis.sismember(PENDING_MEMBERS_KEY, MEMBER_ID)
+
+    start_analysis(sqlite_db)
+    assert fake_redis.get(_cache_key(MEMBER_ID)) is None
+    assert fake_redis.sismember(PENDING_MEMBERS_KEY, MEMBER_ID)
+
+    next_status_id = complete_analysis(sqlite_db)
+    assert json.loads(fake_redis.get(_cache_key(MEMBER_ID)))["status_id"] == next_status_id
+    assert not fake_redis.sismember(PENDING_MEMBERS_KEY, MEMBER_ID)
+
+
+# 테스트: 같은 ETag는 304(캐시 적중 / DB 조회 모두), 캐시 미적중 시 DB에서 응답 후 캐시 저장
+def test_if_none_match_returns_304(sqlite_db_url, fake_redis, monkeypatch):
+    engine, session_factory = setup_app(sqlite_db_url, monkeypatch)
+    complete_analysis(session_factory)
+
+    async def scenario(client):
+        cached = await client.get(DIET_PATH)
+        etag = cached.headers["ETag"]
+
+        fake_redis.delete(_cache_key(MEMBER_ID))
+        from_db = await client.get(DIET_PATH)
+        return cached, from_db, [
+            await client.get(path, headers={"If-None-Match": etag}) for path in (DIET_PATH, STATUS_PATH)
+        ]
+
+    cached, from_db, conditional = run_requests(sqlite_db_url, monkeypatch, scenario)
+    engine.dispose()
+
+    assert cached.status_code == from_db.status_code == 200
+    assert cached.json()["response"] == from_db.json()["response"]
+    assert cached.headers["ETag"] == from_db.headers["ETag"]
+    assert fake_redis.get(_cache_key(MEMBER_ID)) is not None
+    assert [response.status_code for response in conditional] == [304, 304]
+    assert all(response.content == b"" for response in conditional)
+
+
+# 테스트: 분석 대기 중에는 남아 있는 응답 캐시(삭제 직후 다시 저장된 이전 응답)를 사용하지 않음
+def test_pending_member_bypasses_cache(sqlite_db_url, fake_redis, monkeypatch):
+    engine, session_factory = setup_app(sqlite_db_url, monkeypatch)
+    complete_analysis(session_factory)
+    stale_entry = fake_redis.get(_cache_key(MEMBER_ID))
+
+    start_analysis(session_factory)
+    fake_redis.set(_cache_key(MEMBER_ID), stale_entry)
+
+    async def scenario(client):
+        return await client.get(STATUS_PATH), await client.get(DIET_PATH)
+
+    responses = run_requests(sqlite_db_url, monkeypatch, scenario)
+    engine.dispose()
+
+    assert [response.status_code for response in responses] == [409, 409]
+    assert all(response.json()["error"]["code"] == "DIET_409_1" for response in responses)
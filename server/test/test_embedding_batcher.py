@@ -0,0 +1,118 @@
+import os
+import sys
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from apis import food_image
+from utils.embedding_batcher import EmbeddingBatcher
+from errors.server_exception import ExternalAPIError
+
+"""
+임베딩 묶음 처리 테스트(임베딩 API 대신 지연시간을 흉내 낸 함수 사용)
+
+- 동시에 들어온 요청(각 요청은 음식명 여러 개)은 묶음 크기 이내에서 호출 1회로 처리
+- 같은 음식명은 한 번만 임베딩하고 결과 공유
+- 호출 실패는 해당 묶음의 모든 요청에 전달
+- 벡터 수가 텍스트 수와 다르면 묶음 전체 실패(임베딩 API 응답도 같은 확인)
+"""
+
+REQUESTS = [
+    ["김치찌개", "공기밥"],
+    ["된장찌개", "공기밥", "계란말이"],
+    ["제육볶음"],
+    ["김치찌개", "배추김치"],
+]
+
+# 흉내 낸 임베딩 호출 지연시간(초)
+EMBEDDING_LATENCY = 0.05
+
+
+# drop: 마지막 벡터를 빼고 반환(벡터 수 불일치)
+def make_fake_embed(calls, fail=False, drop=False):
+    async def fake_embed(texts):
+        calls.append(list(texts))
+        await asyncio.sleep(EMBEDDING_LATENCY)
+        if fail:
+            raise RuntimeError("임베딩 호출 실패")
+        vectors = [[float(len(text)), float(ord(text[0]))] for text in texts]
+        return vectors[:-1] if drop else vectors
+    return fake_embed
+
+
+async def run_requests(batch_size, fail=False, drop=False):
+    calls = []
+    batcher = EmbeddingBatcher(make_fake_embed(calls, fail, drop), batch_size=batch_size, flush_interval=0.005)
+    results = await asyncio.gather(*[batcher.embed_many(texts) for texts in REQUESTS], return_exceptions=True)
+    await batcher.close()
+    return results, calls, batcher.snapshot()
+
+
+# 테스트: 동시 요청을 호출 1회로 묶고 같은 음식명은 한 번만 임베딩
+def test_micro_batching():
+    results, calls, snapshot = asyncio.run(run_requests(batch_size=64))
+
+    unique_names = {name for texts in REQUESTS for name in texts}
+    assert len(calls) == 1 and sorted(calls[0]) == sorted(unique_names)
+    for texts, vectors in zip(REQUESTS, results):
+        assert vectors == [[float(len(text)), float(ord(text[0]))] for text in texts]
+    assert snapshot["calls"] == 1 and snapshot["texts"] == len(unique_names)
+
+
+# 테스트: 묶음 크기를 넘으면 나누어 호출
+def test_batch_size_limit():
+    results, calls, _ = asyncio.run(run_requests(batch_size=2))
+
+    assert all(len(texts) <= 2 for texts in calls)
+    assert all(not isinstance(result, Exception) for result in results)
+
+
+# 테스트: 호출 실패는 묶음의 모든 요청에 전달
+def test_batch_failure():
+    results, calls, snapshot = asyncio.run(run_requests(batch_size=64, fail=True))
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert snapshot["failures"] == 1
+
+
+# 테스트: 벡터 수가 다르면 묶음의 모든 요청 실패(다른 음식명의 벡터를 전달하지 않음)
+def test_vector_count_mismatch():
+    results, calls, snapshot = asyncio.run(run_requests(batch_size=64, drop=True))
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert snapshot["failures"] == 1 and snapshot["texts"] == 0
+
+
+# 테스트: 임베딩 API 응답의 벡터 수가 다르면 외부 API 오류
+def test_embedding_response_count_mismatch(monkeypatch):
+    async def fake_create(input, model):
+        return SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[0.1, 0.2])])
+
+    async def fake_acquire_llm_quota(model, tokens):
+        return None
+
+    monkeypatch.setattr(food_image, "acquire_llm_quota", fake_acquire_llm_quota)
+    monkeypatch.setattr(food_image, "upstage", SimpleNamespace(embeddings=SimpleNamespace(create=fake_create)))
+
+    assert asyncio.run(food_image.get_embeddings(["김치찌개"])) == [[0.1, 0.2]]
+    with pytest.raises(ExternalAPIError):
+        asyncio.run(food_image.get_embeddings(["김치찌개", "공기밥"]))
+
+
+def main():
+    print("\n========== 임베딩 묶음 처리 ==========")
+    print(f"요청 수: {len(REQUESTS)}, 음식명 수: {sum(len(texts) for texts in REQUESTS)}")
+    for batch_size in (1, 2, 64):
+        _, calls, snapshot = asyncio.run(run_requests(batch_size=batch_size))
+        print(f"묶음 크기 {batch_size}: 임베딩 호출 {len(calls)}회, {snapshot}")
+
+
+if __name__ == "__main__":
+    main()
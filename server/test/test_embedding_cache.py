@@ -0,0 +1,102 @@
+import os
+import sys
+import asyncio
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+import pytest
+from cachetools import LRUCache
+from core.config import settings
+from core.config_redis import redis_client
+from apis import food_image
+from apis.food_image import get_food_embeddings, warm_up_embedding_cache
+from utils import embedding_cache
+from utils.embedding_cache import EMBEDDING_CACHE_KEY_PREFIX
+
+"""
+음식명 임베딩 캐시 테스트(임베딩 API 대신 호출 횟수를 세는 함수 사용, 테스트는 fake_redis 사용)
+
+- 처음 조회는 임베딩 호출 1회, 이후 같은 음식명은 프로세스 내 LRU → Redis 순으로 적중(호출 없음)
+- 공백 / 유니코드 표기가 다른 같은 음식명은 같은 키
+- 서버 시작 시 자주 탐지된 음식명을 미리 채우면 첫 요청도 호출 없음
+"""
+
+TEST_MODEL = "test-embedding"
+REQUEST_NAMES = ["김치찌개", "공기밥", " 김치찌개 "]
+
+
+# 임베딩 호출 대체 및 빈 프로세스 내 LRU 사용: 반환값은 호출별 텍스트 목록
+def stub_embeddings(monkeypatch):
+    embedding_calls = []
+
+    async def fake_get_embeddings(texts, model="embedding-query"):
+        embedding_calls.append(list(texts))
+        return [[float(len(text)), 0.5, -1.25] for text in texts]
+
+    monkeypatch.setattr(food_image, "get_embeddings", fake_get_embeddings)
+    monkeypatch.setattr(embedding_cache, "_local_cache", LRUCache(maxsize=settings.EMBEDDING_CACHE_LOCAL_SIZE))
+    return embedding_calls
+
+
+@pytest.fixture
+def embedding_calls(fake_redis, monkeypatch):
+    return stub_embeddings(monkeypatch)
+
+
+# 테스트 모델의 벡터만 삭제(Redis 벡터 만료 / 프로세스 재시작 후 탐지 횟수만 남은 상황)
+def clear_vectors(client):
+    embedding_cache._local_cache.clear()
+    for key in client.scan_iter(f"{EMBEDDING_CACHE_KEY_PREFIX}:{TEST_MODEL}:*"):
+        client.delete(key)
+
+
+def lookup(names):
+    return asyncio.run(get_food_embeddings(names, model=TEST_MODEL))
+
+
+# 테스트: 미적중 시 호출 1회, 이후 프로세스 내 LRU / Redis 적중
+def test_two_tier_cache(embedding_calls):
+    vectors = lookup(REQUEST_NAMES)
+    assert embedding_calls == [["김치찌개", "공기밥"]]
+    assert vectors[0] == vectors[2] == [4.0, 0.5, -1.25]
+
+    # 프로세스 내 LRU 적중
+    assert lookup(REQUEST_NAMES) == vectors
+    assert len(embedding_calls) == 1
+
+    # 다른 서버(프로세스 내 LRU 비어 있음): Redis 적중
+    embedding_cache._local_cache.clear()
+    assert lookup(REQUEST_NAMES) == vectors
+    assert len(embedding_calls) == 1
+
+
+# 테스트: 자주 탐지된 음식명으로 캐시를 채우면 첫 요청도 호출 없음
+def test_warm_up(embedding_calls, fake_redis):
+    lookup(REQUEST_NAMES)
+
+    clear_vectors(fake_redis)
+    embedding_calls.clear()
+    asyncio.run(warm_up_embedding_cache(model=TEST_MODEL))
+    assert embedding_calls == [["김치찌개", "공기밥"]]
+
+    embedding_calls.clear()
+    lookup(["공기밥"])
+    assert embedding_calls == []
+
+
+# 설정된 Redis로 실행: 테스트 모델의 벡터 키만 사용 후 삭제
+def main():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        embedding_calls = stub_embeddings(monkeypatch)
+        clear_vectors(redis_client)
+        for attempt in range(1, 4):
+            lookup(REQUEST_NAMES)
+            print(f"요청 {attempt}: 누적 임베딩 호출 {len(embedding_calls)}회")
+        clear_vectors(redis_client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+import sys
+import asyncio
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from apis import food_analysis
+from apis.food_analysis import AB_MODE_HEDGED, run_sequential_ab, run_hedged_ab, run_multi_chain
+from utils.ab_metrics import get_ab_stats
+
+"""
+Hedged A/B 테스트(후보 실행 대신 지연시간을 흉내 낸 함수 사용)
+
+- A가 지연되면 B를 함께 실행하고, B가 먼저 통과하면 B 채택 후 A 취소(순차 실행은 A, B 모두 끝까지 실행)
+- A가 지연 시간 안에 통과하면 B를 실행하지 않음
+- Fallback 모델(Claude) 실행도 토큰 사용량을 집계하고 Fallback 실행으로 기록(fake_redis 사용)
+"""
+
+# 후보별 지연시간(초)과 평가 점수: A는 느리고 임계값 미달, B는 임계값 통과
+CANDIDATE_LATENCY = {"A": 0.4, "B": 0.2}
+CANDIDATE_SCORES = {"A": (2.0, 0.9), "B": (4.5, 0.9)}
+
+USER_DATA = {"carbo_avg": 280.0, "protein_avg": 70.0, "fat_avg": 55.0}
+
+
+class CandidateRecorder:
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.completed = []
+        self.cancelled = []
+
+    # 지연시간을 흉내 낸 후보 실행: 완료 / 취소된 후보 기록, 모델이 주어지면 1회 호출
+    async def pipeline(self, user_data, llm_override=None, variant=None, pipeline=None):
+        try:
+            await asyncio.sleep(CANDIDATE_LATENCY[variant])
+        except asyncio.CancelledError:
+            self.cancelled.append(variant)
+            raise
+        if llm_override is not None:
+            await llm_override.ainvoke("식습관 분석")
+        self.completed.append(variant)
+        return {"variant": variant}
+
+
+class FakeEvaluationChain:
+
+    def __init__(self, scores):
+        self.scores = scores
+
+    async def ainvoke(self, inputs):
+        relevance, faithfulness = self.scores[inputs["variant"]]
+        return {"relevance": relevance, "faithfulness": faithfulness}
+
+
+# 테스트마다 새 후보 기록 사용, A 실패 예측은 사용하지 않음
+@pytest.fixture
+def candidates(monkeypatch):
+    recorder = CandidateRecorder(dict(CANDIDATE_SCORES))
+    monkeypatch.setattr(food_analysis, "run_analysis_pipeline", recorder.pipeline)
+    monkeypatch.setattr(settings, "ANALYSIS_HEDGE_DELAY", 0.1)
+    monkeypatch.setattr(settings, "ANALYSIS_HEDGE_FAILURE_RATE", 1.1)
+    return recorder
+
+
+def run_ab(runner, recorder):
+    return asyncio.run(runner(USER_DATA, FakeEvaluationChain(recorder.scores)))
+
+
+# 테스트: 순차 실행은 A, B 모두 끝까지 실행한 뒤 B 채택
+def test_sequential_runs_both(candidates):
+    result, count = run_ab(run_sequential_ab, candidates)
+
+    assert result["variant"] == "B" and count == 2
+    assert candidates.completed == ["A", "B"]
+    assert candidates.cancelled == []
+
+
+# 테스트: A 지연 시 B를 함께 실행, B가 먼저 통과하여 채택 후 A 취소
+def test_hedged_cancels_slow_candidate(candidates):
+    result, count = run_ab(run_hedged_ab, candidates)
+
+    assert result["variant"] == "B" and count == 2
+    assert candidates.completed == ["B"]
+    assert candidates.cancelled == ["A"]
+
+
+# 테스트: A가 지연 시간 안에 통과하면 B를 실행하지 않음
+def test_hedged_skips_b_when_a_passes(candidates, monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_HEDGE_DELAY", 1.0)
+    candidates.scores["A"] = (4.0, 0.8)
+
+    result, count = run_ab(run_hedged_ab, candidates)
+
+    assert result["variant"] == "A" and count == 1
+    assert candidates.completed == ["A"]
+    assert candidates.cancelled == []
+
+
+# 테스트: Fallback 모델 실행의 토큰 사용량 집계 및 Fallback 실행 기록
+def test_fallback_run_tokens_recorded(candidates, fake_redis, monkeypatch):
+    async def fake_evaluation_chain(llm_override=None, variant=None):
+        return FakeEvaluationChain(candidates.scores)
+
+    monkeypatch.setattr(food_analysis, "create_evaluation_chain", fake_evaluation_chain)
+    responses = iter([AIMessage(content="분석", usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120})
+                      for _ in range(2)])
+    fallback_llm = GenericFakeChatModel(messages=responses)
+
+    result = asyncio.run(run_multi_chain(USER_DATA, llm_override=fallback_llm, ab_mode=AB_MODE_HEDGED))
+
+    assert result["variant"] == "B"
+    stats = get_ab_stats()[AB_MODE_HEDGED]
+    assert stats["tokens_per_member"] == 120
+    assert stats["fallback_members"] == 1
+
+
+def main():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        recorder = CandidateRecorder(dict(CANDIDATE_SCORES))
+        monkeypatch.setattr(food_analysis, "run_analysis_pipeline", recorder.pipeline)
+        monkeypatch.setattr(settings, "ANALYSIS_HEDGE_DELAY", 0.1)
+        monkeypatch.setattr(settings, "ANALYSIS_HEDGE_FAILURE_RATE", 1.1)
+
+        for name, runner in [("순차 A/B", run_sequential_ab), ("Hedged A/B", run_hedged_ab)]:
+            recorder.completed.clear()
+            recorder.cancelled.clear()
+            result, count = run_ab(runner, recorder)
+            print(f"{name}: 채택 {result['variant']}, 실행 후보 {count}개, 완료 {recorder.completed}, 취소 {recorder.cancelled}")
+
+
+if __name__ == "__main__":
+    main()
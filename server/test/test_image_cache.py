@@ -0,0 +1,149 @@
+import os
+import io
+import sys
+import asyncio
+from types import SimpleNamespace
+from PIL import Image
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from utils import image_cache
+from utils.image_cache import (compute_sha256, compute_dhash, hamming_distance, _band_keys, get_cached_image_result,
+                               set_cached_image_result, HIT_NEAR, IMAGE_CACHE_DHASH_PREFIX)
+
+"""
+음식 이미지 결과 캐시 테스트(해시 비교, 구간 후보 저장 / 조회는 fake_redis 사용)
+
+- 같은 이미지를 다른 품질 / 크기로 다시 저장하면 SHA-256은 다르지만 dHash 거리는 IMAGE_CACHE_MAX_DISTANCE 이하
+- 다른 이미지는 dHash 거리가 충분히 멂
+- 거리 기준 이하인 해시는 적어도 한 구간 키가 같음(구간 후보 조회로 찾을 수 있음)
+- 구간 후보는 만료 시각 이후 조회되지 않고 다음 저장 시 삭제, 결과가 사라진 후보는 조회 시 삭제
+"""
+
+FOOD_INFO = [{"detected_food": "김치찌개", "similar_foods": [{"food_name": "김치찌개", "food_pk": 1}]}]
+
+
+# 가로 / 세로 그라데이션이 섞인 테스트 이미지
+def make_image(width=640, height=480, reverse=False):
+    image = Image.new("RGB", (width, height))
+    pixels = image.load()
+    for x in range(width):
+        for y in range(height):
+            value = (x * 255 // width + y * 128 // height) % 256
+            pixels[x, y] = (255 - value if reverse else value, y * 255 // height, 128)
+    return image
+
+
+def encode_jpeg(image, quality):
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def collect_distances():
+    original = encode_jpeg(make_image(), 90)
+    recompressed = encode_jpeg(make_image(), 60)
+    resized = encode_jpeg(make_image().resize((320, 240)), 75)
+    other = encode_jpeg(make_image(reverse=True), 90)
+
+    original_hash = compute_dhash(original)
+    return {
+        "sha256_differs": compute_sha256(original) != compute_sha256(recompressed),
+        "recompressed": (original_hash, compute_dhash(recompressed)),
+        "resized": (original_hash, compute_dhash(resized)),
+        "other": (original_hash, compute_dhash(other)),
+    }
+
+
+# 테스트: 재압축 / 크기 변경은 유사 적중, 다른 이미지는 미적중
+def test_near_duplicate_distance():
+    distances = collect_distances()
+    assert distances["sha256_differs"]
+
+    for name in ("recompressed", "resized"):
+        left, right = distances[name]
+        assert hamming_distance(left, right) <= settings.IMAGE_CACHE_MAX_DISTANCE
+        assert set(_band_keys(left)) & set(_band_keys(right))
+
+    left, right = distances["other"]
+    assert hamming_distance(left, right) > settings.IMAGE_CACHE_MAX_DISTANCE
+
+
+# 테스트: 이미지가 아니면 dHash 없음(정확히 같은 파일만 캐시)
+def test_invalid_image_has_no_dhash():
+    assert compute_dhash(b"not an image") is None
+
+
+# 테스트 이미지 해시와 1bit 다른 해시(첫 구간만 다름)
+def near_hashes():
+    original = compute_dhash(encode_jpeg(make_image(), 90))
+    return original, f"{int(original, 16) ^ 1:016x}"
+
+
+# 구간 후보 만료 시각 기준 시간 고정(Redis 보관 기간은 실제 시간 사용)
+def freeze_time(monkeypatch, now):
+    monkeypatch.setattr(image_cache, "time", SimpleNamespace(time=lambda: now[0]))
+
+
+# 이미지 결과 저장 / 조회: 조회 sha256은 저장한 값과 다름(유사 적중만 확인)
+def store(dhash, sha256="original"):
+    asyncio.run(set_cached_image_result(sha256, dhash, FOOD_INFO, 1.5))
+
+
+def lookup(dhash):
+    return asyncio.run(get_cached_image_result("lookup", dhash))
+
+
+# 테스트: 구간 후보는 만료 시각을 점수로 저장, 유사 이미지 적중
+def test_band_candidates_scored_by_expiry(fake_redis, monkeypatch):
+    freeze_time(monkeypatch, [1000.0])
+    original, near = near_hashes()
+    store(original)
+
+    for band_key in _band_keys(original):
+        assert fake_redis.zscore(band_key, original) == 1000.0 + settings.IMAGE_CACHE_TTL
+    assert lookup(near) == (HIT_NEAR, {"food_info": FOOD_INFO, "seconds": 1.5})
+
+
+# 테스트: 만료 시각이 지난 후보는 조회하지 않고, 같은 구간에 저장할 때 삭제
+def test_expired_candidates_pruned(fake_redis, monkeypatch):
+    now = [1000.0]
+    freeze_time(monkeypatch, now)
+    original, near = near_hashes()
+    store(original)
+
+    now[0] += settings.IMAGE_CACHE_TTL + 1
+    assert lookup(near) == (None, None)
+
+    store(near, sha256="near")
+    shared_bands = set(_band_keys(original)) & set(_band_keys(near))
+    assert shared_bands
+    for band_key in shared_bands:
+        assert fake_redis.zrange(band_key, 0, -1) == [near]
+
+
+# 테스트: 결과가 사라진 후보는 조회 시 모든 구간에서 삭제
+def test_missing_result_removed_from_bands(fake_redis):
+    original, near = near_hashes()
+    store(original)
+    fake_redis.delete(f"{IMAGE_CACHE_DHASH_PREFIX}:{original}")
+
+    assert lookup(near) == (None, None)
+    for band_key in _band_keys(original):
+        assert fake_redis.zscore(band_key, original) is None
+
+
+def main():
+    distances = collect_distances()
+    print("\n========== 음식 이미지 캐시 키 ==========")
+    for name in ("recompressed", "resized", "other"):
+        left, right = distances[name]
+        print(f"{name}: {left} / {right}, 해밍 거리: {hamming_distance(left, right)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+import io
+import sys
+import time
+import base64
+from PIL import Image, ExifTags
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from utils.image_preprocess import preprocess_image
+
+"""
+이미지 전처리 벤치마크: 외부 이미지 API로 보내는 용량 / 전처리 지연시간 비교
+
+- 합성 표본: 휴대폰 사진(EXIF 회전), PNG 사진, 투명 배경 PNG, 이미 작은 JPEG
+- 전처리 결과는 긴 변 IMAGE_MAX_EDGE 이하, IMAGE_MAX_BYTES 이하의 JPEG
+- 이미 작은 JPEG는 원본 그대로 사용
+"""
+
+# EXIF 회전 정보: 시계 방향 90도 회전해서 보여야 하는 사진
+ORIENTATION_ROTATE_90 = 6
+
+
+# 사진과 비슷한 합성 이미지: 그라데이션 + 잡음
+def make_photo(width, height, mode="RGB"):
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 24)
+    image = Image.merge("RGB", (gradient, Image.blend(gradient, noise, 0.3), noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    if mode == "RGBA":
+        image.putalpha(gradient)
+    return image
+
+
+def encode(image, image_format, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **params)
+    return buffer.getvalue()
+
+
+# 표본: (이름, 원본 바이트, 화면에 보이는 크기)
+def build_samples():
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = ORIENTATION_ROTATE_90
+    return [
+        ("phone_jpeg_exif", encode(make_photo(4032, 3024), "JPEG", quality=95, exif=exif), (3024, 4032)),
+        ("photo_png", encode(make_photo(3000, 2000), "PNG"), (3000, 2000)),
+        ("transparent_png", encode(make_photo(1200, 1200, mode="RGBA"), "PNG"), (1200, 1200)),
+        ("small_jpeg", encode(make_photo(800, 600), "JPEG", quality=80), (800, 600)),
+    ]
+
+
+def run_benchmark():
+    results = []
+    for name, original, display_size in build_samples():
+        # 전처리 전: 원본 Base64 인코딩, 전처리 후: 전처리 + Base64 인코딩
+        start_time = time.perf_counter()
+        before_payload = base64.b64encode(original)
+        before_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        processed = preprocess_image(original)
+        after_payload = base64.b64encode(processed)
+        after_seconds = time.perf_counter() - start_time
+
+        with Image.open(io.BytesIO(processed)) as image:
+            results.append({
+                "name": name, "before_bytes": len(original), "after_bytes": len(processed),
+                "before_payload": len(before_payload), "after_payload": len(after_payload),
+                "before_seconds": before_seconds, "after_seconds": after_seconds, "format": image.format, "size": image.size,
+                "display_size": display_size, "unchanged": processed is original
+            })
+    return results
+
+
+# 테스트: 크기 / 용량 제한, 회전 적용, 작은 JPEG 원본 유지
+def test_preprocess_limits():
+    for result in run_benchmark():
+        width, height = result["size"]
+        display_width, display_height = result["display_size"]
+
+        assert result["format"] == "JPEG"
+        assert max(width, height) <= settings.IMAGE_MAX_EDGE
+        assert result["after_bytes"] <= settings.IMAGE_MAX_BYTES
+        # 가로 / 세로 방향 유지(EXIF 회전 적용)
+        assert (width >= height) == (display_width >= display_height)
+
+        if result["name"] == "small_jpeg":
+            assert result["unchanged"]
+        else:
+            assert result["after_bytes"] < result["before_bytes"]
+
+
+def main():
+    results = run_benchmark()
+
+    print("\n========== 이미지 전처리 ==========")
+    print(f"긴 변 최대: {settings.IMAGE_MAX_EDGE}px, JPEG 품질: {settings.IMAGE_JPEG_QUALITY}, 최대 용량: {settings.IMAGE_MAX_BYTES} bytes")
+    for result in results:
+        print(f"{result['name']}: {result['before_bytes']} → {result['after_bytes']} bytes "
+              f"({result['after_bytes'] / result['before_bytes']:.1%}), Base64 {result['before_payload']} → {result['after_payload']}, "
+              f"{result['size']}, {result['before_seconds'] * 1000:.1f} → {result['after_seconds'] * 1000:.1f} ms")
+
+    def total(field):
+        return sum(result[field] for result in results)
+
+    print(f"전체: {total('before_bytes')} → {total('after_bytes')} bytes "
+          f"({total('after_bytes') / total('before_bytes'):.1%}), "
+          f"Base64 {total('before_payload')} → {total('after_payload')}, "
+          f"{total('before_seconds') * 1000:.1f} → {total('after_seconds') * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import sys
+import asyncio
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from apis.food_analysis import build_analysis_record, apply_previous_analysis
+from db.crud import add_analysis_status, update_analysis_status, save_analysis_results, backfill_latest_analyses
+from db.async_crud import get_latest_analysis, get_latest_analysis_state, get_analysis_status
+from db.models import AnalysisStatus, EatHabits, AnalysisFingerprint, LatestAnalysis
+from errors.business_exception import UserDataError, AnalysisInProgress, AnalysisNotCompleted
+from errors.server_exception import AnalysisSaveError
+
+"""
+회원별 최근 분석(LATEST_ANALYSIS_TB) 테스트(SQLite DB, fake_redis 사용)
+
+- 분석 완료 시 분석 결과로 회원별 최근 분석 갱신, 분석 결과 값이 부족하면 분석 상태를 바꾸기 전에 실패
+- 기존 분석 기록으로 회원별 최근 분석 채우기(최근 완료된 분석 / 진행 중 여부)
+- 조회 시 회원별 최근 분석이 없으면(채우기 전 기존 회원) 분석 기록으로 채운 뒤 응답, 분석 기록도 없으면 분석 상태 미존재
+- 식습관 분석 결과가 없는 이전 분석은 재사용하지 않음
+- 분석 상태 조회는 가장 최신 분석 상태 기준
+"""
+
+MEMBER_ID = 1
+FINAL_RESULTS = {
+    "diet_advice": {"carbo_advice": "탄수화물 조언", "protein_advice": "단백질 조언", "fat_advice": "지방 조언"},
+    "diet_summary": "요약",
+    "nutrition_analysis": "영양소 분석",
+    "diet_improvement": "개선점",
+    "custom_recommendation": "맞춤 식단",
+}
+
+
+def build_record(member_id, status_id):
+    return build_analysis_record(member_id, status_id, FINAL_RESULTS, "감소", 2000.0, "fingerprint", chain_seconds=1.0)
+
+
+# 분석 완료 기록 추가: 분석 상태 PK 반환
+def save_completed_analysis(db, member_id=MEMBER_ID):
+    status_id = add_analysis_status(db, member_id).STATUS_PK
+    save_analysis_results(db, [build_record(member_id, status_id)])
+    return status_id
+
+
+# 회원별 최근 분석 삭제(채우기 전 기존 회원 상태)
+def clear_latest_analyses(db):
+    db.execute(delete(LatestAnalysis))
+    db.commit()
+    db.expire_all()
+
+
+# 테스트: 분석 완료 시 회원별 최근 분석 갱신
+def test_completion_upserts_latest_analysis(sqlite_db, fake_redis):
+    db = sqlite_db()
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    latest = db.get(LatestAnalysis, MEMBER_ID)
+    assert (latest.IS_PENDING, latest.STATUS_FK) == (True, None)
+
+    update_analysis_status(db, status_id, result=build_record(MEMBER_ID, status_id))
+    db.expire_all()
+
+    latest = db.get(LatestAnalysis, MEMBER_ID)
+    status = db.get(AnalysisStatus, status_id)
+    assert (latest.IS_PENDING, latest.STATUS_FK, latest.ANALYSIS_DATE) == (False, status_id, status.ANALYSIS_DATE)
+    assert (latest.ADVICE_CARBO, latest.NUTRIENT_ANALYSIS, latest.CUSTOM_RECOMMEND) == ("탄수화물 조언", "영양소 분석", "맞춤 식단")
+    db.close()
+
+
+# 테스트: 분석 결과 값이 부족하면 분석 상태를 바꾸지 않고 실패
+def test_incomplete_result_rejected(sqlite_db, fake_redis):
+    db = sqlite_db()
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    result = build_record(MEMBER_ID, status_id)
+    del result["custom_recommend"]
+
+    with pytest.raises(AnalysisSaveError):
+        update_analysis_status(db, status_id, result=result)
+
+    db.expire_all()
+    status = db.get(AnalysisStatus, status_id)
+    assert (status.IS_ANALYZED, status.IS_PENDING) == (False, True)
+    db.close()
+
+
+# 테스트: 식습관 분석 결과가 없는 이전 분석은 복제하지 않음(새 분석 상태는 그대로 진행 중)
+def test_incomplete_previous_analysis_not_reused(sqlite_db, fake_redis):
+    db = sqlite_db()
+    previous_status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    db.add(EatHabits(ANALYSIS_STATUS_FK=previous_status_id, WEIGHT_PREDICTION="감소", ADVICE_CARBO="탄수화물 조언",
+                     ADVICE_PROTEIN="단백질 조언", ADVICE_FAT="지방 조언", SUMMARIZED_ADVICE="요약", AVG_CALORIE=2000.0))
+    previous = AnalysisFingerprint(ANALYSIS_STATUS_FK=previous_status_id, MEMBER_FK=MEMBER_ID, FINGERPRINT="fingerprint",
+                                   CHAIN_SECONDS=1.0, IS_REUSED=False)
+    db.commit()
+
+    status_id = add_analysis_status(db, MEMBER_ID).STATUS_PK
+    assert not apply_previous_analysis(db, MEMBER_ID, status_id, previous)
+
+    db.expire_all()
+    assert db.query(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK == status_id).count() == 0
+    assert db.get(AnalysisStatus, status_id).IS_PENDING
+    db.close()
+
+
+# 테스트: 기존 분석 기록으로 채우기(최근 완료된 분석 결과, 진행 중 여부, 분석 기록이 없는 회원 제외)
+def test_backfill_from_history(sqlite_db, fake_redis):
+    db = sqlite_db()
+    save_completed_analysis(db, 1)
+    completed_status_id = save_completed_analysis(db, 1)
+    pending_status_id = save_completed_analysis(db, 2)
+    add_analysis_status(db, 2)
+    clear_latest_analyses(db)
+
+    assert backfill_latest_analyses(db, [1, 2, 3]) == 2
+
+    first, second = db.get(LatestAnalysis, 1), db.get(LatestAnalysis, 2)
+    assert (first.IS_PENDING, first.STATUS_FK, first.CUSTOM_RECOMMEND) == (False, completed_status_id, "맞춤 식단")
+    assert (second.IS_PENDING, second.STATUS_FK) == (True, pending_status_id)
+    assert db.get(LatestAnalysis, 3) is None
+    db.close()
+
+
+# 테스트: 조회 시 회원별 최근 분석이 없으면 분석 기록으로 채운 뒤 응답
+def test_lookup_backfills_missing_row(sqlite_db_url, fake_redis):
+    engine = create_engine(sqlite_db_url, connect_args={"check_same_thread": False})
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    status_id = save_completed_analysis(db)
+    clear_latest_analyses(db)
+
+    async def run():
+        async_engine = create_async_engine(sqlite_db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with AsyncSession(bind=async_engine) as async_db:
+                state = await get_latest_analysis_state(async_db, MEMBER_ID)
+            async with AsyncSession(bind=async_engine) as async_db:
+                latest = await get_latest_analysis(async_db, MEMBER_ID)
+            async with AsyncSession(bind=async_engine) as async_db:
+                with pytest.raises(UserDataError):
+                    await get_latest_analysis(async_db, 3)
+        finally:
+            await async_engine.dispose()
+        return state, latest
+
+    state, latest = asyncio.run(run())
+
+    assert state.STATUS_FK == latest.STATUS_FK == status_id
+    assert latest.CUSTOM_RECOMMEND == "맞춤 식단"
+    db.expire_all()
+    assert db.get(LatestAnalysis, MEMBER_ID) is not None
+    db.close()
+    engine.dispose()
+
+
+# 테스트: 분석 상태 조회는 가장 최신 분석 상태 기준(이전 완료 분석이 있어도 새 분석이 진행 중이면 진행 상태 오류)
+def test_analysis_status_uses_newest_row(sqlite_db_url, fake_redis):
+    engine = create_engine(sqlite_db_url, connect_args={"check_same_thread": False})
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    save_completed_analysis(db)
+    add_analysis_status(db, MEMBER_ID)
+    db.close()
+    engine.dispose()
+
+    async def run():
+        async_engine = create_async_engine(sqlite_db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with AsyncSession(bind=async_engine) as async_db:
+                with pytest.raises((AnalysisInProgress, AnalysisNotCompleted)):
+                    await get_analysis_status(async_db, MEMBER_ID)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run())
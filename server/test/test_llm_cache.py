@@ -0,0 +1,89 @@
+import os
+import sys
+import asyncio
+from types import SimpleNamespace
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from utils.llm_cache import with_llm_cache, get_llm_cache_stats, CACHE_KEY_PREFIX
+
+"""
+LLM 결과 캐시 테스트(모델 호출 대신 호출 횟수를 세는 Chain, fake_redis 사용)
+
+- 같은 프롬프트 / 모델 / 입력값은 두 번째부터 모델 호출 없이 저장된 결과 반환
+- 입력값 / 변형(variant)이 다르면 다른 키, 프롬프트에 쓰이지 않는 입력값은 키에 영향 없음
+- 최대 개수를 넘으면 오래된 결과부터 제거, 비활성화 시 Chain 그대로 사용
+"""
+
+PROMPT = PromptTemplate.from_template("{meal} 식단의 영양소를 분석하세요.")
+MODEL = SimpleNamespace(model_name="test-model")
+
+
+def make_chain(calls):
+
+    async def invoke(inputs):
+        calls.append(inputs["meal"])
+        return {"analysis": f"{inputs['meal']} 분석 결과"}
+
+    return RunnableLambda(invoke)
+
+
+def invoke_all(chain, inputs_list):
+
+    async def run():
+        return [await chain.ainvoke(inputs) for inputs in inputs_list]
+
+    return asyncio.run(run())
+
+
+# 테스트: 두 번째 같은 입력은 캐시 적중(모델 호출 없음)
+def test_cache_hit_skips_model(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    calls = []
+    chain = with_llm_cache(make_chain(calls), "diet", PROMPT, MODEL)
+
+    results = invoke_all(chain, [{"meal": "비빔밥"}, {"meal": "비빔밥", "member_id": 1}, {"meal": "김밥"}])
+    assert calls == ["비빔밥", "김밥"]
+    assert results[0] == results[1] == {"analysis": "비빔밥 분석 결과"}
+
+    stats = get_llm_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert stats["chains"]["diet"]["hit_ratio"] == round(1 / 3, 4)
+
+
+# 테스트: 변형(variant)이 다르면 같은 입력도 다시 호출
+def test_variant_separates_keys(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    calls = []
+    chain_a = with_llm_cache(make_chain(calls), "diet", PROMPT, MODEL, variant="a")
+    chain_b = with_llm_cache(make_chain(calls), "diet", PROMPT, MODEL, variant="b")
+
+    invoke_all(chain_a, [{"meal": "비빔밥"}])
+    invoke_all(chain_b, [{"meal": "비빔밥"}])
+    assert calls == ["비빔밥", "비빔밥"]
+
+
+# 테스트: 최대 개수를 넘으면 오래된 결과부터 제거
+def test_eviction_over_max_entries(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_CACHE_MAX_ENTRIES", 2)
+    calls = []
+    chain = with_llm_cache(make_chain(calls), "diet", PROMPT, MODEL)
+
+    invoke_all(chain, [{"meal": "비빔밥"}, {"meal": "김밥"}, {"meal": "라면"}, {"meal": "비빔밥"}])
+    assert calls == ["비빔밥", "김밥", "라면", "비빔밥"]
+    assert len(fake_redis.keys(f"{CACHE_KEY_PREFIX}:*")) == 2
+    assert get_llm_cache_stats()["evictions"] == 2
+
+
+# 테스트: 비활성화 시 캐시를 거치지 않음
+def test_disabled_returns_chain(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    chain = make_chain([])
+    assert with_llm_cache(chain, "diet", PROMPT, MODEL) is chain
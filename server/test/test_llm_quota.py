@@ -0,0 +1,84 @@
+import os
+import sys
+import asyncio
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from utils import redis_integration
+from utils.redis_integration import GCRA_SCRIPT, acquire_llm_quota
+
+"""
+외부 LLM 호출 한도(GCRA) 테스트(fake_redis 사용)
+
+- 분당 한도 이내는 바로 허용, 넘으면 허용될 때까지 필요한 시간(ms) 반환
+- 한 버킷이라도 초과하면 어떤 버킷도 차감하지 않음
+- acquire_llm_quota: 초과 시 반환된 시간만큼 대기 후 재시도, 한도가 없는 모델 / Redis 장애 시 바로 진행
+"""
+
+TEST_MODEL = "test-model"
+KEYS = [f"llm_rate:{TEST_MODEL}:rpm", f"llm_rate:{TEST_MODEL}:tpm"]
+
+
+# 요청 1회 / 토큰 tokens개 차감 시도(rpm 2회, tpm 1000개)
+def gcra(client, tokens, rpm=2, tpm=1000):
+    return client.eval(GCRA_SCRIPT, len(KEYS), *KEYS, rpm, 60000, 1, tpm, 60000, tokens)
+
+
+# 테스트: 분당 요청 수 한도
+def test_gcra_request_limit(fake_redis):
+    assert gcra(fake_redis, 10) == 0
+    assert gcra(fake_redis, 10) == 0
+
+    # 세 번째 요청은 첫 요청분이 회복될 때까지(약 30초) 대기
+    wait_ms = gcra(fake_redis, 10)
+    assert 29000 < wait_ms <= 30000
+
+
+# 테스트: 토큰 한도를 넘으면 요청 수 버킷도 차감하지 않음
+def test_gcra_all_or_nothing(fake_redis):
+    assert gcra(fake_redis, 900, rpm=10) == 0
+    rpm_tat = fake_redis.get(KEYS[0])
+
+    assert gcra(fake_redis, 200, rpm=10) > 0
+    assert fake_redis.get(KEYS[0]) == rpm_tat
+
+    # 남은 토큰 이내 요청은 허용
+    assert gcra(fake_redis, 100, rpm=10) == 0
+
+
+# 테스트: 한도 초과 시 반환된 시간만큼 대기 후 재시도
+def test_acquire_waits_until_allowed(fake_redis, monkeypatch):
+    monkeypatch.setattr(redis_integration, "LLM_RATE_LIMITS", {TEST_MODEL: {"rpm": 1, "tpm": 1000}})
+    waits = []
+
+    # 대기 대신 대기 시간 기록 후 한도 회복 흉내
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+        fake_redis.delete(*KEYS)
+
+    monkeypatch.setattr(redis_integration.asyncio, "sleep", fake_sleep)
+
+    async def run():
+        await acquire_llm_quota(TEST_MODEL, tokens=10)
+        await acquire_llm_quota(TEST_MODEL, tokens=10)
+
+    asyncio.run(run())
+    assert len(waits) == 1
+    assert 59 < waits[0] <= 60
+    assert fake_redis.exists(*KEYS) == 2
+
+
+# 테스트: 한도가 없는 모델 / Redis 장애 시 대기 없이 진행
+def test_acquire_without_limit_or_redis(fake_redis, monkeypatch):
+    asyncio.run(acquire_llm_quota("unknown-model", tokens=10))
+    assert fake_redis.keys("llm_rate:*") == []
+
+    def broken_client():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis_integration, "LLM_RATE_LIMITS", {TEST_MODEL: {"rpm": 1, "tpm": 1000}})
+    monkeypatch.setattr(redis_integration, "get_async_redis_client", broken_client)
+    asyncio.run(asyncio.wait_for(acquire_llm_quota(TEST_MODEL, tokens=10), timeout=1))
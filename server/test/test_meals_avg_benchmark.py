@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import random
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from db.models import Base, Agreement, Member, Food, Meal, MealFood
+from db.crud import get_member_meals_avg, get_all_member_meals_avg, get_last_week_range
+from errors.server_exception import QueryError
+
+# 합성 데이터 규모
+MEMBER_COUNT = 500
+FOOD_COUNT = 300
+MEALS_PER_MEMBER = 14
+FOODS_PER_MEAL = 3
+
+# 합성 데이터셋 생성(SQLite 메모리 DB)
+def build_synthetic_session(seed=42):
+    random.seed(seed)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    now = datetime.now()
+    start_of_week, _ = get_last_week_range()
+
+    db.add(Agreement(
+        AGREEMENT_PK=1, CREATED_DATE=now, UPDATED_DATE=now,
+        AGREEMENT_IS_PRIVACY_POLICY_AGREE=True, AGREEMENT_IS_TERMS_SERVICE_AGREE=True,
+        AGREEMENT_IS_OVER_AGE=True, AGREEMENT_IS_SENSITIVE_DATA_AGREE=True
+    ))
+
+    for food_pk in range(1, FOOD_COUNT + 1):
+        db.add(Food(
+            FOOD_PK=food_pk, FOOD_NAME=f"food-{food_pk}",
+            FOOD_SERVING_SIZE=random.uniform(50, 300), FOOD_CALORIE=random.uniform(50, 800),
+            FOOD_CARBOHYDRATE=random.uniform(0, 100), FOOD_PROTEIN=random.uniform(0, 50),
+            FOOD_FAT=random.uniform(0, 40), FOOD_SUGARS=random.uniform(0, 30),
+            FOOD_DIETARY_FIBER=random.uniform(0, 10), FOOD_SODIUM=random.uniform(0, 2000)
+        ))
+
+    meal_pk, meal_food_pk = 1, 1
+    for member_pk in range(1, MEMBER_COUNT + 1):
+        db.add(Member(
+            MEMBER_PK=member_pk, CREATED_DATE=now, UPDATED_DATE=now,
+            MEMBER_EMAIL=f"member{member_pk}@eatceed.com", MEMBER_PASSWORD="-", AGREEMENT_FK=1
+        ))
+        for _ in range(MEALS_PER_MEMBER):
+            created_date = start_of_week + timedelta(minutes=random.randint(0, 7 * 24 * 60 - 1))
+            db.add(Meal(MEAL_PK=meal_pk, CREATED_DATE=created_date, UPDATED_DATE=created_date,
+                        MEAL_TYPE="LUNCH", MEMBER_FK=member_pk))
+            for _ in range(FOODS_PER_MEAL):
+                # 인분 / 그램 / 미입력(기본값 1) 단위를 섞어서 생성
+                unit = random.choice(["multiple", "g", None])
+                db.add(MealFood(
+                    MEAL_FOOD_PK=meal_food_pk, CREATED_DATE=created_date, UPDATED_DATE=created_date,
+                    FOOD_FK=random.randint(1, FOOD_COUNT), MEAL_FK=meal_pk,
+                    MEAL_FOOD_MULTIPLE=random.choice([0.5, 1.0, 1.5, 2.0]) if unit == "multiple" else None,
+                    MEAL_FOOD_G=random.randint(50, 400) if unit == "g" else None
+                ))
+                meal_food_pk += 1
+            meal_pk += 1
+
+    db.commit()
+    return db
+
+
+# 테스트: 일괄 집계 결과가 회원별 집계 결과와 동일한지 확인
+def test_bulk_meals_avg_matches_per_member():
+    db = build_synthetic_session()
+    try:
+        bulk_result = get_all_member_meals_avg(db)
+        assert len(bulk_result) == MEMBER_COUNT
+
+        for member_id in random.sample(range(1, MEMBER_COUNT + 1), 50):
+            per_member = get_member_meals_avg(db, member_id)
+            for key, value in per_member.items():
+                assert abs(bulk_result[member_id][key] - value) < 1e-6
+    finally:
+        db.close()
+
+
+# 테스트: 회원별 조회에서 예외가 발생하는 회원(음식이 없는 식사 / 음식 정보가 없는 기록)은 일괄 집계에서 제외
+def test_bulk_meals_avg_excludes_invalid_records():
+    db = build_synthetic_session()
+    try:
+        created_date = get_last_week_range()[0] + timedelta(days=1)
+        db.add(Meal(MEAL_PK=100001, CREATED_DATE=created_date, UPDATED_DATE=created_date, MEAL_TYPE="DINNER", MEMBER_FK=1))
+        db.add(MealFood(MEAL_FOOD_PK=100001, CREATED_DATE=created_date, UPDATED_DATE=created_date,
+                        FOOD_FK=None, MEAL_FK=MEALS_PER_MEMBER + 1, MEAL_FOOD_MULTIPLE=1.0))
+        db.commit()
+
+        bulk_result = get_all_member_meals_avg(db)
+        assert 1 not in bulk_result and 2 not in bulk_result
+        assert len(bulk_result) == MEMBER_COUNT - 2
+
+        for member_id in (1, 2):
+            with pytest.raises(QueryError):
+                get_member_meals_avg(db, member_id)
+    finally:
+        db.close()
+
+
+# 벤치마크: 회원별(N+1+M) 조회 vs 단일 GROUP BY 집계
+def main():
+    db = build_synthetic_session()
+
+    print("\n========== 주간 영양성분 평균 집계 벤치마크 ==========")
+    print(f"회원 수: {MEMBER_COUNT}, 회원별 식사 수: {MEALS_PER_MEMBER}, 식사별 음식 수: {FOODS_PER_MEAL}")
+
+    start = time.time()
+    per_member_result = {member_id: get_member_meals_avg(db, member_id) for member_id in range(1, MEMBER_COUNT + 1)}
+    per_member_time = round(time.time() - start, 4)
+
+    start = time.time()
+    bulk_result = get_all_member_meals_avg(db)
+    bulk_time = round(time.time() - start, 4)
+
+    # 결과 일치 여부 확인
+    mismatches = sum(
+        1 for member_id, avg in per_member_result.items()
+        if any(abs(bulk_result[member_id][key] - value) > 1e-6 for key, value in avg.items())
+    )
+
+    print(f"회원별 조회(get_member_meals_avg): {per_member_time} sec")
+    print(f"일괄 집계(get_all_member_meals_avg): {bulk_time} sec")
+    print(f"속도 향상: {per_member_time / max(bulk_time, 1e-9):.1f}배, 불일치 회원 수: {mismatches}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
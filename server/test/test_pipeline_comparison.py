@@ -0,0 +1,175 @@
+import os
+import sys
+import math
+import time
+import random
+import json
+import asyncio
+import pytest
+from langchain_community.callbacks import get_openai_callback
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from apis.food_analysis import PIPELINE_CHAINED, PIPELINE_FUSED, run_combined_chain, build_analysis_record
+from templates.prompt_template import FusedDietAnalysis
+
+# 합성 코호트 규모
+COHORT_SIZE = 10
+
+"""
+분석 파이프라인 비교: 같은 합성 코호트로 chained / fused 파이프라인 실행
+
+- 테스트: 응답을 흉내 낸 모델로 두 파이프라인 실행, fused 결과가 chained 결과와 같은 형식인지 확인(fake_redis 사용)
+- main(): 실제 OpenAI API 호출로 두 파이프라인 비교
+- 지연시간: 회원별 run_combined_chain 실행 시간(평균, p95)
+- 토큰: get_openai_callback 기준 회원당 입력 / 출력 토큰, 호출 수
+- 품질: diet_eval 평가 점수(relevance, faithfulness) 평균 및 임계값 통과율
+"""
+
+# 고정된 합성 코호트 생성
+def build_synthetic_cohort(seed=7):
+    random.seed(seed)
+    cohort = []
+    for _ in range(COHORT_SIZE):
+        gender = random.choice([1, 2])
+        weight = round(random.uniform(45, 90), 1)
+        carbohydrate = round(random.uniform(150, 350), 1)
+        protein = round(random.uniform(40, 120), 1)
+        fat = round(random.uniform(30, 90), 1)
+        cohort.append({
+            "gender": gender,
+            "age": random.randint(20, 60),
+            "height": round(random.uniform(155, 185), 1),
+            "weight": weight,
+            "target_weight": round(weight + random.uniform(2, 8), 1),
+            "physical_activity_index": random.choice([1.2, 1.3, 1.5, 1.7]),
+            "etc": random.choice(["없음", "유당불내증", "채식 위주 식단"]),
+            "carbohydrate": carbohydrate,
+            "protein": protein,
+            "fat": fat,
+            "calorie": round(carbohydrate * 4 + protein * 4 + fat * 9, 1),
+            "sodium": round(random.uniform(1500, 4000), 1),
+            "dietary_fiber": round(random.uniform(10, 30), 1),
+            "sugars": round(random.uniform(20, 80), 1),
+            "tdee": round(random.uniform(1800, 2800), 1),
+            "carbo_avg": round(random.uniform(250, 320), 1),
+            "protein_avg": round(random.uniform(60, 90), 1),
+            "fat_avg": round(random.uniform(45, 70), 1)
+        })
+    return cohort
+
+
+def p95(values):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)]
+
+
+# 테스트용 모델: 프롬프트에 요구된 출력 형식에 맞춰 고정된 응답 반환(API 호출 없음)
+ADVICE_RESPONSE = {"carbo_advice": "탄수화물 조언", "protein_advice": "단백질 조언", "fat_advice": "지방 조언"}
+EVAL_RESPONSE = {"relevance": 4.5, "faithfulness": 0.9}
+FUSED_RESPONSE = {
+    "nutrition_analysis": "영양소 분석", "diet_improvement": "개선점", "custom_recommendation": "맞춤 식단",
+    "diet_summary": "요약", "diet_advice": ADVICE_RESPONSE
+}
+
+
+class FakeAnalysisModel(BaseChatModel):
+    model_name: str = "fake-analysis-model"
+
+    @property
+    def _llm_type(self):
+        return "fake-analysis"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        if "relevance, faithfulness" in prompt:
+            content = json.dumps(EVAL_RESPONSE)
+        elif "carbo_advice, protein_advice, fat_advice" in prompt:
+            content = json.dumps(ADVICE_RESPONSE, ensure_ascii=False)
+        else:
+            content = "분석 결과"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    # 구조화된 출력: 모델이 생성한 JSON을 스키마 객체로 변환
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(lambda prompt_value: schema.model_validate(FUSED_RESPONSE))
+
+
+# 테스트: fused 결과가 chained 결과와 같은 키 / 형식이며 같은 저장 값으로 변환
+def test_fused_matches_chained_schema(fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    member_input = build_synthetic_cohort()[0]
+    model = FakeAnalysisModel()
+
+    async def run():
+        chained = await run_combined_chain(member_input, llm_override=model, pipeline=PIPELINE_CHAINED)
+        fused = await run_combined_chain(member_input, llm_override=model, pipeline=PIPELINE_FUSED)
+        return chained, fused
+
+    chained, fused = asyncio.run(run())
+
+    assert set(fused) == set(chained)
+    assert set(fused["diet_advice"]) == set(chained["diet_advice"]) == set(ADVICE_RESPONSE)
+    assert fused["evaluation"] == chained["evaluation"] == EVAL_RESPONSE
+    for result in (chained, fused):
+        FusedDietAnalysis.model_validate(result)
+        record = build_analysis_record(1, 1, result, "감소", 2000.0, "-", 1.0)
+        assert record["advice_carbo"] == "탄수화물 조언"
+
+
+# 파이프라인 실행 및 회원별 지표 수집
+async def run_pipeline(pipeline, cohort):
+    records = []
+    for member_input in cohort:
+        with get_openai_callback() as cb:
+            start = time.time()
+            result = await run_combined_chain(member_input, pipeline=pipeline)
+            latency = time.time() - start
+
+        records.append({
+            "latency": latency,
+            "prompt_tokens": cb.prompt_tokens,
+            "completion_tokens": cb.completion_tokens,
+            "requests": cb.successful_requests,
+            "relevance": result["evaluation"]["relevance"],
+            "faithfulness": result["evaluation"]["faithfulness"]
+        })
+    return records
+
+
+def print_summary(pipeline, records):
+    count = len(records)
+    passed = sum(1 for r in records if r["relevance"] >= 3.0 and r["faithfulness"] >= 0.6)
+    print(f"\n[{pipeline}]")
+    print(f"지연시간: 평균 {sum(r['latency'] for r in records) / count:.2f}s, p95 {p95([r['latency'] for r in records]):.2f}s")
+    print(f"토큰(회원당): 입력 {sum(r['prompt_tokens'] for r in records) / count:.0f}, "
+          f"출력 {sum(r['completion_tokens'] for r in records) / count:.0f}, "
+          f"호출 수 {sum(r['requests'] for r in records) / count:.1f}")
+    print(f"평가 점수: Relevance {sum(r['relevance'] for r in records) / count:.2f}, "
+          f"Faithfulness {sum(r['faithfulness'] for r in records) / count:.2f}, 임계값 통과율 {passed / count:.0%}")
+
+
+async def main():
+    cohort = build_synthetic_cohort()
+
+    print("\n========== 분석 파이프라인 비교(chained vs fused) ==========")
+    print(f"합성 코호트: {COHORT_SIZE}명")
+
+    for pipeline in [PIPELINE_CHAINED, PIPELINE_FUSED]:
+        records = await run_pipeline(pipeline, cohort)
+        print_summary(pipeline, records)
+
+
+if __name__ == "__main__":
+    # 결과 캐시를 사용하지 않고 실제 호출 비용 비교
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+        asyncio.run(main())
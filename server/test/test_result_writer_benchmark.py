@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime
+from sqlalchemy import create_engine, event, BigInteger
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from db.models import Base, Agreement, Member, AnalysisStatus, EatHabits, DietAnalysis, AnalysisFingerprint
+from db.crud import (add_analysis_status, create_eat_habits, create_diet_analysis, create_analysis_fingerprint,
+                     update_analysis_status, save_analysis_results)
+from utils import result_writer
+from utils.result_writer import AnalysisResultWriter
+
+# 합성 회원 수
+MEMBER_COUNT = 200
+
+
+# SQLite는 BIGINT 기본키 자동 증가를 지원하지 않으므로 INTEGER로 생성
+@compiles(BigInteger, "sqlite")
+def compile_big_integer(type_, compiler, **kw):
+    return "INTEGER"
+
+
+# 합성 데이터셋: 회원과 대기 중인 분석 상태(SQLite 메모리 DB, 쓰레드 간 공유)
+def build_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    now = datetime.now()
+    db.add(Agreement(
+        AGREEMENT_PK=1, CREATED_DATE=now, UPDATED_DATE=now,
+        AGREEMENT_IS_PRIVACY_POLICY_AGREE=True, AGREEMENT_IS_TERMS_SERVICE_AGREE=True,
+        AGREEMENT_IS_OVER_AGE=True, AGREEMENT_IS_SENSITIVE_DATA_AGREE=True
+    ))
+    for member_pk in range(1, MEMBER_COUNT + 1):
+        db.add(Member(
+            MEMBER_PK=member_pk, CREATED_DATE=now, UPDATED_DATE=now,
+            MEMBER_EMAIL=f"member{member_pk}@eatceed.com", MEMBER_PASSWORD="-", AGREEMENT_FK=1
+        ))
+    db.commit()
+    db.close()
+    return engine, session_factory
+
+
+# 쿼리 실행 횟수 측정(executemany는 1회)
+def count_statements(engine):
+    counter = {"statements": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    return counter
+
+
+def build_record(member_id, status_id):
+    return {
+        "status_id": status_id, "member_id": member_id, "weight_prediction": "감소",
+        "advice_carbo": "c", "advice_protein": "p", "advice_fat": "f", "summarized_advice": "요약",
+        "avg_calorie": 2000.0, "nutrient_analysis": "분석", "diet_improve": "개선점",
+        "custom_recommend": "식단", "fingerprint": "-", "chain_seconds": 1.0
+    }
+
+
+# 기존 방식: 회원마다 식습관 조언 / 분석 결과 / 입력값 해시 / 분석 상태를 각각 commit
+def legacy_save(db, record):
+    eat_habits = create_eat_habits(db, record["weight_prediction"], record["advice_carbo"], record["advice_protein"],
+                                   record["advice_fat"], record["summarized_advice"], record["status_id"], record["avg_calorie"])
+    create_diet_analysis(db, eat_habits.EAT_HABITS_PK, record["nutrient_analysis"], record["diet_improve"], record["custom_recommend"])
+    create_analysis_fingerprint(db, record["status_id"], record["member_id"], record["fingerprint"], record["chain_seconds"])
+    update_analysis_status(db, record["status_id"])
+
+
+def create_statuses(session_factory):
+    db = session_factory()
+    try:
+        return {member_id: add_analysis_status(db, member_id).STATUS_PK for member_id in range(1, MEMBER_COUNT + 1)}
+    finally:
+        db.close()
+
+
+def assert_saved(session_factory, status_ids):
+    db = session_factory()
+    try:
+        assert db.query(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK.in_(status_ids)).count() == len(status_ids)
+        assert db.query(DietAnalysis).join(EatHabits).filter(EatHabits.ANALYSIS_STATUS_FK.in_(status_ids)).count() == len(status_ids)
+        assert db.query(AnalysisFingerprint).filter(AnalysisFingerprint.ANALYSIS_STATUS_FK.in_(status_ids)).count() == len(status_ids)
+        assert db.query(AnalysisStatus).filter(AnalysisStatus.STATUS_PK.in_(status_ids),
+                                               AnalysisStatus.IS_ANALYZED == True, AnalysisStatus.IS_PENDING == False).count() == len(status_ids)
+    finally:
+        db.close()
+
+
+def run_legacy(engine, session_factory):
+    status_ids = create_statuses(session_factory)
+    counter = count_statements(engine)
+    db = session_factory()
+    start = time.time()
+    for member_id, status_id in status_ids.items():
+        legacy_save(db, build_record(member_id, status_id))
+    elapsed = time.time() - start
+    db.close()
+    assert_saved(session_factory, list(status_ids.values()))
+    return elapsed, counter["statements"]
+
+
+# 결과 저장 버퍼: 회원별 분석이 동시에 결과를 넘기고 저장 완료까지 대기
+def run_writer(engine, session_factory):
+    status_ids = create_statuses(session_factory)
+    counter = count_statements(engine)
+    result_writer.SessionLocal = session_factory
+    writer = AnalysisResultWriter(batch_size=50, flush_interval=0.05)
+
+    async def write_all():
+        await asyncio.gather(*[writer.write(build_record(member_id, status_id)) for member_id, status_id in status_ids.items()])
+        await writer.close()
+
+    start = time.time()
+    asyncio.run(write_all())
+    elapsed = time.time() - start
+    assert_saved(session_factory, list(status_ids.values()))
+    return elapsed, counter["statements"], writer.snapshot()
+
+
+# 테스트: 일괄 저장 중 한 회원의 저장이 실패하면 해당 회원만 실패 처리
+def test_writer_isolates_failed_record():
+    engine, session_factory = build_session_factory()
+    status_ids = create_statuses(session_factory)
+    result_writer.SessionLocal = session_factory
+    writer = AnalysisResultWriter(batch_size=len(status_ids), flush_interval=1)
+
+    records = [build_record(member_id, status_id) for member_id, status_id in status_ids.items()]
+    del records[0]["nutrient_analysis"]
+
+    async def write_all():
+        results = await asyncio.gather(*[writer.write(record) for record in records], return_exceptions=True)
+        await writer.close()
+        return results
+
+    results = asyncio.run(write_all())
+    assert isinstance(results[0], Exception)
+    assert all(result is True for result in results[1:])
+    assert_saved(session_factory, [record["status_id"] for record in records[1:]])
+    assert writer.snapshot()["failures"] == 1
+
+
+def test_bulk_save_round_trips():
+    engine, session_factory = build_session_factory()
+    status_ids = create_statuses(session_factory)
+    counter = count_statements(engine)
+
+    db = session_factory()
+    try:
+        save_analysis_results(db, [build_record(member_id, status_id) for member_id, status_id in status_ids.items()])
+    finally:
+        db.close()
+
+    # INSERT 3회 + SELECT 1회 + UPDATE 1회 + 회원별 최근 분석 SELECT 1회 / INSERT 1회(회원 수와 무관)
+    assert counter["statements"] == 7
+    assert_saved(session_factory, list(status_ids.values()))
+
+
+def main():
+    test_bulk_save_round_trips()
+    test_writer_isolates_failed_record()
+
+    legacy_time, legacy_statements = run_legacy(*build_session_factory())
+    writer_time, writer_statements, writer_stats = run_writer(*build_session_factory())
+
+    print("\n========== 분석 결과 저장 벤치마크 ==========")
+    print(f"회원 수: {MEMBER_COUNT}")
+    print(f"기존 방식(회원별 commit): {legacy_time:.3f}s, 쿼리 {legacy_statements}회({legacy_statements / MEMBER_COUNT:.2f}회/회원)")
+    print(f"결과 저장 버퍼(일괄 저장): {writer_time:.3f}s, 쿼리 {writer_statements}회({writer_statements / MEMBER_COUNT:.2f}회/회원)")
+    print(f"버퍼 상태: {writer_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import asyncio
+import pytest
+from cachetools import LRUCache
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from apis import food_image
+from apis.food_image import search_similar_foods
+from utils import embedding_cache
+
+"""
+음식별 유사도 검색 동시 실행 테스트(임베딩 / Pinecone 대신 지연시간을 흉내 낸 함수 사용, 테스트는 fake_redis 사용)
+
+- 음식 수와 관계없이 전체 지연시간은 임베딩 + 검색 1회 수준(동시 실행 수 이내)
+- 동시 실행 수는 SIMILARITY_SEARCH_CONCURRENCY를 넘지 않음
+- 결과는 탐지 순서 유지, 임베딩은 요청당 1회 호출
+"""
+
+FOOD_NAMES = ["김치찌개", "공기밥", "계란말이", "배추김치"]
+
+# 흉내 낸 지연시간(초): 임베딩 호출, Pinecone 검색(블로킹)
+EMBEDDING_LATENCY = 0.1
+QUERY_LATENCY = 0.1
+
+
+class FakeIndex:
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    def query(self, vector, top_k, include_metadata):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        time.sleep(QUERY_LATENCY)
+        self.running -= 1
+        food_name = FOOD_NAMES[int(vector[0])]
+        return {"matches": [{"id": food_name, "metadata": {"food_name": food_name}, "score": 0.9}]}
+
+
+# 임베딩 / Pinecone 검색 대체, 동시 실행 수 설정: 반환값은 (임베딩 호출별 텍스트 수, Pinecone index)
+# 프로세스 내 임베딩 캐시는 빈 LRU 사용, Redis 캐시는 fake_redis(테스트마다 새로 생성)로 매번 임베딩 호출
+def stub_search(monkeypatch, concurrency):
+    embedding_calls = []
+
+    # 요청의 음식명은 임베딩 호출 1회로 변환
+    async def fake_get_embeddings(texts, model="embedding-query"):
+        embedding_calls.append(len(texts))
+        await asyncio.sleep(EMBEDDING_LATENCY)
+        return [[float(FOOD_NAMES.index(text))] for text in texts]
+
+    index = FakeIndex()
+    monkeypatch.setattr(food_image, "get_embeddings", fake_get_embeddings)
+    monkeypatch.setattr(food_image, "index", index)
+    monkeypatch.setattr(embedding_cache, "_local_cache", LRUCache(maxsize=settings.EMBEDDING_CACHE_LOCAL_SIZE))
+    monkeypatch.setattr(settings, "SIMILARITY_SEARCH_CONCURRENCY", concurrency)
+    return embedding_calls, index
+
+
+def run_search(food_names):
+    start_time = time.perf_counter()
+    results = asyncio.run(search_similar_foods(food_names))
+    return results, time.perf_counter() - start_time
+
+
+# 테스트: 동시 실행 수 제한 및 탐지 순서 유지
+def test_concurrent_search_order(fake_redis, monkeypatch):
+    embedding_calls, index = stub_search(monkeypatch, len(FOOD_NAMES))
+    results, elapsed = run_search(FOOD_NAMES)
+
+    assert [result[0]["food_name"] for result in results] == FOOD_NAMES
+    assert embedding_calls == [len(FOOD_NAMES)]
+    assert index.max_running <= settings.SIMILARITY_SEARCH_CONCURRENCY
+    assert elapsed < (EMBEDDING_LATENCY + QUERY_LATENCY) * 2
+
+
+# 테스트: 동시 실행 수가 1이면 순차 실행과 같음
+def test_bounded_fan_out(fake_redis, monkeypatch):
+    _, index = stub_search(monkeypatch, 1)
+    results, elapsed = run_search(FOOD_NAMES)
+
+    assert [result[0]["food_name"] for result in results] == FOOD_NAMES
+    assert index.max_running == 1
+    assert elapsed >= QUERY_LATENCY * len(FOOD_NAMES)
+
+
+# 임베딩 캐시 없이 실행(흉내 낸 벡터를 Redis에 저장하지 않음)
+def main():
+    print("\n========== 음식별 유사도 검색 ==========")
+    for concurrency in (1, len(FOOD_NAMES)):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            _, index = stub_search(monkeypatch, concurrency)
+            monkeypatch.setattr(food_image, "get_food_embeddings", food_image.get_embeddings)
+            _, elapsed = run_search(FOOD_NAMES)
+            print(f"동시 실행 수 {concurrency}: 음식 {len(FOOD_NAMES)}개, {elapsed:.4f}초, 최대 동시 검색 {index.max_running}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import asyncio
+import pytest
+
+# Root directory를 Project Root로 설정: server directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+os.chdir(project_root)
+
+from core.config import settings
+from apis import analysis_pipeline
+from apis.analysis_pipeline import StageStats, llm_stage, write_stage
+from utils.analysis_job import JOB_DONE, JOB_FAILED
+from utils.concurrency import AdaptiveConcurrencyLimiter
+
+"""
+단계별 파이프라인 테스트: LLM 워커 → 저장 단계 연결(DB / Redis 대신 지연시간을 흉내 낸 함수 사용)
+
+- 저장이 LLM보다 느려도 단계 사이 큐는 최대 크기를 넘지 않음(backpressure)
+- 한 회원의 LLM 실패는 해당 회원만 실패 처리
+"""
+
+MEMBER_COUNT = 40
+WORKERS = 8
+QUEUE_SIZE = 4
+
+# 흉내 낸 지연시간(초): LLM 호출, 결과 저장(묶음당)
+LLM_LATENCY = 0.02
+SAVE_LATENCY = 0.05
+
+FAILED_MEMBER = 7
+
+FINAL_RESULTS = {
+    "diet_advice": {"carbo_advice": "c", "protein_advice": "p", "fat_advice": "f"},
+    "diet_summary": "요약", "nutrition_analysis": "분석",
+    "diet_improvement": "개선점", "custom_recommendation": "식단"
+}
+
+
+async def fake_analysis(user_data, llm_override=None, pipeline=None):
+    await asyncio.sleep(LLM_LATENCY)
+    if user_data["member_id"] == FAILED_MEMBER:
+        raise RuntimeError("LLM 호출 실패")
+    return FINAL_RESULTS
+
+
+# 저장 / 회원 상태 기록을 흉내 낸 함수: 실행마다 새 기록 사용
+class FakeStore:
+
+    def __init__(self):
+        self.saved_batches = []
+        self.member_states = {}
+
+    def save_results(self, results):
+        time.sleep(SAVE_LATENCY)
+        self.saved_batches.append(len(results))
+        return {result["member_id"] for result in results if result["record"] is None}
+
+    def set_member_state(self, run_id, member_id, state):
+        self.member_states[member_id] = state
+
+
+async def run_pipeline():
+    limiter = AdaptiveConcurrencyLimiter(name="test", initial_limit=WORKERS, min_limit=1, max_limit=WORKERS, latency_target=60)
+    llm_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    write_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    llm_stats, write_stats = StageStats("llm", llm_queue), StageStats("write", write_queue)
+
+    # 저장 큐 최대 대기 개수 관찰
+    max_depth = {"write": 0}
+
+    async def observe(stop_event):
+        while not stop_event.is_set():
+            max_depth["write"] = max(max_depth["write"], write_queue.qsize())
+            await asyncio.sleep(0.001)
+
+    async def produce():
+        for member_id in range(1, MEMBER_COUNT + 1):
+            await llm_queue.put({
+                "member_id": member_id, "status_id": member_id, "inputs": {"member_id": member_id},
+                "weight_prediction": "감소", "avg_calorie": 2000.0, "fingerprint": "-"
+            })
+        for _ in range(WORKERS):
+            await llm_queue.put(None)
+
+    stop_event = asyncio.Event()
+    observer = asyncio.create_task(observe(stop_event))
+    await asyncio.gather(
+        produce(),
+        llm_stage(limiter, None, llm_queue, write_queue, llm_stats, WORKERS),
+        write_stage("test", write_queue, write_stats)
+    )
+    stop_event.set()
+    await observer
+    return llm_stats.snapshot(), write_stats.snapshot(), max_depth["write"]
+
+
+# 저장 단계가 느리면 LLM 워커가 대기하고, 모든 회원이 완료 / 실패 상태로 기록됨
+def run_and_check(monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(analysis_pipeline, "perform_diet_analsyis", fake_analysis)
+    monkeypatch.setattr(analysis_pipeline, "save_results", store.save_results)
+    monkeypatch.setattr(analysis_pipeline, "set_member_state", store.set_member_state)
+    monkeypatch.setattr(settings, "ANALYSIS_WRITE_BATCH_SIZE", 10)
+    monkeypatch.setattr(settings, "ANALYSIS_WRITE_FLUSH_INTERVAL", 0.01)
+
+    llm_snapshot, write_snapshot, max_write_depth = asyncio.run(run_pipeline())
+
+    assert max_write_depth <= QUEUE_SIZE
+    assert sum(store.saved_batches) == MEMBER_COUNT
+    assert max(store.saved_batches) <= settings.ANALYSIS_WRITE_BATCH_SIZE
+    assert store.member_states[FAILED_MEMBER] == JOB_FAILED
+    assert sum(1 for state in store.member_states.values() if state == JOB_DONE) == MEMBER_COUNT - 1
+    assert llm_snapshot["failed"] == 1 and write_snapshot["failed"] == 1
+
+    return llm_snapshot, write_snapshot, max_write_depth, store.saved_batches
+
+
+# 테스트: 단계 사이 큐 크기 제한 및 회원별 실패 격리
+def test_pipeline_backpressure(monkeypatch):
+    run_and_check(monkeypatch)
+
+
+def main():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        llm_snapshot, write_snapshot, max_write_depth, saved_batches = run_and_check(monkeypatch)
+
+    print("\n========== 단계별 파이프라인 ==========")
+    print(f"회원 수: {MEMBER_COUNT}, LLM 워커: {WORKERS}, 큐 최대 크기: {QUEUE_SIZE}")
+    print(f"LLM 단계: {llm_snapshot}")
+    print(f"저장 단계: {write_snapshot}")
+    print(f"저장 큐 최대 대기 개수: {max_write_depth}, 저장 묶음 크기: {saved_batches}")
+
+
+if __name__ == "__main__":
+    main()
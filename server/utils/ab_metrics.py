@@ -0,0 +1,110 @@
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from core.config_redis import redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 최근 A 후보 평가 결과(임계값 통과 여부): Hedged A/B의 실패 예측에 사용
+_recent_outcomes = deque(maxlen=50)
+
+# 실패율 계산에 필요한 최소 표본 수
+MIN_OUTCOME_SAMPLES = 10
+
+# 회원당 지연시간 보관 개수(p95 계산용)
+LATENCY_SAMPLE_SIZE = 1000
+
+
+def _metrics_key(mode: str):
+    return f"metrics:ab:{mode}"
+
+def _latency_key(mode: str):
+    return f"metrics:ab:{mode}:latency"
+
+
+# 모델 호출 토큰 사용량 집계: 응답의 usage_metadata 기준이므로 OpenAI / Anthropic(Fallback) 모두 집계
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self.total_tokens = 0
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    with self._lock:
+                        self.total_tokens += usage.get("total_tokens", 0)
+
+
+# 실행 중인 Chain의 모델 호출에 자동으로 연결(get_openai_callback과 같은 방식)
+_token_usage_callback = ContextVar("token_usage_callback", default=None)
+register_configure_hook(_token_usage_callback, inheritable=True)
+
+
+@contextmanager
+def get_token_usage_callback():
+    callback = TokenUsageCallbackHandler()
+    token = _token_usage_callback.set(callback)
+    try:
+        yield callback
+    finally:
+        _token_usage_callback.reset(token)
+
+
+# A 후보 평가 결과 기록
+def record_candidate_outcome(passed: bool):
+    _recent_outcomes.append(0 if passed else 1)
+
+
+# 최근 A 후보 실패율: 표본이 부족하면 0
+def get_recent_failure_rate():
+    if len(_recent_outcomes) < MIN_OUTCOME_SAMPLES:
+        return 0.0
+    return sum(_recent_outcomes) / len(_recent_outcomes)
+
+
+# A/B 실행 1회 기록: 회원당 지연시간, 토큰 사용량, 실행한 후보 수(실패해도 분석에는 영향 없음)
+# fallback: Fallback 모델로 실행한 경우(모델이 달라 토큰 / 지연시간 비교 시 구분)
+def record_ab_run(mode: str, latency: float, tokens: int, candidates: int, fallback: bool = False):
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hincrby(_metrics_key(mode), "members", 1)
+        pipe.hincrby(_metrics_key(mode), "tokens", tokens)
+        pipe.hincrby(_metrics_key(mode), "candidates", candidates)
+        if fallback:
+            pipe.hincrby(_metrics_key(mode), "fallback_members", 1)
+        pipe.lpush(_latency_key(mode), round(latency, 4))
+        pipe.ltrim(_latency_key(mode), 0, LATENCY_SAMPLE_SIZE - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"[A/B Metrics] 지표 기록 실패: {e}")
+
+
+# 모드별 지표: 회원당 토큰 / 후보 수, Fallback 실행 수, 회원당 지연시간 평균 및 p95
+def get_ab_stats(modes=("sequential", "hedged")):
+    stats = {}
+    for mode in modes:
+        metrics = redis_client.hgetall(_metrics_key(mode))
+        members = int(metrics.get("members", 0))
+        if not members:
+            continue
+
+        latencies = sorted(float(value) for value in redis_client.lrange(_latency_key(mode), 0, -1))
+        stats[mode] = {
+            "members": members,
+            "tokens_per_member": round(int(metrics.get("tokens", 0)) / members, 1),
+            "candidates_per_member": round(int(metrics.get("candidates", 0)) / members, 2),
+            "fallback_members": int(metrics.get("fallback_members", 0)),
+            "latency_avg": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "latency_p95": latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)] if latencies else 0.0,
+        }
+    return stats
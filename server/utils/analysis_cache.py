@@ -0,0 +1,139 @@
+import json
+from datetime import datetime
+from core.config import settings
+from core.config_redis import redis_client, get_async_redis_client
+from utils.analysis_job import PENDING_MEMBERS_KEY
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+식습관 분석 응답 캐시: GET /diet 응답을 회원별로 Redis에 저장
+
+- 분석 완료 시 저장(save_analysis_results / 이전 결과 재사용), 새 분석 시작 시(분석 상태 추가) 삭제
+- 저장 값: 응답과 조건부 요청 검증값(분석 상태 ID / 분석 날짜), 적중 시 DB 조회 없이 304 응답 여부 판단 가능
+- 조회 시 캐시에 없으면 DB에서 응답을 만든 뒤 저장(read-through)
+- 분석 대기 회원 집합에 있는 회원은 캐시를 사용하지 않음(삭제 직전에 다시 저장된 이전 응답 대신 DB에서 진행 상태 확인)
+- 적중 시 DB 조회 없이 응답, 적중 / 미적중 횟수와 응답 시간은 metrics:analysis_cache에 누적
+"""
+
+# Redis 키: 회원별 응답 / 적중 지표
+ANALYSIS_CACHE_KEY_PREFIX = "analysis_cache:diet"
+ANALYSIS_CACHE_METRICS_KEY = "metrics:analysis_cache"
+
+
+def _cache_key(member_id: int):
+    return f"{ANALYSIS_CACHE_KEY_PREFIX}:{member_id}"
+
+
+# GET /diet 응답 구성
+def build_diet_response(analysis_date: datetime, avg_calorie, weight_prediction, advice_carbo, advice_protein, advice_fat,
+                        summarized_advice, nutrient_analysis, diet_improvement, custom_recommendation):
+    return {
+        "analysis_date": analysis_date.strftime("%Y-%m-%d"),
+        "avg_calorie": avg_calorie,
+        "weight_prediction": weight_prediction,
+        "advice_carbo": advice_carbo,
+        "advice_protein": advice_protein,
+        "advice_fat": advice_fat,
+        "summarized_advice": summarized_advice,
+        "nutrient_analysis": nutrient_analysis,
+        "diet_improvement": diet_improvement,
+        "custom_recommendation": custom_recommendation
+    }
+
+
+# 캐시 저장 값: 응답 + 조건부 요청 검증값
+def build_diet_cache_entry(status_id: int, analysis_date: datetime, response: dict):
+    return {"status_id": status_id, "analysis_date": analysis_date.isoformat(), "response": response}
+
+
+# 분석 결과 저장 값(save_analysis_results 입력)으로 캐시 저장 값 구성
+def build_diet_cache_entry_from_record(analysis_date: datetime, record: dict):
+    response = build_diet_response(
+        analysis_date, record["avg_calorie"], record["weight_prediction"], record["advice_carbo"], record["advice_protein"],
+        record["advice_fat"], record["summarized_advice"], record["nutrient_analysis"], record["diet_improve"],
+        record["custom_recommend"]
+    )
+    return build_diet_cache_entry(record["status_id"], analysis_date, response)
+
+
+# 캐시 조회: 반환값은 (분석 상태 ID, 분석 날짜, 응답), 분석 대기 중인 회원 / Redis 장애 / 이전 형식의 값은 미적중으로 처리
+async def get_cached_diet_response(member_id: int):
+    try:
+        pipe = get_async_redis_client().pipeline()
+        pipe.get(_cache_key(member_id))
+        pipe.sismember(PENDING_MEMBERS_KEY, member_id)
+        cached, is_pending = await pipe.execute()
+        if cached is None or is_pending:
+            return None
+
+        entry = json.loads(cached)
+        if "response" not in entry:
+            return None
+        return entry["status_id"], datetime.fromisoformat(entry["analysis_date"]), entry["response"]
+    except Exception as e:
+        logger.error(f"[Analysis Cache] member_id={member_id} 캐시 조회 실패: {e}")
+        return None
+
+
+# 캐시 저장(요청 처리 중 read-through)
+async def set_cached_diet_response(member_id: int, entry: dict):
+    try:
+        await get_async_redis_client().setex(_cache_key(member_id), settings.ANALYSIS_CACHE_TTL,
+                                             json.dumps(entry, ensure_ascii=False))
+    except Exception as e:
+        logger.error(f"[Analysis Cache] member_id={member_id} 캐시 저장 실패: {e}")
+
+
+# 캐시 일괄 저장(분석 완료 시): {member_id: entry}
+def cache_diet_responses(entries: dict):
+    if not entries:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        for member_id, entry in entries.items():
+            pipe.setex(_cache_key(member_id), settings.ANALYSIS_CACHE_TTL, json.dumps(entry, ensure_ascii=False))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"[Analysis Cache] 캐시 저장 실패({len(entries)}명): {e}")
+
+
+# 응답 삭제(새 분석 시작 시)
+def invalidate_diet_responses(member_ids: list):
+    if not member_ids:
+        return
+    try:
+        redis_client.delete(*[_cache_key(member_id) for member_id in member_ids])
+    except Exception as e:
+        logger.error(f"[Analysis Cache] 캐시 삭제 실패({len(member_ids)}명): {e}")
+
+
+# 적중 여부별 요청 수 / 응답 시간 누적
+async def record_diet_request(hit: bool, seconds: float):
+    field = "hits" if hit else "misses"
+    try:
+        pipe = get_async_redis_client().pipeline()
+        pipe.hincrby(ANALYSIS_CACHE_METRICS_KEY, field, 1)
+        pipe.hincrbyfloat(ANALYSIS_CACHE_METRICS_KEY, f"{field}:seconds", seconds)
+        await pipe.execute()
+    except Exception as e:
+        logger.error(f"[Analysis Cache] 지표 기록 실패: {e}")
+
+
+# 캐시 지표 조회: 적중 / 미적중, 적중률, 적중 여부별 평균 응답 시간(ms)
+def get_analysis_cache_stats():
+    metrics = redis_client.hgetall(ANALYSIS_CACHE_METRICS_KEY)
+    hits, misses = int(metrics.get("hits", 0)), int(metrics.get("misses", 0))
+
+    def avg_ms(field, count):
+        return round(float(metrics.get(f"{field}:seconds", 0)) / count * 1000, 3) if count else 0.0
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "hit_latency_ms": avg_ms("hits", hits),
+        "miss_latency_ms": avg_ms("misses", misses)
+    }
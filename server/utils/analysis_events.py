@@ -0,0 +1,127 @@
+import json
+import asyncio
+import weakref
+import contextlib
+from core.config_redis import redis_client, get_async_redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+식습관 분석 완료 알림: Redis pub/sub
+
+- 분석 상태가 완료 / 실패로 바뀌면(commit 직후) ANALYSIS_EVENT_CHANNEL로 {"member_id", "state"} 발행
+- API 서버는 이벤트 루프마다 구독 연결 1개만 유지하고, 대기 중인 요청에 회원별로 전달
+- 구독이 끊기면 다시 연결, 그동안의 알림은 대기 시간 만료 후 재조회로 보완
+"""
+
+ANALYSIS_EVENT_CHANNEL = "analysis_events"
+
+# 분석 상태 변경 종류
+EVENT_DONE = "done"
+EVENT_FAILED = "failed"
+
+# 구독 재연결 대기 시간(초)
+RECONNECT_DELAY = 1.0
+
+
+# 알림 발행(동기): 여러 회원을 한 번에 발행, Redis 장애가 DB 처리를 실패시키지 않도록 로그만 남김
+def publish_analysis_events(member_ids: list, state: str):
+    if not member_ids:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        for member_id in member_ids:
+            pipe.publish(ANALYSIS_EVENT_CHANNEL, json.dumps({"member_id": member_id, "state": state}))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"[Analysis Events] 알림 발행 실패({len(member_ids)}명): {e}")
+
+
+# 회원별 알림 대기
+class AnalysisEventWaiter:
+
+    def __init__(self):
+        self._event = asyncio.Event()
+        self.state = None
+
+    def notify(self, state: str):
+        self.state = state
+        self._event.set()
+
+    # 알림을 받으면 True, 대기 시간이 지나면 False(다음 대기를 위해 초기화)
+    async def wait(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+# 구독 연결 1개로 받은 알림을 대기 중인 요청에 전달
+class AnalysisEventHub:
+
+    def __init__(self):
+        self._waiters = {}
+        self._ready = asyncio.Event()
+        self._listener = None
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._ready.clear()
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            pubsub = get_async_redis_client().pubsub()
+            try:
+                await pubsub.subscribe(ANALYSIS_EVENT_CHANNEL)
+                self._ready.set()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    event = json.loads(message["data"])
+                    for waiter in list(self._waiters.get(int(event["member_id"]), ())):
+                        waiter.notify(event["state"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._ready.clear()
+                logger.error(f"[Analysis Events] 구독 실패, {RECONNECT_DELAY}초 후 재연결: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+
+    # 알림 대기 등록: 구독이 준비된 뒤(최대 ready_timeout초) 상태를 조회해야 그 사이의 알림을 놓치지 않음
+    @contextlib.asynccontextmanager
+    async def subscribe(self, member_id: int, ready_timeout: float = 1.0):
+        self._ensure_listener()
+        waiter = AnalysisEventWaiter()
+        self._waiters.setdefault(member_id, set()).add(waiter)
+        try:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._ready.wait(), timeout=ready_timeout)
+            yield waiter
+        finally:
+            waiters = self._waiters.get(member_id)
+            waiters.discard(waiter)
+            if not waiters:
+                self._waiters.pop(member_id, None)
+
+    def snapshot(self):
+        return {"members": len(self._waiters), "waiters": sum(len(waiters) for waiters in self._waiters.values())}
+
+
+# 이벤트 루프별 알림 허브(구독 연결이 이벤트 루프에 묶임)
+_hubs = weakref.WeakKeyDictionary()
+
+def get_analysis_event_hub():
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = AnalysisEventHub()
+        _hubs[loop] = hub
+    return hub
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from core.config_redis import redis_client, get_async_redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 회원별 분석 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_SKIPPED = "skipped"  # 입력값이 이전 분석과 같아 결과 재사용
+JOB_FAILED = "failed"
+
+# 완료로 간주하는 상태: 재실행 시 건너뜀
+JOB_COMPLETED_STATES = (JOB_DONE, JOB_SKIPPED)
+
+# 작업 기록 보관 기간: 2주
+JOB_TTL = 60 * 60 * 24 * 14
+
+# 전역 분석 실행 상태: 진행 중인 작업 ID / 분석 대기 중(IS_PENDING)인 회원 집합
+# 여러 워커가 같은 Redis 키를 갱신하므로 분산 모드에서도 일관되게 유지
+ACTIVE_RUN_KEY = "analysis_run:active"
+PENDING_MEMBERS_KEY = "analysis_run:pending"
+
+
+# Redis 키 구성
+def _member_state_key(run_id: str):
+    return f"analysis_job:{run_id}:members"
+
+def _meta_key(run_id: str):
+    return f"analysis_job:{run_id}:meta"
+
+
+# 주간 분석 작업 ID: 분석 주차의 월요일 기준으로 같은 주에 재시작하면 같은 ID 사용
+def get_weekly_run_id(now: datetime = None):
+    now = now or datetime.now()
+    monday = (now - timedelta(days=now.weekday())).date()
+    return f"weekly-{monday.strftime('%Y%m%d')}"
+
+
+# 작업 등록: 처음 보는 회원만 queued로 추가(reset=True면 기존 상태 초기화)
+def init_job(run_id: str, member_ids: list, reset: bool = False):
+    state_key = _member_state_key(run_id)
+    meta_key = _meta_key(run_id)
+
+    pipe = redis_client.pipeline()
+    if reset:
+        pipe.delete(state_key, meta_key)
+    for member_id in member_ids:
+        pipe.hsetnx(state_key, member_id, JOB_QUEUED)
+    pipe.hsetnx(meta_key, "created_at", datetime.now().isoformat())
+    pipe.hset(meta_key, mapping={"status": "running", "started_at": datetime.now().isoformat()})
+    pipe.expire(state_key, JOB_TTL)
+    pipe.expire(meta_key, JOB_TTL)
+    pipe.execute()
+
+
+# 회원별 작업 상태 전체 조회
+def get_member_states(run_id: str):
+    return {int(member_id): state for member_id, state in redis_client.hgetall(_member_state_key(run_id)).items()}
+
+
+# 회원 작업 상태 조회
+def get_member_state(run_id: str, member_id: int):
+    return redis_client.hget(_member_state_key(run_id), member_id)
+
+
+# 회원별 작업 상태 변경
+def set_member_state(run_id: str, member_id: int, state: str):
+    redis_client.hset(_member_state_key(run_id), member_id, state)
+
+
+# 여러 회원의 작업 상태 일괄 변경
+def set_member_states(run_id: str, member_ids: list, state: str):
+    if member_ids:
+        redis_client.hset(_member_state_key(run_id), mapping={member_id: state for member_id in member_ids})
+
+
+# 작업 설정 기록 / 조회(분석 파이프라인 등): 분산 모드 워커도 같은 설정으로 실행
+def set_job_meta(run_id: str, mapping: dict):
+    redis_client.hset(_meta_key(run_id), mapping=mapping)
+
+
+def get_job_meta(run_id: str):
+    return redis_client.hgetall(_meta_key(run_id))
+
+
+# 결과 재사용으로 절약한 Chain 실행 시간 누적
+def add_time_saved(run_id: str, seconds: float):
+    redis_client.hincrbyfloat(_meta_key(run_id), "time_saved", seconds)
+
+
+# 작업 종료 처리 및 요약 반환
+def finish_job(run_id: str):
+    summary = get_job_summary(run_id)
+    redis_client.hset(_meta_key(run_id), mapping={
+        "status": "completed" if summary["failed"] == 0 else "completed_with_failures",
+        "finished_at": datetime.now().isoformat()
+    })
+    return summary
+
+
+# 작업 요약: 상태별 회원 수
+def get_job_summary(run_id: str):
+    states = get_member_states(run_id)
+    summary = {state: 0 for state in [JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_SKIPPED, JOB_FAILED]}
+    for state in states.values():
+        summary[state] = summary.get(state, 0) + 1
+    summary["total"] = len(states)
+    summary["meta"] = redis_client.hgetall(_meta_key(run_id))
+    return summary
+
+
+# 진행 중인 작업 기록 / 해제(다른 작업이 시작된 경우 유지)
+def start_active_run(run_id: str):
+    redis_client.hset(ACTIVE_RUN_KEY, mapping={"run_id": run_id, "started_at": datetime.now().isoformat()})
+
+
+def end_active_run(run_id: str):
+    if redis_client.hget(ACTIVE_RUN_KEY, "run_id") == run_id:
+        redis_client.delete(ACTIVE_RUN_KEY)
+
+
+# 분석 대기 중인 회원 추가 / 제거: DB의 IS_PENDING 변경(commit) 직후 호출
+def add_pending_members(member_ids: list):
+    if member_ids:
+        redis_client.sadd(PENDING_MEMBERS_KEY, *member_ids)
+
+
+def remove_pending_members(member_ids: list):
+    if member_ids:
+        redis_client.srem(PENDING_MEMBERS_KEY, *member_ids)
+
+
+# 분석 대기 중인 회원 집합 재구성: 작업 시작 시 DB 기준으로 맞춤(비정상 종료로 남은 회원 정리)
+def reset_pending_members(member_ids: list):
+    pipe = redis_client.pipeline()
+    pipe.delete(PENDING_MEMBERS_KEY)
+    if member_ids:
+        pipe.sadd(PENDING_MEMBERS_KEY, *member_ids)
+    pipe.execute()
+
+
+# 다른 회원의 분석이 대기 중인지 확인: O(1)(집합 크기, 포함 여부)
+def _has_other_pending(pending_count: int, is_member_pending: bool):
+    return pending_count > (1 if is_member_pending else 0)
+
+
+def is_other_member_pending(member_id: int) -> bool:
+    pipe = redis_client.pipeline()
+    pipe.scard(PENDING_MEMBERS_KEY)
+    pipe.sismember(PENDING_MEMBERS_KEY, member_id)
+    pending_count, is_member_pending = pipe.execute()
+    return _has_other_pending(pending_count, is_member_pending)
+
+
+async def is_other_member_pending_async(member_id: int) -> bool:
+    pipe = get_async_redis_client().pipeline()
+    pipe.scard(PENDING_MEMBERS_KEY)
+    pipe.sismember(PENDING_MEMBERS_KEY, member_id)
+    pending_count, is_member_pending = await pipe.execute()
+    return _has_other_pending(pending_count, is_member_pending)
+
+
+# 전역 분석 실행 상태 조회: 진행 중인 작업, 대기 중인 회원 수 / 목록
+def get_active_run_state():
+    return {
+        **redis_client.hgetall(ACTIVE_RUN_KEY),
+        "pending_count": redis_client.scard(PENDING_MEMBERS_KEY),
+        "pending_members": sorted(int(member_id) for member_id in redis_client.smembers(PENDING_MEMBERS_KEY))
+    }
@@ -0,0 +1,54 @@
+import asyncio
+from utils.analysis_cache import cache_diet_responses, invalidate_diet_responses
+from utils.analysis_job import add_pending_members, remove_pending_members
+from utils.analysis_events import EVENT_DONE, EVENT_FAILED, publish_analysis_events
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+분석 상태 변경 후처리: 분석 상태 commit 직후 Redis에 반영(db/crud.py, db/async_crud.py 공용)
+
+- 시작: 이전 분석 응답 캐시 삭제, 전역 분석 대기 회원 집합에 추가
+- 완료: 대기 회원 집합에서 제거, GET /diet 응답 캐시 저장 후 완료 알림
+- 실패: 대기 회원 집합에서 제거 후 실패 알림
+- Redis 장애가 DB 처리를 실패시키지 않도록 각 단계는 로그만 남김
+- 비동기 CRUD는 같은 함수를 쓰레드에서 실행(이벤트 루프를 막지 않음)
+"""
+
+# 전역 분석 대기 회원 집합 갱신
+def sync_pending_members(added: list = None, removed: list = None):
+    try:
+        add_pending_members(added or [])
+        remove_pending_members(removed or [])
+    except Exception as e:
+        logger.error(f"분석 대기 회원 집합 갱신 실패: {e}")
+
+
+# 분석 시작
+def notify_analysis_started(member_ids: list):
+    invalidate_diet_responses(member_ids)
+    sync_pending_members(added=member_ids)
+
+
+# 분석 완료: cache_entries는 {member_id: GET /diet 응답 캐시}(없으면 캐시 저장 생략)
+def notify_analysis_completed(member_ids: list, cache_entries: dict = None):
+    sync_pending_members(removed=member_ids)
+    if cache_entries:
+        cache_diet_responses(cache_entries)
+    publish_analysis_events(member_ids, EVENT_DONE)
+
+
+# 분석 실패
+def notify_analysis_failed(member_ids: list):
+    sync_pending_members(removed=member_ids)
+    publish_analysis_events(member_ids, EVENT_FAILED)
+
+
+async def notify_analysis_started_async(member_id: int):
+    await asyncio.to_thread(notify_analysis_started, [member_id])
+
+
+async def notify_analysis_failed_async(member_id: int):
+    await asyncio.to_thread(notify_analysis_failed, [member_id])
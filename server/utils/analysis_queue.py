@@ -0,0 +1,195 @@
+import time
+import uuid
+from core.config_redis import redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 리더 임대(lease) 유지 시간 / 회원별 잠금 유지 시간(초)
+LEADER_LEASE_TTL = 30
+MEMBER_LOCK_TTL = 600
+
+# 큐 기록 보관 기간: 2주
+QUEUE_TTL = 60 * 60 * 24 * 14
+
+# 현재 진행 중인 분석 작업 ID
+ACTIVE_RUN_KEY = "analysis_queue:active_run"
+
+# 토큰이 일치할 때만 임대 연장 / 해제(호출 시 client=redis_client로 현재 클라이언트 지정)
+RENEW_SCRIPT = redis_client.register_script("""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+""")
+RELEASE_SCRIPT = redis_client.register_script("""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+""")
+
+
+# Redis 키 구성
+def _leader_key(run_id: str):
+    return f"analysis_queue:{run_id}:leader"
+
+def _pending_key(run_id: str):
+    return f"analysis_queue:{run_id}:pending"
+
+def _processing_key(run_id: str):
+    return f"analysis_queue:{run_id}:processing"
+
+def _claimed_key(run_id: str):
+    return f"analysis_queue:{run_id}:claimed"
+
+def _enqueued_key(run_id: str):
+    return f"analysis_queue:{run_id}:enqueued"
+
+def _payload_key(run_id: str):
+    return f"analysis_queue:{run_id}:payload"
+
+def _sweep_key(run_id: str):
+    return f"analysis_queue:{run_id}:sweep"
+
+def _lock_key(run_id: str, member_id: int):
+    return f"analysis_lock:{run_id}:{member_id}"
+
+
+"""
+리더 선출: Redis 임대(lease) 기반
+"""
+
+# 리더 임대 획득 시도: 성공하면 토큰, 실패하면 None
+def try_acquire_leader(run_id: str):
+    token = uuid.uuid4().hex
+    if redis_client.set(_leader_key(run_id), token, nx=True, ex=LEADER_LEASE_TTL):
+        return token
+    return None
+
+# 리더 임대 연장
+def renew_leader(run_id: str, token: str) -> bool:
+    return bool(RENEW_SCRIPT(keys=[_leader_key(run_id)], args=[token, LEADER_LEASE_TTL * 1000], client=redis_client))
+
+# 리더 임대 해제
+def release_leader(run_id: str, token: str):
+    RELEASE_SCRIPT(keys=[_leader_key(run_id)], args=[token], client=redis_client)
+
+# 리더 존재 여부 확인
+def has_leader(run_id: str) -> bool:
+    return redis_client.exists(_leader_key(run_id)) == 1
+
+
+"""
+작업 큐: 대기(pending) → 처리 중(processing) 리스트 이동으로 최소 1회 전달 보장
+"""
+
+# 회원 분석 작업 등록: payload는 회원별 부가 데이터(JSON 문자열)
+# 기존 큐에 합쳐서 등록: 이미 대기 / 처리 중인 회원은 다시 넣지 않고, 처리 중인 전달은 그대로 유지
+# (임대 만료로 선출된 다른 리더 / 워커 실행 중 재시작이 진행 중인 전달을 지우지 않음)
+def enqueue_members(run_id: str, member_ids: list, payloads: dict = None):
+    pipe = redis_client.pipeline()
+    pipe.lrange(_pending_key(run_id), 0, -1)
+    pipe.lrange(_processing_key(run_id), 0, -1)
+    pending, processing = pipe.execute()
+    queued_ids = {int(member_id) for member_id in pending + processing}
+    new_ids = [member_id for member_id in dict.fromkeys(member_ids) if member_id not in queued_ids]
+
+    pipe = redis_client.pipeline()
+    if payloads:
+        pipe.hset(_payload_key(run_id), mapping=payloads)
+    if new_ids:
+        pipe.rpush(_pending_key(run_id), *new_ids)
+    pipe.set(_enqueued_key(run_id), 1)
+    pipe.set(ACTIVE_RUN_KEY, run_id)
+    for key in [_pending_key(run_id), _processing_key(run_id), _claimed_key(run_id),
+                _enqueued_key(run_id), _payload_key(run_id)]:
+        pipe.expire(key, QUEUE_TTL)
+    pipe.execute()
+
+# 등록 완료 여부 확인
+def is_enqueued(run_id: str) -> bool:
+    return redis_client.exists(_enqueued_key(run_id)) == 1
+
+# 대기 중인 회원 하나를 처리 중 리스트로 이동하여 가져오기: 없으면 None
+def claim_member(run_id: str):
+    member_id = redis_client.lmove(_pending_key(run_id), _processing_key(run_id), "LEFT", "RIGHT")
+    if member_id is None:
+        return None
+    redis_client.hset(_claimed_key(run_id), member_id, int(time.time()))
+    return int(member_id)
+
+# 회원별 부가 데이터 조회
+def get_member_payload(run_id: str, member_id: int):
+    return redis_client.hget(_payload_key(run_id), member_id)
+
+# 처리 완료: 처리 중 리스트에서 제거
+def ack_member(run_id: str, member_id: int):
+    pipe = redis_client.pipeline()
+    pipe.lrem(_processing_key(run_id), 1, member_id)
+    pipe.hdel(_claimed_key(run_id), member_id)
+    pipe.execute()
+
+# 남은 작업 수(대기 + 처리 중)
+def remaining_count(run_id: str) -> int:
+    pipe = redis_client.pipeline()
+    pipe.llen(_pending_key(run_id))
+    pipe.llen(_processing_key(run_id))
+    pending, processing = pipe.execute()
+    return pending + processing
+
+# 작업 종료: 진행 중인 작업 ID 해제
+def close_queue(run_id: str):
+    if redis_client.get(ACTIVE_RUN_KEY) == run_id:
+        redis_client.delete(ACTIVE_RUN_KEY)
+
+# 진행 중인 작업 ID 조회
+def get_active_run_id():
+    return redis_client.get(ACTIVE_RUN_KEY)
+
+# 비정상 종료된 워커의 작업 회수: 잠금이 없고 가져간 지 오래된 회원을 대기 리스트로 복귀
+def requeue_stale_members(run_id: str, stale_after: int = MEMBER_LOCK_TTL):
+    now = int(time.time())
+    claimed = redis_client.hgetall(_claimed_key(run_id))
+    requeued = 0
+    for member_id in set(redis_client.lrange(_processing_key(run_id), 0, -1)):
+        claimed_at = claimed.get(member_id)
+        if claimed_at is not None and now - int(claimed_at) < stale_after:
+            continue
+        if redis_client.exists(_lock_key(run_id, member_id)):
+            continue
+        pipe = redis_client.pipeline()
+        pipe.lrem(_processing_key(run_id), 1, member_id)
+        pipe.hdel(_claimed_key(run_id), member_id)
+        pipe.rpush(_pending_key(run_id), member_id)
+        pipe.execute()
+        requeued += 1
+
+    if requeued:
+        logger.info(f"[Analysis Queue] run_id={run_id}, 중단된 작업 {requeued}건 재등록")
+    return requeued
+
+# 중단된 작업 회수 주기 확보: 전체 워커 중 주기마다 한 곳만 회수 실행
+def try_acquire_sweep(run_id: str, interval: int) -> bool:
+    return bool(redis_client.set(_sweep_key(run_id), 1, nx=True, ex=interval))
+
+
+"""
+회원별 잠금: 같은 회원이 여러 워커에서 동시에 분석되지 않도록 방지
+"""
+
+# 회원 잠금 획득: 성공하면 토큰, 실패하면 None
+def acquire_member_lock(run_id: str, member_id: int):
+    token = uuid.uuid4().hex
+    if redis_client.set(_lock_key(run_id, member_id), token, nx=True, ex=MEMBER_LOCK_TTL):
+        return token
+    return None
+
+# 회원 잠금 연장: 분석이 잠금 유지 시간보다 오래 걸려도 다른 워커에 재전달되지 않도록 처리 중 주기적으로 호출
+def renew_member_lock(run_id: str, member_id: int, token: str) -> bool:
+    return bool(RENEW_SCRIPT(keys=[_lock_key(run_id, member_id)], args=[token, MEMBER_LOCK_TTL * 1000], client=redis_client))
+
+# 회원 잠금 해제
+def release_member_lock(run_id: str, member_id: int, token: str):
+    RELEASE_SCRIPT(keys=[_lock_key(run_id, member_id)], args=[token], client=redis_client)
@@ -0,0 +1,155 @@
+import os
+import json
+import uuid
+import asyncio
+from abc import ABC, abstractmethod
+from openai import AsyncOpenAI
+from core.config import settings
+from utils.redis_integration import acquire_llm_quota, estimate_tokens
+from errors.server_exception import ExternalAPIError
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# Batch 상태: 완료 / 실패(더 이상 진행되지 않는 상태)
+BATCH_COMPLETED = "completed"
+BATCH_FAILED_STATES = ("failed", "expired", "cancelled")
+
+"""
+Batch 실행 백엔드: JSONL 요청 파일을 제출하고 같은 형식의 결과 파일을 내려받음
+
+- 요청 한 줄: {"custom_id": str, "method": "POST", "url": "/v1/chat/completions", "body": {...}}
+- 결과 한 줄: {"custom_id": str, "response": {"status_code": int, "body": {...}}, "error": dict | None}
+"""
+
+class BatchBackend(ABC):
+
+    # 요청 파일 제출: batch_id 반환
+    @abstractmethod
+    async def submit(self, input_path: str) -> str:
+        ...
+
+    # Batch 상태 조회
+    @abstractmethod
+    async def get_status(self, batch_id: str) -> str:
+        ...
+
+    # 결과 파일 저장
+    @abstractmethod
+    async def download_results(self, batch_id: str, output_path: str):
+        ...
+
+
+# OpenAI Batch API: 24시간 내 처리, 실시간 호출 대비 저렴하고 별도 호출 한도 적용
+class OpenAIBatchBackend(BatchBackend):
+
+    def __init__(self, completion_window: str = "24h"):
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.completion_window = completion_window
+
+    async def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as file:
+            input_file = await self.client.files.create(file=file, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    async def get_status(self, batch_id: str) -> str:
+        batch = await self.client.batches.retrieve(batch_id)
+        return batch.status
+
+    async def download_results(self, batch_id: str, output_path: str):
+        batch = await self.client.batches.retrieve(batch_id)
+
+        # 성공 결과와 실패 결과 파일을 하나로 합쳐 저장
+        lines = []
+        for file_id in [batch.output_file_id, batch.error_file_id]:
+            if file_id:
+                content = await self.client.files.content(file_id)
+                lines.extend(line for line in content.text.splitlines() if line.strip())
+
+        with open(output_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + ("\n" if lines else ""))
+
+
+# 로컬 파일 기반 Batch: 요청 파일을 로컬에서 처리(테스트 / Batch API 미사용 환경)
+# responder: 요청 한 줄(custom_id, body)을 받아 Chat Completions 응답 body(dict)를 반환하는 함수, 미지정 시 실시간 API 호출
+class LocalBatchBackend(BatchBackend):
+
+    def __init__(self, responder=None, concurrency: int = 10):
+        self.responder = responder or self._call_chat_completions
+        self.concurrency = concurrency
+        self._results = {}
+
+    async def _call_chat_completions(self, request: dict):
+        body = request["body"]
+        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        prompt = " ".join(message["content"] for message in body["messages"])
+        await acquire_llm_quota(body["model"], tokens=estimate_tokens(prompt) + body.get("max_completion_tokens", 0))
+        response = await client.chat.completions.create(**body)
+        return response.model_dump()
+
+    async def _process_line(self, request: dict, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                result = self.responder(request)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                return {"custom_id": request["custom_id"], "response": {"status_code": 200, "body": result}, "error": None}
+            except Exception as e:
+                return {"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}}
+
+    async def submit(self, input_path: str) -> str:
+        with open(input_path, "r", encoding="utf-8") as file:
+            requests = [json.loads(line) for line in file if line.strip()]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batch_id = f"local-{uuid.uuid4().hex}"
+        self._results[batch_id] = await asyncio.gather(*[self._process_line(request, semaphore) for request in requests])
+        return batch_id
+
+    async def get_status(self, batch_id: str) -> str:
+        return BATCH_COMPLETED if batch_id in self._results else "failed"
+
+    async def download_results(self, batch_id: str, output_path: str):
+        with open(output_path, "w", encoding="utf-8") as file:
+            for result in self._results.pop(batch_id):
+                file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+# 설정에 따른 Batch 백엔드 생성
+def get_batch_backend(name: str = None) -> BatchBackend:
+    name = name or settings.ANALYSIS_BATCH_BACKEND
+    if name == "openai":
+        return OpenAIBatchBackend()
+    if name == "local":
+        return LocalBatchBackend()
+    raise ValueError(f"지원하지 않는 Batch 백엔드: {name}")
+
+
+# 요청 파일 제출 후 완료까지 대기하고 결과 파일 저장: batch_id 반환
+async def run_batch(backend: BatchBackend, input_path: str, output_path: str,
+                    poll_interval: float = None, timeout: float = None):
+    poll_interval = poll_interval if poll_interval is not None else settings.ANALYSIS_BATCH_POLL_INTERVAL
+    timeout = timeout if timeout is not None else settings.ANALYSIS_BATCH_TIMEOUT
+
+    batch_id = await backend.submit(input_path)
+    logger.info(f"[Batch] {os.path.basename(input_path)} 제출 완료(batch_id={batch_id})")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        status = await backend.get_status(batch_id)
+        if status == BATCH_COMPLETED:
+            break
+        if status in BATCH_FAILED_STATES or loop.time() > deadline:
+            logger.error(f"[Batch] batch_id={batch_id} 처리 실패(상태: {status})")
+            raise ExternalAPIError()
+        await asyncio.sleep(poll_interval)
+
+    await backend.download_results(batch_id, output_path)
+    return batch_id
@@ -0,0 +1,52 @@
+import os
+from errors.server_exception import FileAccessError
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+Chain 레지스트리: 구성한 Chain(Runnable)을 (Chain 이름, 모델, 변형) 단위로 한 번만 생성하여 공유
+
+- Runnable은 실행 상태를 갖지 않으므로 여러 회원 / A, B 실행이 같은 객체를 동시에 사용
+- 사용하는 프롬프트 파일의 수정 시간을 함께 저장하고, 파일이 변경되면 다음 조회 시 다시 생성
+"""
+
+class ChainRegistry:
+
+    def __init__(self):
+        self._entries = {}
+        self.builds = 0
+        self.hits = 0
+
+    # 프롬프트 파일 버전: 파일 수정 시간
+    @staticmethod
+    def _prompt_versions(prompt_paths):
+        try:
+            return tuple(os.path.getmtime(path) for path in prompt_paths)
+        except OSError:
+            logger.error(f"파일을 찾을 수 없음: {prompt_paths}")
+            raise FileAccessError()
+
+    # 등록된 Chain 조회: 없거나 프롬프트가 변경되었으면 builder(async)로 생성 후 등록
+    async def get(self, key: tuple, prompt_paths: list, builder):
+        versions = self._prompt_versions(prompt_paths)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == versions:
+            self.hits += 1
+            return entry[1]
+
+        chain = await builder()
+        self._entries[key] = (versions, chain)
+        self.builds += 1
+
+        if entry is not None:
+            logger.info(f"[Chain Registry] 프롬프트 변경으로 {key[0]} Chain 재생성")
+        return chain
+
+    # 등록된 Chain 전체 제거
+    def clear(self):
+        self._entries.clear()
+
+    def snapshot(self):
+        return {"chains": len(self._entries), "builds": self.builds, "hits": self.hits}
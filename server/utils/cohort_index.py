@@ -0,0 +1,113 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from errors.server_exception import FileAccessError
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 필터링 조건(±범위)
+AGE_RANGE = 6
+HEIGHT_RANGE = 6
+WEIGHT_RANGE = 6
+ACTIVITY_RANGE = 1
+
+# 평균값을 계산할 영양성분 컬럼
+NUTRIENT_COLUMNS = {
+    "carbo_avg": "carbohydrate",
+    "protein_avg": "protein",
+    "fat_avg": "fat",
+}
+
+
+# diet_advice.csv 인메모리 인덱스: 성별로 분할하고 나이 기준으로 정렬
+class CohortIndex:
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+        self._mtime = None
+        self._partitions = {}
+        self._lock = threading.Lock()
+
+    # csv 파일을 읽어 성별 파티션 구성
+    def _load(self, mtime: float):
+        try:
+            df = pd.read_csv(self.csv_path)
+        except Exception as e:
+            logger.error(f"csv 파일({self.csv_path}) 로드 실패: {e}")
+            raise FileAccessError()
+
+        # csv 파일 조회 없을 시 예외처리
+        if df.empty:
+            logger.error("csv 파일(diet_advice.csv)을 불러오기에 실패했습니다.")
+            raise FileAccessError()
+
+        partitions = {}
+        for gender, group in df.groupby("gender"):
+            # 나이 기준 정렬: 나이 범위는 이진 탐색으로 구간 조회
+            group = group.sort_values("age", kind="mergesort")
+            partitions[int(gender)] = {
+                column: group[column].to_numpy(dtype=float)
+                for column in ["age", "height", "weight", "physical_activity_index", *NUTRIENT_COLUMNS.values()]
+            }
+
+        self._partitions = partitions
+        self._mtime = mtime
+        logger.info(f"코호트 인덱스 적재 완료: {self.csv_path} ({len(df)}건)")
+
+    # 파일 수정 시간이 바뀐 경우에만 다시 적재
+    def _reload_if_modified(self):
+        try:
+            mtime = os.path.getmtime(self.csv_path)
+        except Exception:
+            logger.error(f"파일을 찾을 수 없음: {self.csv_path}")
+            raise FileAccessError()
+
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime != self._mtime:
+                self._load(mtime)
+
+    # 조건에 맞는 코호트의 영양성분 평균 조회: 조건에 맞는 데이터가 없으면 None
+    def lookup(self, gender: int, age: float, height: float, weight: float, physical_activity_index: float):
+        self._reload_if_modified()
+
+        partition = self._partitions.get(gender)
+        if partition is None:
+            return None
+
+        # 나이 범위: 정렬된 배열에서 구간 조회
+        ages = partition["age"]
+        start = np.searchsorted(ages, age - AGE_RANGE, side="left")
+        end = np.searchsorted(ages, age + AGE_RANGE, side="right")
+        if start >= end:
+            return None
+
+        # 나머지 조건은 나이 구간 내에서만 필터링
+        mask = (
+            (np.abs(partition["height"][start:end] - height) <= HEIGHT_RANGE) &
+            (np.abs(partition["weight"][start:end] - weight) <= WEIGHT_RANGE) &
+            (np.abs(partition["physical_activity_index"][start:end] - physical_activity_index) <= ACTIVITY_RANGE)
+        )
+        if not mask.any():
+            return None
+
+        return {
+            key: float(partition[column][start:end][mask].mean())
+            for key, column in NUTRIENT_COLUMNS.items()
+        }
+
+
+# csv 경로별 인덱스 캐시
+_cohort_indexes = {}
+
+# csv 경로에 해당하는 코호트 인덱스 반환(최초 1회 생성)
+def get_cohort_index(csv_path: str) -> CohortIndex:
+    index = _cohort_indexes.get(csv_path)
+    if index is None:
+        index = _cohort_indexes.setdefault(csv_path, CohortIndex(csv_path))
+    return index
@@ -0,0 +1,145 @@
+import math
+import time
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from core.config_redis import redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 현재 실행 중인 분석 작업의 동시 실행 제한기: retry_with_fallback 등 하위 호출에서 신호 기록
+current_limiter = ContextVar("current_limiter", default=None)
+
+
+# AIMD 기반 동시 실행 제한기
+class AdaptiveConcurrencyLimiter:
+    """
+    - 증가(Additive Increase): 최근 p95 지연시간과 오류율이 기준 이하이면 limit만큼 성공할 때마다 +1
+    - 감소(Multiplicative Decrease): Rate-Limit(429) / Timeout 발생 시 limit * backoff_ratio로 감소
+    """
+
+    def __init__(self, name: str, initial_limit: int, min_limit: int, max_limit: int, latency_target: float,
+                 max_error_rate: float = 0.05, backoff_ratio: float = 0.5, window_size: int = 50, cooldown: float = 5.0):
+        self.name = name
+        self.limit = max(min_limit, min(initial_limit, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.backoff_ratio = backoff_ratio
+        self.cooldown = cooldown
+
+        self._in_flight = 0
+        self._waiters = deque()
+        self._latencies = deque(maxlen=window_size)
+        self._errors = deque(maxlen=window_size)
+        self._successes_since_change = 0
+        self._last_decrease = 0.0
+
+    # 실행 슬롯 획득: 현재 limit 이상 실행 중이면 대기
+    # 빈 슬롯 확인과 획득 사이에 await가 없으므로 다른 작업이 끼어들어 limit을 넘기지 않음
+    async def acquire(self):
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # 깨워진 직후 취소된 경우: 받은 슬롯을 다음 대기 작업에 넘김
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+
+    # 실행 슬롯 반환
+    def release(self):
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    # 남은 슬롯만큼 대기 중인 작업 깨우기
+    def _wake_waiters(self):
+        available = self.limit - self._in_flight
+        while available > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    # 최근 p95 지연시간
+    def p95_latency(self):
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)]
+
+    # 최근 오류율
+    def error_rate(self):
+        if not self._errors:
+            return 0.0
+        return sum(self._errors) / len(self._errors)
+
+    # 성공한 호출의 지연시간 기록: 기준 이하이면 limit 증가
+    def record_success(self, latency: float):
+        self._latencies.append(latency)
+        self._errors.append(0)
+        self._successes_since_change += 1
+
+        # limit만큼 성공(한 라운드)할 때마다 증가 여부 판단
+        if self._successes_since_change < self.limit:
+            return
+        self._successes_since_change = 0
+
+        if self.p95_latency() <= self.latency_target and self.error_rate() <= self.max_error_rate:
+            self._change_limit(min(self.max_limit, self.limit + 1), reason="증가")
+
+    # 실패 기록: Rate-Limit / Timeout이면 limit 급감(cooldown 내 중복 감소 방지)
+    def record_error(self, throttled: bool):
+        self._errors.append(1)
+        if not throttled:
+            return
+
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._successes_since_change = 0
+        self._change_limit(max(self.min_limit, math.floor(self.limit * self.backoff_ratio)), reason="감소")
+
+    # limit 변경 및 로그 / 지표 기록
+    def _change_limit(self, new_limit: int, reason: str):
+        if new_limit == self.limit:
+            return
+        old_limit, self.limit = self.limit, new_limit
+        logger.info(f"[Adaptive Limiter] {self.name} limit {reason}: {old_limit} → {new_limit} "
+                    f"(p95: {self.p95_latency():.2f}s, 오류율: {self.error_rate():.2%}, 실행 중: {self._in_flight})")
+        self._publish_metrics()
+        self._wake_waiters()
+
+    # 현재 상태
+    def snapshot(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "p95_latency": round(self.p95_latency(), 4),
+            "error_rate": round(self.error_rate(), 4),
+        }
+
+    # Redis 지표 기록: 실패해도 분석에는 영향 없음
+    def _publish_metrics(self):
+        try:
+            redis_client.hset(f"metrics:limiter:{self.name}", mapping=self.snapshot())
+        except Exception as e:
+            logger.error(f"[Adaptive Limiter] 지표 기록 실패: {e}")
@@ -0,0 +1,64 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+
+"""
+조건부 요청(ETag / Last-Modified): 분석 결과가 바뀌지 않았으면 본문 없이 304 응답
+
+- ETag: 분석 상태 ID와 분석 날짜로 만든 강한 검증값(분석이 완료되어야만 바뀜)
+- If-None-Match가 있으면 If-Modified-Since보다 우선(RFC 9110)
+- Cache-Control: private, no-cache → 클라이언트는 저장한 응답을 매번 검증 후 사용
+"""
+
+CACHE_CONTROL = "private, no-cache"
+
+
+# 분석 결과 검증값: (ETag, Last-Modified)
+def build_validators(status_id: int, analysis_date: datetime):
+    digest = hashlib.sha256(f"{status_id}:{analysis_date.isoformat()}".encode("utf-8")).hexdigest()[:32]
+
+    # 분석 날짜는 서버 시간대(naive) 기준으로 저장
+    last_modified = format_datetime(analysis_date.astimezone(timezone.utc), usegmt=True)
+    return f'"{digest}"', last_modified
+
+
+# If-None-Match 비교: 여러 값 / * 허용, 약한 비교(W/ 무시)
+def _etag_matches(if_none_match: str, etag: str):
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def is_not_modified(request: Request, etag: str, analysis_date: datetime):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP 날짜는 초 단위
+        return analysis_date.astimezone(timezone.utc).replace(microsecond=0) <= since
+
+    return False
+
+
+# 검증값 헤더 설정(200 / 304 응답 공통)
+def apply_validators(response: Response, etag: str, last_modified: str):
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = last_modified
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+# 304 응답: 본문 없이 검증값 헤더만 포함
+def not_modified_response(etag: str, last_modified: str):
+    response = Response(status_code=304)
+    apply_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,104 @@
+import time
+import asyncio
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+임베딩 요청 묶음 처리(micro-batching)
+
+- embed() / embed_many()로 들어온 텍스트를 모아 batch_size개가 쌓이거나 flush_interval초가 지나면 임베딩 API 1회 호출
+- 한 요청의 음식명은 embed_many()로 한 번에 추가되므로 같은 묶음으로 호출, 동시에 들어온 다른 요청의 텍스트도 함께 묶음
+- 아직 호출 전인 같은 텍스트는 결과를 공유
+- 호출이 실패하거나 벡터 수가 텍스트 수와 다르면 해당 묶음의 모든 요청에 같은 예외 전달
+"""
+
+class EmbeddingBatcher:
+
+    def __init__(self, embed_batch, batch_size: int = 64, flush_interval: float = 0.005):
+        # embed_batch: 텍스트 목록 → 같은 순서의 벡터 목록(코루틴 함수)
+        self.embed_batch = embed_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = {}
+        self._timer = None
+        self._flush_tasks = set()
+
+        # 지표: 임베딩 텍스트 수 / API 호출 수 / 실패 호출 수
+        self.texts = 0
+        self.calls = 0
+        self.failures = 0
+
+    # 텍스트 추가: 호출 전인 같은 텍스트가 있으면 결과 공유
+    def _enqueue(self, text: str):
+        future = self._buffer.get(text)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._buffer[text] = future
+
+        if len(self._buffer) >= self.batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._schedule_flush)
+        return future
+
+    # 공유 결과는 한 요청이 취소되어도 다른 요청에 영향이 없도록 shield
+    async def embed(self, text: str):
+        return await asyncio.shield(self._enqueue(text))
+
+    async def embed_many(self, texts: list):
+        futures = [self._enqueue(text) for text in texts]
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    # 버퍼에 쌓인 텍스트를 임베딩 호출 작업으로 넘김
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, {}
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, batch: dict):
+        texts = list(batch)
+        start = time.time()
+        try:
+            vectors = await self.embed_batch(texts)
+
+            # 벡터 수가 다르면 텍스트와 벡터를 짝지을 수 없으므로 묶음 전체 실패
+            if len(vectors) != len(texts):
+                raise ValueError(f"임베딩 결과 수 불일치: 텍스트 {len(texts)}건, 벡터 {len(vectors)}건")
+        except Exception as e:
+            self.calls += 1
+            self.failures += 1
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.calls += 1
+        self.texts += len(texts)
+        logger.info(f"[Embedding Batcher] {len(texts)}건 임베딩, 실행 시간: {round(time.time() - start, 4)} sec")
+
+        for future, vector in zip(batch.values(), vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    # 남은 텍스트 임베딩 후 종료
+    async def close(self):
+        self._schedule_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def snapshot(self):
+        return {
+            "texts": self.texts,
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_batch": round(self.texts / (self.calls - self.failures), 2) if self.calls > self.failures else 0.0
+        }
@@ -0,0 +1,132 @@
+import re
+import unicodedata
+import numpy as np
+from cachetools import LRUCache
+from core.config import settings
+from core.config_redis import redis_client, get_async_redis_client, get_async_redis_binary_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+음식명 임베딩 캐시(2단계): 자주 탐지되는 음식명("김치찌개", "공기밥" 등)은 임베딩 API 호출 없이 벡터 사용
+
+1. 프로세스 내 LRU(EMBEDDING_CACHE_LOCAL_SIZE개): float32 배열로 보관
+2. Redis: float32 바이트(little-endian)로 보관, 서버 간 공유
+- 키: (임베딩 모델, 정규화한 음식명)
+- 미적중 시 임베딩 후 두 단계 모두 저장, 서버 시작 시 자주 탐지된 음식명으로 미리 채움
+- 음식명별 탐지 횟수는 embedding_cache:frequency(Sorted Set)에 누적(상위 EMBEDDING_CACHE_FREQUENCY_SIZE개만 유지)
+"""
+
+# Redis 키: 벡터 / 음식명별 탐지 횟수 / 지표
+EMBEDDING_CACHE_KEY_PREFIX = "embedding_cache:vector"
+EMBEDDING_FREQUENCY_KEY = "embedding_cache:frequency"
+EMBEDDING_CACHE_METRICS_KEY = "metrics:embedding_cache"
+
+# 벡터 저장 형식
+VECTOR_DTYPE = np.dtype("<f4")
+
+# 프로세스 내 LRU: {(모델, 음식명): 벡터}
+_local_cache = LRUCache(maxsize=settings.EMBEDDING_CACHE_LOCAL_SIZE)
+
+
+# 음식명 정규화: 유니코드 정규화(NFKC), 앞뒤 공백 제거, 연속 공백은 하나로
+def normalize_food_name(text: str):
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _cache_key(model: str, name: str):
+    return f"{EMBEDDING_CACHE_KEY_PREFIX}:{model}:{name}"
+
+
+# Redis 저장 값(float32 바이트) → 벡터
+def decode_vector(value: bytes):
+    return np.frombuffer(value, dtype=VECTOR_DTYPE)
+
+
+# 캐시 조회: 반환값은 ({음식명: 벡터}, 단계별 적중 수), Redis 장애 시 프로세스 내 적중만 사용
+async def get_cached_embeddings(model: str, names: list):
+    vectors = {}
+    for name in names:
+        vector = _local_cache.get((model, name))
+        if vector is not None:
+            vectors[name] = vector
+    hits = {"local": len(vectors), "redis": 0}
+
+    missing = [name for name in names if name not in vectors]
+    if not missing:
+        return vectors, hits
+
+    try:
+        values = await get_async_redis_binary_client().mget([_cache_key(model, name) for name in missing])
+    except Exception as e:
+        logger.error(f"[Embedding Cache] 캐시 조회 실패: {e}")
+        return vectors, hits
+
+    for name, value in zip(missing, values):
+        if value is not None:
+            vector = decode_vector(value)
+            _local_cache[(model, name)] = vector
+            vectors[name] = vector
+            hits["redis"] += 1
+    return vectors, hits
+
+
+# 캐시 저장: 프로세스 내 LRU / Redis 모두 저장, 반환값은 저장한 벡터(float32, 적중 시와 같은 값)
+async def set_cached_embeddings(model: str, vectors: dict):
+    vectors = {name: np.asarray(vector, dtype=VECTOR_DTYPE) for name, vector in vectors.items()}
+    if not vectors:
+        return vectors
+    for name, vector in vectors.items():
+        _local_cache[(model, name)] = vector
+
+    try:
+        pipe = get_async_redis_binary_client().pipeline()
+        for name, vector in vectors.items():
+            pipe.setex(_cache_key(model, name), settings.EMBEDDING_CACHE_TTL, vector.tobytes())
+        await pipe.execute()
+    except Exception as e:
+        logger.error(f"[Embedding Cache] 캐시 저장 실패({len(vectors)}건): {e}")
+    return vectors
+
+
+# 조회 결과 기록: 음식명별 탐지 횟수, 단계별 적중 / 미적중 수, 임베딩 호출이 필요했던 조회 수
+async def record_embedding_lookup(names: list, hits: dict, misses: int):
+    try:
+        pipe = get_async_redis_client().pipeline()
+        for name in names:
+            pipe.zincrby(EMBEDDING_FREQUENCY_KEY, 1, name)
+        pipe.zremrangebyrank(EMBEDDING_FREQUENCY_KEY, 0, -settings.EMBEDDING_CACHE_FREQUENCY_SIZE - 1)
+        pipe.hincrby(EMBEDDING_CACHE_METRICS_KEY, "lookups", 1)
+        pipe.hincrby(EMBEDDING_CACHE_METRICS_KEY, "local_hits", hits["local"])
+        pipe.hincrby(EMBEDDING_CACHE_METRICS_KEY, "redis_hits", hits["redis"])
+        pipe.hincrby(EMBEDDING_CACHE_METRICS_KEY, "misses", misses)
+        pipe.hincrby(EMBEDDING_CACHE_METRICS_KEY, "embedding_calls", 1 if misses else 0)
+        await pipe.execute()
+    except Exception as e:
+        logger.error(f"[Embedding Cache] 지표 기록 실패: {e}")
+
+
+# 가장 자주 탐지된 음식명(서버 시작 시 캐시 채우기용)
+async def get_frequent_food_names(limit: int):
+    return await get_async_redis_client().zrevrange(EMBEDDING_FREQUENCY_KEY, 0, limit - 1)
+
+
+# 캐시 지표 조회: 단계별 적중률, 조회당 임베딩 호출 수
+def get_embedding_cache_stats():
+    metrics = redis_client.hgetall(EMBEDDING_CACHE_METRICS_KEY)
+    lookups = int(metrics.get("lookups", 0))
+    local_hits, redis_hits = int(metrics.get("local_hits", 0)), int(metrics.get("redis_hits", 0))
+    misses = int(metrics.get("misses", 0))
+    names = local_hits + redis_hits + misses
+
+    return {
+        "lookups": lookups,
+        "local_hits": local_hits,
+        "redis_hits": redis_hits,
+        "misses": misses,
+        "hit_ratio": round((local_hits + redis_hits) / names, 4) if names else 0.0,
+        "calls_per_lookup": round(int(metrics.get("embedding_calls", 0)) / lookups, 4) if lookups else 0.0,
+        "frequent_names": redis_client.zcard(EMBEDDING_FREQUENCY_KEY)
+    }
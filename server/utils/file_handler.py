@@ -1,5 +1,6 @@
 import os
 import time
+import hashlib
 import aiofiles
 from errors.server_exception import FileAccessError
 from logs.logger_config import get_logger
@@ -31,11 +32,14 @@ async def read_prompt(filename: str, category: str, ttl: int):
         if prompt_timestamps.get(filename) == last_modified_time:
             return prompt_cache[filename]
         
-    # Redis에서 캐싱된 프롬프트 확인
-    redis_key = f"prompt:{category}:{filename}"
+    # Redis에서 캐싱된 프롬프트 확인: 파일이 수정되면 이전 내용을 반환하지 않도록 수정 시간을 키에 포함
+    redis_key = f"prompt:{category}:{filename}:{int(last_modified_time)}"
     cached_prompt = redis_client.get(redis_key)
 
     if cached_prompt:
+        if category == "diet":
+            prompt_cache[filename] = cached_prompt
+            prompt_timestamps[filename] = last_modified_time
         return cached_prompt
     
     # 파일에서 직접 읽기
@@ -48,10 +52,7 @@ async def read_prompt(filename: str, category: str, ttl: int):
         
         # 기존 데이터와 다르면 캐시 업데이트
         if category == "diet":
-            if filename in prompt_cache and prompt_cache[filename] == prompt:
-                return prompt
-
-            # 내용 변경
+            # 내용 변경(수정 시간만 바뀐 경우에도 갱신)
             prompt_cache[filename] = prompt
             prompt_timestamps[filename] = last_modified_time
 
@@ -63,13 +64,17 @@ async def read_prompt(filename: str, category: str, ttl: int):
         logger.error(f"프롬프트 파일 읽기 실패: {e}")
         raise FileAccessError()
     
-# 식습관 분석 프롬프트 미리 로드
+# 식습관 분석 프롬프트 미리 로드: 반환값은 프롬프트 전체 내용의 해시(프롬프트 버전)
 async def load_all_prompts():
     
     prompt_files = [
         "diet_advice.txt", "nutrition_analysis.txt", "diet_improvement.txt",
-        "custom_recommendation.txt", "diet_summary.txt", "diet_eval.txt"
+        "custom_recommendation.txt", "diet_summary.txt", "diet_eval.txt", "diet_fused_analysis.txt"
     ]
 
+    prompt_hash = hashlib.sha256()
     for filename in prompt_files:
-        await read_prompt(filename=os.path.join(settings.PROMPT_PATH, filename), category="diet", ttl=604800)
\ No newline at end of file
+        prompt = await read_prompt(filename=os.path.join(settings.PROMPT_PATH, filename), category="diet", ttl=604800)
+        prompt_hash.update(prompt.encode("utf-8"))
+
+    return prompt_hash.hexdigest()
\ No newline at end of file
@@ -0,0 +1,165 @@
+import io
+import json
+import time
+import hashlib
+from PIL import Image
+from core.config import settings
+from core.config_redis import redis_client, get_async_redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+음식 이미지 분석 결과 캐시: 같은 사진(재시도 업로드, 여러 사용자가 쓰는 같은 이미지)은 모델 / Pinecone 호출 없이 응답
+
+- 정확히 같은 파일: 원본 바이트의 SHA-256
+- 거의 같은 이미지(재압축, 크기 변경): 64bit dHash, 해밍 거리 IMAGE_CACHE_MAX_DISTANCE 이하
+  - 해시를 16bit씩 4개 구간으로 나누어 구간별 Redis Sorted Set에 저장(banded lookup)
+  - 거리 3 이하인 해시는 적어도 한 구간이 같으므로(비둘기집 원리) 같은 구간 후보만 비교
+  - 구간 후보의 점수는 만료 시각: 조회 시 만료되지 않은 후보만 비교, 저장 시 만료된 후보 삭제(구간 크기 제한)
+  - 결과가 사라진 후보(메모리 부족으로 삭제 등)는 조회 시 구간에서 삭제
+- 저장 값: 탐지 음식 및 유사 음식 검색 결과, 결과를 만드는 데 걸린 시간(절약한 시간 기록용)
+"""
+
+# Redis 키: SHA-256 / dHash별 결과, dHash 구간별 후보(Sorted Set, 이전 Set 형식 키와 구분), 지표
+IMAGE_CACHE_EXACT_PREFIX = "image_cache:exact"
+IMAGE_CACHE_DHASH_PREFIX = "image_cache:dhash"
+IMAGE_CACHE_BAND_PREFIX = "image_cache:zband"
+IMAGE_CACHE_METRICS_KEY = "metrics:image_cache"
+
+# dHash 크기(64bit) / 구간 수
+HASH_SIZE = 8
+HASH_BANDS = 4
+BAND_BITS = HASH_SIZE * HASH_SIZE // HASH_BANDS
+
+# 적중 종류
+HIT_EXACT = "exact"
+HIT_NEAR = "near"
+
+
+# 원본 바이트 해시
+def compute_sha256(image_bytes: bytes):
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+# dHash: 흑백 (9 x 8) 축소 후 가로로 인접한 픽셀 밝기 비교(CPU 작업, 쓰레드에서 실행)
+# 이미지로 읽을 수 없으면 None(정확히 같은 파일만 캐시)
+def compute_dhash(image_bytes: bytes):
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.draft("L", (HASH_SIZE * 4, HASH_SIZE * 4))
+            pixels = list(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS).getdata())
+    except Exception as e:
+        logger.info(f"[Image Cache] dHash 계산 불가: {e}")
+        return None
+
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return f"{value:016x}"
+
+
+def hamming_distance(left: str, right: str):
+    return bin(int(left, 16) ^ int(right, 16)).count("1")
+
+
+# dHash 구간별 Redis 키
+def _band_keys(dhash: str):
+    value = int(dhash, 16)
+    mask = (1 << BAND_BITS) - 1
+    return [
+        f"{IMAGE_CACHE_BAND_PREFIX}:{band}:{(value >> (band * BAND_BITS)) & mask:04x}"
+        for band in range(HASH_BANDS)
+    ]
+
+
+# 결과 조회: 반환값은 (적중 종류, 저장 값), Redis 장애 시 미적중으로 처리
+async def get_cached_image_result(sha256: str, dhash: str = None):
+    try:
+        client = get_async_redis_client()
+
+        # 정확히 같은 파일
+        cached = await client.get(f"{IMAGE_CACHE_EXACT_PREFIX}:{sha256}")
+        if cached is not None:
+            return HIT_EXACT, json.loads(cached)
+
+        if dhash is None:
+            return None, None
+
+        # 거리가 가장 가까운 후보 선택(같은 구간을 가진 만료되지 않은 해시만 비교)
+        pipe = client.pipeline()
+        for band_key in _band_keys(dhash):
+            pipe.zrangebyscore(band_key, time.time(), "+inf")
+        candidates = set().union(*await pipe.execute())
+        distances = sorted((hamming_distance(dhash, candidate), candidate) for candidate in candidates)
+        for distance, candidate in distances:
+            if distance > settings.IMAGE_CACHE_MAX_DISTANCE:
+                break
+            cached = await client.get(f"{IMAGE_CACHE_DHASH_PREFIX}:{candidate}")
+            if cached is not None:
+                return HIT_NEAR, json.loads(cached)
+
+            # 결과가 사라진 후보는 후보가 속한 구간에서 삭제
+            pipe = client.pipeline()
+            for band_key in _band_keys(candidate):
+                pipe.zrem(band_key, candidate)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"[Image Cache] 캐시 조회 실패: {e}")
+    return None, None
+
+
+# 결과 저장: SHA-256 / dHash별 결과, dHash 구간별 후보(모두 같은 보관 기간, 구간의 만료된 후보는 삭제)
+async def set_cached_image_result(sha256: str, dhash: str, food_info: list, seconds: float):
+    try:
+        ttl = settings.IMAGE_CACHE_TTL
+        now = time.time()
+        value = json.dumps({"food_info": food_info, "seconds": round(seconds, 4)}, ensure_ascii=False)
+
+        pipe = get_async_redis_client().pipeline()
+        pipe.setex(f"{IMAGE_CACHE_EXACT_PREFIX}:{sha256}", ttl, value)
+        if dhash is not None:
+            pipe.setex(f"{IMAGE_CACHE_DHASH_PREFIX}:{dhash}", ttl, value)
+            for band_key in _band_keys(dhash):
+                pipe.zadd(band_key, {dhash: now + ttl})
+                pipe.zremrangebyscore(band_key, "-inf", now)
+                pipe.expire(band_key, ttl)
+        await pipe.execute()
+    except Exception as e:
+        logger.error(f"[Image Cache] 캐시 저장 실패: {e}")
+
+
+# 적중 종류별 요청 수 / 절약한 시간 누적, 반환값은 누적 지표
+async def record_image_cache_result(hit: str, saved_seconds: float = 0.0):
+    try:
+        pipe = get_async_redis_client().pipeline()
+        pipe.hincrby(IMAGE_CACHE_METRICS_KEY, f"{hit}_hits" if hit else "misses", 1)
+        if saved_seconds:
+            pipe.hincrbyfloat(IMAGE_CACHE_METRICS_KEY, "saved_seconds", saved_seconds)
+        pipe.hgetall(IMAGE_CACHE_METRICS_KEY)
+        return summarize_image_cache_metrics((await pipe.execute())[-1])
+    except Exception as e:
+        logger.error(f"[Image Cache] 지표 기록 실패: {e}")
+        return None
+
+
+def summarize_image_cache_metrics(metrics: dict):
+    exact_hits = int(metrics.get(f"{HIT_EXACT}_hits", 0))
+    near_hits = int(metrics.get(f"{HIT_NEAR}_hits", 0))
+    misses = int(metrics.get("misses", 0))
+    total = exact_hits + near_hits + misses
+    return {
+        "exact_hits": exact_hits,
+        "near_hits": near_hits,
+        "misses": misses,
+        "hit_ratio": round((exact_hits + near_hits) / total, 4) if total else 0.0,
+        "saved_seconds": round(float(metrics.get("saved_seconds", 0)), 4)
+    }
+
+
+def get_image_cache_stats():
+    return summarize_image_cache_metrics(redis_client.hgetall(IMAGE_CACHE_METRICS_KEY))
@@ -0,0 +1,86 @@
+import io
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps, ExifTags
+from core.config import settings
+from errors.business_exception import ImageProcessingError
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+"""
+이미지 전처리: 외부 이미지 API(OpenAI / Claude / GCP Vision) 호출 전 업로드 이미지 축소 및 JPEG 재인코딩
+
+- EXIF 회전 정보 적용(휴대폰 사진은 회전 정보만 있고 픽셀은 눕혀진 경우가 많음)
+- 긴 변을 IMAGE_MAX_EDGE 이하로 축소, 투명 배경(PNG)은 흰 배경으로 합성
+- JPEG 품질 IMAGE_JPEG_QUALITY로 저장, IMAGE_MAX_BYTES를 넘으면 IMAGE_JPEG_MIN_QUALITY까지 품질을 낮춰 재시도
+- 이미 조건을 만족하는 JPEG는 원본 그대로 사용(재인코딩 화질 손실 방지)
+- 디코딩 / 축소 / 인코딩은 CPU 작업이므로 전용 쓰레드 풀에서 실행(Pillow는 해당 작업 중 GIL 해제)
+"""
+
+# 재인코딩 시 품질 감소 단위
+QUALITY_STEP = 10
+
+# 이미지 전처리 전용 쓰레드 풀(기본 쓰레드 풀을 쓰는 DB / Redis 작업과 분리)
+_executor = ThreadPoolExecutor(max_workers=settings.IMAGE_PREPROCESS_WORKERS, thread_name_prefix="image-preprocess")
+
+
+# 원본 그대로 보낼 수 있는지: JPEG, 크기 / 용량 조건 만족, 회전 정보 없음
+def _is_sendable(image: Image.Image, image_bytes: bytes):
+    return (
+        image.format == "JPEG"
+        and max(image.size) <= settings.IMAGE_MAX_EDGE
+        and len(image_bytes) <= settings.IMAGE_MAX_BYTES
+        and image.getexif().get(ExifTags.Base.Orientation, 1) == 1
+    )
+
+
+# RGB 변환: 투명 배경은 흰 배경으로 합성
+def _to_rgb(image: Image.Image):
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+# 용량 조건을 만족할 때까지 품질을 낮춰 JPEG 저장(최저 품질에서도 넘으면 최저 품질 결과 사용)
+def _encode_jpeg(image: Image.Image):
+    quality = settings.IMAGE_JPEG_QUALITY
+    while True:
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+        if buffer.tell() <= settings.IMAGE_MAX_BYTES or quality <= settings.IMAGE_JPEG_MIN_QUALITY:
+            return buffer.getvalue()
+        quality = max(quality - QUALITY_STEP, settings.IMAGE_JPEG_MIN_QUALITY)
+
+
+# 이미지 전처리(동기): 반환값은 외부 API로 보낼 JPEG 바이트
+def preprocess_image(image_bytes: bytes):
+    max_edge = settings.IMAGE_MAX_EDGE
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        if _is_sendable(image, image_bytes):
+            return image_bytes
+
+        # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8로 축소(전체 해상도 디코딩 생략)
+        image.draft("RGB", (max_edge, max_edge))
+        processed = ImageOps.exif_transpose(image)
+        processed.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        return _encode_jpeg(_to_rgb(processed))
+
+
+# 이미지 전처리(비동기): 전용 쓰레드 풀에서 실행, 읽을 수 없는 이미지는 이미지 처리 오류
+async def preprocess_image_async(image_bytes: bytes):
+    start_time = time.perf_counter()
+    try:
+        processed = await asyncio.get_running_loop().run_in_executor(_executor, preprocess_image, image_bytes)
+    except Exception as e:
+        logger.error(f"이미지 전처리 실패: {e}")
+        raise ImageProcessingError()
+
+    logger.info(f"[Image Preprocess] {len(image_bytes)} → {len(processed)} bytes, "
+                f"{time.perf_counter() - start_time:.4f} sec")
+    return processed
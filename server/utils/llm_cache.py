@@ -0,0 +1,128 @@
+import json
+import time
+import hashlib
+from langchain_core.runnables import RunnableLambda
+from core.config import settings
+from core.config_redis import redis_client, get_async_redis_client
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# Redis 키: 결과 / 저장 시각 인덱스(용량 초과 시 오래된 결과부터 제거) / 적중 지표
+CACHE_KEY_PREFIX = "llm_cache:result"
+CACHE_INDEX_KEY = "llm_cache:index"
+CACHE_METRICS_KEY = "metrics:llm_cache"
+
+
+# 모델 이름 조회: ChatOpenAI는 model_name, ChatAnthropic은 model
+def get_model_name(model):
+    return getattr(model, "model_name", None) or getattr(model, "model", None)
+
+
+# 캐시 키: (프롬프트 버전, 모델, 변형, 프롬프트에 들어가는 입력값)의 해시
+def build_cache_key(prompt_version: str, model_name: str, variant: str, variables: dict):
+    payload = json.dumps(
+        {"prompt": prompt_version, "model": model_name, "variant": variant, "variables": variables},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Chain 입력값 기준 캐시 키: Prompt 템플릿에 실제로 들어가는 입력값만 사용
+def build_chain_cache_key(prompt_template, model_name: str, variant: str, inputs: dict):
+    prompt_version = hashlib.sha256(prompt_template.template.encode("utf-8")).hexdigest()
+    variables = {key: inputs.get(key) for key in sorted(prompt_template.input_variables)}
+    return build_cache_key(prompt_version, model_name, variant, variables)
+
+
+# 캐시 조회 및 적중 / 미적중 기록: Redis 장애 시 미적중으로 처리
+async def get_cached_result(name: str, key: str):
+    try:
+        client = get_async_redis_client()
+        cached = await client.get(f"{CACHE_KEY_PREFIX}:{key}")
+
+        field = "hits" if cached is not None else "misses"
+        pipe = client.pipeline()
+        pipe.hincrby(CACHE_METRICS_KEY, field, 1)
+        pipe.hincrby(CACHE_METRICS_KEY, f"{name}:{field}", 1)
+        await pipe.execute()
+
+        return json.loads(cached) if cached is not None else None
+    except Exception as e:
+        logger.error(f"[LLM Cache] {name} 캐시 조회 실패: {e}")
+        return None
+
+
+# 결과 저장: TTL 적용 후 최대 개수를 넘으면 오래된 결과부터 제거
+async def set_cached_result(name: str, key: str, result):
+    try:
+        client = get_async_redis_client()
+        now = time.time()
+        ttl = settings.LLM_CACHE_TTL
+
+        pipe = client.pipeline()
+        pipe.setex(f"{CACHE_KEY_PREFIX}:{key}", ttl, json.dumps(result, ensure_ascii=False))
+        pipe.zadd(CACHE_INDEX_KEY, {key: now})
+        # TTL로 이미 만료된 결과는 인덱스에서도 제거
+        pipe.zremrangebyscore(CACHE_INDEX_KEY, "-inf", now - ttl)
+        pipe.zcard(CACHE_INDEX_KEY)
+        size = (await pipe.execute())[-1]
+
+        overflow = size - settings.LLM_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            evicted = [member for member, _ in await client.zpopmin(CACHE_INDEX_KEY, overflow)]
+            if evicted:
+                await client.delete(*[f"{CACHE_KEY_PREFIX}:{member}" for member in evicted])
+                await client.hincrby(CACHE_METRICS_KEY, "evictions", len(evicted))
+    except Exception as e:
+        logger.error(f"[LLM Cache] {name} 캐시 저장 실패: {e}")
+
+
+# Chain 캐시 적용: 적중하면 Rate-Limit 확인 및 모델 호출 없이 저장된 결과 반환
+# variant: 같은 입력으로 다시 실행하는 경우(A/B 테스트) 서로 다른 결과를 얻기 위해 키를 구분
+def with_llm_cache(chain, name: str, prompt_template, model, variant: str = None):
+    if not settings.LLM_CACHE_ENABLED:
+        return chain
+
+    model_name = get_model_name(model)
+
+    async def invoke(inputs: dict):
+        key = build_chain_cache_key(prompt_template, model_name, variant, inputs)
+
+        cached = await get_cached_result(name, key)
+        if cached is not None:
+            logger.info(f"[LLM Cache] {name} 캐시 적중(model={model_name}, variant={variant})")
+            return cached
+
+        result = await chain.ainvoke(inputs)
+        await set_cached_result(name, key, result)
+        return result
+
+    return RunnableLambda(invoke)
+
+
+# 캐시 지표 조회: 전체 / Chain별 적중, 미적중, 적중률 및 현재 저장 개수
+def get_llm_cache_stats():
+    metrics = {field: int(value) for field, value in redis_client.hgetall(CACHE_METRICS_KEY).items()}
+
+    def ratio(hits, misses):
+        return round(hits / (hits + misses), 4) if hits + misses else 0.0
+
+    chains = {}
+    for field, value in metrics.items():
+        if ":" in field:
+            name, kind = field.rsplit(":", 1)
+            chains.setdefault(name, {"hits": 0, "misses": 0})[kind] = value
+    for stats in chains.values():
+        stats["hit_ratio"] = ratio(stats["hits"], stats["misses"])
+
+    hits, misses = metrics.get("hits", 0), metrics.get("misses", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": ratio(hits, misses),
+        "evictions": metrics.get("evictions", 0),
+        "entries": redis_client.zcard(CACHE_INDEX_KEY),
+        "chains": chains,
+    }
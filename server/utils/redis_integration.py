@@ -1,10 +1,12 @@
 import os
+import json
+import math
 import time
 import pytz
 import asyncio
 from datetime import datetime, timedelta
 from core.config import settings
-from core.config_redis import redis_client
+from core.config_redis import redis_client, get_async_redis_client
 from logs.logger_config import get_logger
 from errors.business_exception import RateLimitExceeded
 from errors.server_exception import ServiceConnectionError
@@ -16,22 +18,77 @@ logger = get_logger()
 RATE_LIMIT = settings.RATE_LIMIT  # 하루 최대 요청 가능 횟수
 
 
-## 식습관 분석 API
-# Redis 기반 Rate-limit 확인
-async def rate_limit_check():
-
-    current_minute = int(time.time() // 60)
-    key = f"api_calls:{current_minute}"
-    count = redis_client.incr(key)
-    if count == 1:
-        redis_client.expire(key, 60)
-    if count > 500:
-        # 다음 분 시작
-        sleep_time = 60 - (time.time() % 60) + 1
-        logger.info(f"[Rate-Limit] 호출횟수 {count}회 - 분당 제한 초과. {sleep_time:.2f}초 대기")
-        await asyncio.sleep(sleep_time)
-    elif count > 1:
-        redis_client.delete(key)
+## 외부 LLM / Embedding API 호출 제한
+# 모델별 분당 요청 수(rpm) / 분당 토큰 수(tpm): LLM_RATE_LIMITS 환경변수(JSON)로 덮어쓰기 가능
+DEFAULT_LLM_RATE_LIMITS = {
+    "gpt-4o": {"rpm": 500, "tpm": 30000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "claude-3-5-sonnet-20241022": {"rpm": 50, "tpm": 40000},
+    "embedding-query": {"rpm": 300, "tpm": 300000},
+}
+LLM_RATE_LIMITS = {**DEFAULT_LLM_RATE_LIMITS, **json.loads(settings.LLM_RATE_LIMITS or "{}")}
+
+# GCRA(Generic Cell Rate Algorithm): 여러 버킷(rpm, tpm)을 한 번에 확인하고 모두 허용될 때만 차감
+# 반환값: 0이면 허용, 아니면 허용될 때까지 대기해야 하는 시간(ms)
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local wait = 0
+local new_tats = {}
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[(i - 1) * 3 + 1])
+    local period = tonumber(ARGV[(i - 1) * 3 + 2])
+    local cost = math.min(tonumber(ARGV[(i - 1) * 3 + 3]), limit)
+    local tat = tonumber(redis.call('GET', KEYS[i]) or now)
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + cost * period / limit
+    local allow_at = new_tat - period
+    if allow_at > now then
+        wait = math.max(wait, allow_at - now)
+    end
+    new_tats[i] = new_tat
+end
+if wait > 0 then
+    return math.ceil(wait)
+end
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], string.format('%.3f', new_tats[i]), 'PX', math.ceil(new_tats[i] - now) + 1000)
+end
+return 0
+"""
+
+# 프롬프트 토큰 수 추정: 한글 비중이 높아 문자 2개당 1토큰으로 보수적으로 계산
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 2)
+
+# 모델별 호출 한도 확보: 허용될 때까지 필요한 만큼만 대기(프로세스 간 공유)
+async def acquire_llm_quota(model: str, tokens: int = 0, requests: int = 1):
+
+    limits = LLM_RATE_LIMITS.get(model)
+
+    # 한도가 정의되지 않은 모델
+    if not limits:
+        return
+
+    keys = [f"llm_rate:{model}:rpm", f"llm_rate:{model}:tpm"]
+    args = [limits["rpm"], 60000, requests, limits["tpm"], 60000, tokens]
+
+    while True:
+        try:
+            client = get_async_redis_client()
+            wait_ms = await client.eval(GCRA_SCRIPT, len(keys), *keys, *args)
+        except Exception as e:
+            # Redis 장애 시 호출 제한 없이 진행
+            logger.error(f"[Rate-Limit] {model} 호출 한도 확인 실패: {e}")
+            return
+
+        if not wait_ms:
+            return
+
+        logger.info(f"[Rate-Limit] {model} 분당 한도 초과(요청 {requests}회, 토큰 {tokens}개): {wait_ms}ms 대기")
+        await asyncio.sleep(int(wait_ms) / 1000)
 
 
 ## 음식 이미지 탐지 API
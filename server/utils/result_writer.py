@@ -0,0 +1,122 @@
+import time
+import asyncio
+from contextvars import ContextVar
+from db.database import SessionLocal
+from db.crud import save_analysis_results
+from logs.logger_config import get_logger
+
+# 공용 로거
+logger = get_logger()
+
+# 현재 분석 작업의 결과 저장 버퍼: run_analysis에서 조회
+current_result_writer: ContextVar = ContextVar("current_result_writer", default=None)
+
+
+# 여러 회원의 분석 결과를 한 번에 저장: 일괄 저장이 실패하면 회원별로 다시 저장하여 실패한 회원만 구분
+# 반환값: {status_id: 예외} (저장 실패한 회원)
+def save_records_with_fallback(db, records: list):
+    try:
+        save_analysis_results(db, records)
+        return {}
+    except Exception:
+        logger.info(f"[Result Writer] 일괄 저장 실패: 회원별 저장으로 재시도({len(records)}건)")
+
+    errors = {}
+    for record in records:
+        try:
+            save_analysis_results(db, [record])
+        except Exception as e:
+            errors[record["status_id"]] = e
+    return errors
+
+
+"""
+분석 결과 Write-Behind 버퍼
+
+- 회원별 분석 결과를 모아 batch_size개가 쌓이거나 flush_interval초가 지나면 한 번의 트랜잭션으로 저장
+- write()는 해당 결과가 실제로 저장될 때까지 대기하므로 저장 실패는 호출한 회원의 분석 실패로 처리
+- 저장은 별도 쓰레드의 세션에서 실행하여 이벤트 루프를 막지 않음
+"""
+
+class AnalysisResultWriter:
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._timer = None
+        self._flush_tasks = set()
+
+        # 지표: 저장 건수 / 트랜잭션 수 / 실패 건수
+        self.records = 0
+        self.flushes = 0
+        self.failures = 0
+
+    # 결과 추가 후 저장 완료까지 대기: 저장 실패 시 예외 발생
+    async def write(self, record: dict):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buffer.append((record, future))
+
+        if len(self._buffer) >= self.batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._schedule_flush)
+
+        return await future
+
+    # 버퍼에 쌓인 결과를 저장 작업으로 넘김
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, []
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _save(self, records: list):
+        db = SessionLocal()
+        try:
+            return save_records_with_fallback(db, records)
+        finally:
+            db.close()
+
+    async def _flush(self, batch: list):
+        records = [record for record, _ in batch]
+        start = time.time()
+        try:
+            errors = await asyncio.to_thread(self._save, records)
+        except Exception as e:
+            errors = {record["status_id"]: e for record in records}
+
+        self.flushes += 1
+        self.records += len(records) - len(errors)
+        self.failures += len(errors)
+        logger.info(f"[Result Writer] {len(records)}건 저장(실패 {len(errors)}건), 실행 시간: {round(time.time() - start, 4)} sec")
+
+        for record, future in batch:
+            if future.done():
+                continue
+            error = errors.get(record["status_id"])
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(True)
+
+    # 남은 결과 저장 후 종료
+    async def close(self):
+        self._schedule_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def snapshot(self):
+        return {
+            "records": self.records,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "avg_batch": round((self.records + self.failures) / self.flushes, 2) if self.flushes else 0.0
+        }